@@ -0,0 +1,135 @@
+"""
+Admission control: bounded concurrency per route class, with load shedding.
+
+Without it, a spike queues every request inside the connection pool for up to the
+pool timeout and latency collapses for everyone. Instead each route class (DB-backed
+reads, authenticated writes) runs at most N requests at once per worker, N being at most
+the worker's share of the connection pool; the rest wait in a queue with a time budget (ADMISSION_QUEUE_BUDGET_MS):
+
+- a request whose expected wait already exceeds the budget is rejected on arrival;
+- a queued request still waiting when the budget runs out is rejected then.
+
+A request is admitted when its session runs its first statement (app/db/sessions.py), not
+when the session opens, so cache hits and coalesced reads are never shed.
+
+Rejections are ServiceOverloadedError (503 with Retry-After), so admitted requests keep
+a bounded latency and clients back off.
+"""
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncContextManager
+
+from app.core.config import settings
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import admission_in_flight, admission_queued, admission_rejected, registry
+from app.db.neondb import pool_limits_per_worker
+
+READ = "read"
+WRITE = "write"
+
+# Weight of the latest request in the moving average of service time
+_SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionController:
+    """At most `limit` concurrent requests; queued ones wait at most `queue_budget` seconds."""
+
+    def __init__(
+        self,
+        route_class: str,
+        limit: int,
+        queue_budget: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.route_class = route_class
+        self.limit = limit
+        self.queue_budget = queue_budget
+        self.active = 0
+        self.waiting = 0
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(limit)
+        # Moving average of how long an admitted request holds its slot
+        self._service_time = 0.0
+
+    def expected_wait(self) -> float:
+        """Estimated queueing time of a new arrival: everyone queued ahead, served `limit` at a time."""
+        if self.active < self.limit:
+            return 0.0
+        return (self.waiting + 1) * self._service_time / self.limit
+
+    def _reject(self, reason: str, wait: float) -> ServiceOverloadedError:
+        admission_rejected.inc(1.0, self.route_class, reason)
+        return ServiceOverloadedError(self.route_class, retry_after=max(math.ceil(wait), 1))
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+
+        Raises:
+            ServiceOverloadedError: If the wait for a slot would exceed (or exceeded) the budget.
+        """
+        expected = self.expected_wait()
+        if expected > self.queue_budget:
+            raise self._reject("expected_wait", expected)
+        self.waiting += 1
+        try:
+            async with asyncio.timeout(self.queue_budget):
+                await self._semaphore.acquire()
+        except TimeoutError:
+            raise self._reject("queue_timeout", self.expected_wait()) from None
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            elapsed = self._clock() - started
+            self._service_time += _SERVICE_TIME_SMOOTHING * (elapsed - self._service_time)
+
+
+def concurrency_limit(configured: int | None) -> int:
+    """
+    Slots for a route class: the configured value capped to the connections this worker
+    may check out (its pool share plus overflow), or all of them when unset. More would
+    only move the queue into the pool.
+    """
+    pool_size, max_overflow = pool_limits_per_worker(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.WEB_CONCURRENCY,
+    )
+    capacity = pool_size + max_overflow
+    return capacity if configured is None else min(configured, capacity)
+
+
+def _controllers() -> dict[str, AdmissionController]:
+    budget = settings.ADMISSION_QUEUE_BUDGET_MS / 1000
+    return {
+        READ: AdmissionController(READ, concurrency_limit(settings.ADMISSION_READ_CONCURRENCY), budget),
+        WRITE: AdmissionController(WRITE, concurrency_limit(settings.ADMISSION_WRITE_CONCURRENCY), budget),
+    }
+
+
+controllers = _controllers()
+
+
+def admit(route_class: str) -> AsyncContextManager[None]:
+    """Admission for one request of route_class (READ or WRITE); a no-op when disabled."""
+    if not settings.ADMISSION_CONTROL_ENABLED:
+        return nullcontext()
+    return controllers[route_class].admit()
+
+
+def _collect() -> None:
+    for controller in controllers.values():
+        admission_in_flight.set(controller.active, controller.route_class)
+        admission_queued.set(controller.waiting, controller.route_class)
+
+
+registry.add_collector("admission", _collect)
@@ -1,10 +1,12 @@
 from fastapi import HTTPException, Header
 
 from app.core.config import settings
+from app.core.ratelimit import enforce_api_key_rate_limit
 
 
 def verify_api_key(x_api_key: str = Header(..., alias="X-API-Key", description="API key for create/update/delete")) -> str:
-    """Validate API key from X-API-Key header. Raises 403 if invalid."""
+    """Validate API key from X-API-Key header. Raises 403 if invalid, 429 if over its rate limit."""
     if x_api_key != settings.SECRET_KEY:
         raise HTTPException(status_code=403, detail="Invalid API key")
+    enforce_api_key_rate_limit(x_api_key)
     return x_api_key
@@ -0,0 +1,203 @@
+"""
+Read-through cache building blocks.
+
+- TTLCache: in-process bounded LRU with a per-entry TTL.
+- CacheBackend: namespaced cache used by the services; MemoryCacheBackend keeps
+  entries in this process, RedisCacheBackend (app/core/redis_cache.py) shares them
+  between instances. Select with CACHE_BACKEND.
+
+Entries are shared between requests, so cached values must be treated as read-only.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    """Counters exposed for monitoring cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after ttl_seconds.
+
+    Every invalidation bumps `generation`. Loaders read the generation before querying
+    and pass it to set(), so a value loaded before a concurrent write is never stored
+    after that write's invalidation. `invalidated_at` is the (clock) time of the last one.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.invalidated_at = float("-inf")
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """Store value; skipped if an invalidation happened since `generation` was read."""
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        self.generation += 1
+        self.invalidated_at = self._clock()
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self.generation += 1
+        self.invalidated_at = self._clock()
+        self.stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """Whether an invalidation happened in the last `seconds`."""
+        return self._clock() - self.invalidated_at < seconds
+
+    def snapshot(self) -> dict[str, int]:
+        """Counters plus current size, for the stats endpoint."""
+        return {**asdict(self.stats), "size": len(self._entries), "maxsize": self.maxsize}
+
+
+class CacheBackend(ABC):
+    """
+    Namespaced cache for JSON-serializable payloads, keyed by strings.
+
+    Loaders call get() (a miss) and read token(namespace) before querying, then pass the
+    token to set(); the set is dropped if the namespace was invalidated in between. invalidate() and clear() are
+    synchronous so they can run from after-commit hooks; backends schedule any remote
+    work themselves.
+    """
+
+    async def start(self) -> None:
+        """Open connections / background tasks (app startup)."""
+
+    async def close(self) -> None:
+        """Release connections / background tasks (app shutdown)."""
+
+    @abstractmethod
+    async def get(self, namespace: str, key: str) -> Any:
+        """Cached value, or None on miss."""
+
+    @abstractmethod
+    async def set(self, namespace: str, key: str, value: Any, token: Hashable) -> None:
+        """Store value unless the namespace was invalidated since `token` was read."""
+
+    @abstractmethod
+    def token(self, namespace: str) -> Hashable:
+        """Opaque marker that changes on every invalidation of the namespace."""
+
+    @abstractmethod
+    def invalidated_within(self, namespace: str, seconds: float) -> bool:
+        """Whether the namespace was invalidated (here or, if shared, elsewhere) in the last `seconds`."""
+
+    @abstractmethod
+    def invalidate(self, namespace: str, keys: Iterable[str]) -> None:
+        """Drop the given keys."""
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        """Drop every key in the namespace."""
+
+    @abstractmethod
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """Per-namespace counters, for the stats endpoint."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """One TTLCache per namespace, private to this process; values are stored as-is."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._caches: dict[str, TTLCache] = {}
+
+    def _cache(self, namespace: str) -> TTLCache:
+        cache = self._caches.get(namespace)
+        if cache is None:
+            cache = self._caches[namespace] = TTLCache(self.maxsize, self.ttl_seconds, self._clock)
+        return cache
+
+    async def get(self, namespace: str, key: str) -> Any:
+        return self._cache(namespace).get(key)
+
+    async def set(self, namespace: str, key: str, value: Any, token: Hashable) -> None:
+        self._cache(namespace).set(key, value, token)
+
+    def token(self, namespace: str) -> Hashable:
+        return self._cache(namespace).generation
+
+    def invalidated_within(self, namespace: str, seconds: float) -> bool:
+        return self._cache(namespace).invalidated_within(seconds)
+
+    def invalidate(self, namespace: str, keys: Iterable[str]) -> None:
+        cache = self._cache(namespace)
+        for key in keys:
+            cache.invalidate(key)
+
+    def clear(self, namespace: str) -> None:
+        self._cache(namespace).clear()
+
+    def clear_all(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {namespace: cache.snapshot() for namespace, cache in self._caches.items()}
+
+
+def create_cache_backend(settings) -> CacheBackend:
+    """Backend selected by settings.CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "redis":
+        from app.core.redis_cache import RedisCacheBackend
+
+        return RedisCacheBackend(
+            settings.REDIS_URL,
+            ttl_seconds=settings.CACHE_TTL_SECONDS,
+            local_maxsize=settings.CACHE_MAX_SIZE,
+            local_ttl_seconds=settings.CACHE_LOCAL_TTL_SECONDS,
+        )
+    return MemoryCacheBackend(settings.CACHE_MAX_SIZE, settings.CACHE_TTL_SECONDS)
@@ -0,0 +1,296 @@
+"""
+Negotiated response compression (gzip, plus brotli / zstd when installed).
+
+- CompressionMiddleware compresses compressible responses of at least
+  COMPRESSION_MIN_SIZE bytes with the client's preferred supported coding. Streaming
+  bodies are compressed chunk by chunk (each chunk flushed, so NDJSON stays incremental).
+  Responses that already carry a Content-Encoding, Server-Sent Events and bodiless
+  responses pass through untouched.
+- encode_variants() precompresses a payload once for every available coding; cached
+  payloads (RenderedPayload) and static files are served from those variants instead of
+  being recompressed per request.
+
+brotli and zstd are optional (`pip install brotli zstandard`); without them only gzip is offered.
+"""
+import hashlib
+import os
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from email.utils import formatdate
+from pathlib import Path
+
+from starlette import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+@dataclass(frozen=True)
+class Coding:
+    """A content coding: one-shot compressors for per-request and precompressed use, and a streamer."""
+    name: str
+    compress: Callable[[bytes], bytes]
+    precompress: Callable[[bytes], bytes]
+    stream: Callable[[], "_GzipStream | _BrotliStream | _ZstdStream"]
+
+
+def _available_codings() -> dict[str, Coding]:
+    """Supported codings in server preference order (best ratio first)."""
+    codings = {}
+    if brotli is not None:
+        codings["br"] = Coding(
+            "br",
+            lambda data: brotli.compress(data, quality=4),
+            lambda data: brotli.compress(data, quality=11),
+            lambda: _BrotliStream(4),
+        )
+    if zstandard is not None:
+        codings["zstd"] = Coding(
+            "zstd",
+            zstandard.ZstdCompressor(level=3).compress,
+            zstandard.ZstdCompressor(level=19).compress,
+            lambda: _ZstdStream(3),
+        )
+    codings["gzip"] = Coding(
+        "gzip",
+        lambda data: _gzip(data, 6),
+        lambda data: _gzip(data, 9),
+        lambda: _GzipStream(6),
+    )
+    return codings
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+CODINGS = _available_codings()
+
+
+def accepted_codings(accept_encoding: str | None) -> dict[str, float]:
+    """Accept-Encoding as {coding: q}; codings with q=0 are refused."""
+    accepted = {}
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            accepted[name.strip()] = float(q) if q else 1.0
+        except ValueError:
+            accepted[name.strip()] = 0.0
+    return accepted
+
+
+def negotiate(accept_encoding: str | None, available: tuple[str, ...] | None = None) -> str | None:
+    """Best coding the client accepts among `available` (default: all supported), or None."""
+    accepted = accepted_codings(accept_encoding)
+    best, best_q = None, 0.0
+    for name in available if available is not None else tuple(CODINGS):
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def encode_variants(data: bytes) -> dict[str, bytes]:
+    """Precompressed variants (max compression) of data for every supported coding, if worth it."""
+    if not settings.COMPRESSION_ENABLED or len(data) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+    return {name: coding.precompress(data) for name, coding in CODINGS.items()}
+
+
+def _is_compressible(headers: Headers) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/event-stream":
+        return False
+    return content_type.startswith("text/") or content_type in _COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """Compress responses with the negotiated coding (see module docstring)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self.app, CODINGS[coding])
+        await responder(scope, receive, send)
+
+
+class _CompressingResponder:
+    def __init__(self, app: ASGIApp, coding: Coding):
+        self.app = app
+        self.coding = coding
+        self.send: Send | None = None
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.stream = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message.get("headers", []))
+            compressible = _is_compressible(headers) and message["status"] not in (204, 304)
+            if compressible:
+                _vary_on_accept_encoding(MutableHeaders(raw=message.setdefault("headers", [])))
+            self.passthrough = not compressible or "content-encoding" in headers
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held until the first body chunk shows whether (and how) to compress
+                self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body:
+                if len(body) < settings.COMPRESSION_MIN_SIZE:
+                    self.passthrough = True
+                    await self.send(start)
+                    await self.send(message)
+                    return
+                body = self.coding.compress(body)
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            self.stream = self.coding.stream()
+            self._mark_encoded(headers)
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self.send(start)
+
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.coding.name
+        # The encoded bytes differ from the identity ones, so a strong validator becomes
+        # weak (as nginx does); If-None-Match uses weak comparison, so 304s keep working.
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+
+def _vary_on_accept_encoding(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers.add_vary_header("Accept-Encoding")
+
+
+@dataclass(frozen=True)
+class _StaticFile:
+    mtime: float
+    body: bytes
+    variants: dict[str, bytes]
+    etag: str
+    last_modified: str
+
+
+_static_files: dict[Path, _StaticFile] = {}
+
+
+def _load_static_file(path: Path, mtime: float) -> _StaticFile:
+    body = path.read_bytes()
+    # Validators from the mtime and size (as Starlette's FileResponse), so they change with the file
+    etag = '"' + hashlib.blake2b(f"{mtime}-{len(body)}".encode(), digest_size=16).hexdigest() + '"'
+    return _StaticFile(mtime, body, encode_variants(body), etag, formatdate(mtime, usegmt=True))
+
+
+def static_file_response(request: Request, path: Path, media_type: str) -> Response:
+    """
+    Serve a small static file from memory, with its compressed variants built once
+    (and rebuilt only when the file's mtime changes). Like rendered_response, each
+    variant has its own ETag and a matching If-None-Match gets an empty 304.
+    """
+    # http_cache builds on this module, so its helpers are imported on use
+    from app.core.http_cache import cache_headers, etag_matches
+
+    mtime = os.stat(path).st_mtime
+    cached = _static_files.get(path)
+    if cached is None or cached.mtime != mtime:
+        cached = _static_files[path] = _load_static_file(path, mtime)
+    body, etag, encoding_headers = cached.body, cached.etag, {}
+    if cached.variants:
+        encoding_headers["Vary"] = "Accept-Encoding"
+        coding = negotiate(request.headers.get("accept-encoding"), tuple(cached.variants))
+        if coding is not None:
+            body, etag = cached.variants[coding], f'{cached.etag[:-1]}-{coding}"'
+            encoding_headers["Content-Encoding"] = coding
+    headers = {**cache_headers(etag), "Last-Modified": cached.last_modified, **encoding_headers}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
@@ -1,14 +1,101 @@
-from pydantic import Field, ConfigDict
-from pydantic_settings import BaseSettings
+from typing import Annotated, Literal
+
+from pydantic import Field, ConfigDict, field_validator, model_validator
+from pydantic_settings import BaseSettings, NoDecode
 
 
 class Settings(BaseSettings):
     DB_URL: str = Field(..., description="PostgreSQL URL (e.g. Neon); sslmode=require is handled for asyncpg")
     SECRET_KEY: str = Field(..., min_length=1, description="API key for protected endpoints (e.g. X-API-Key)")
 
-    # Pool tuning (defaults are fine for Neon serverless)
+    # Pool tuning (defaults are fine for Neon serverless). Totals for the whole server:
+    # with WEB_CONCURRENCY workers each process gets an equal share (at least 1 pooled connection).
+    # Snapshot mode and the change feed each add one LISTEN connection per worker on top
     DB_POOL_SIZE: int = Field(default=5, ge=1, le=20)
     DB_MAX_OVERFLOW: int = Field(default=10, ge=0, le=20)
+    # Connections each worker opens (and prepares the hot statements on) at startup; 0 = lazy
+    DB_POOL_WARM_SIZE: int = Field(default=2, ge=0, le=20)
+    # Prepared statements kept per connection (0 = prepare on every execution)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100, ge=0)
+    # Behind a transaction-mode pooler (PgBouncer); unset = detect Neon "-pooler" hosts
+    DB_TRANSACTION_POOLER: bool | None = Field(default=None)
+
+    # Production server (python -m app.server)
+    HOST: str = Field(default="0.0.0.0")
+    PORT: int = Field(default=10000, ge=1, le=65535)
+    WEB_CONCURRENCY: int = Field(default=1, ge=1, le=64, description="Worker processes (roughly one per core)")
+    # Seconds to let in-flight requests finish on SIGTERM before workers exit
+    GRACEFUL_SHUTDOWN_SECONDS: int = Field(default=30, ge=0)
+
+    # Optional read replicas (comma-separated URLs); each gets its own engine and pool
+    DB_READ_REPLICA_URLS: Annotated[list[str], NoDecode] = Field(default_factory=list)
+    # After a write, reads go to the primary for this long (replication lag, snapshot refresh): in
+    # this process, and on any worker for the writing client (last_write cookie / X-Last-Write header)
+    DB_READ_AFTER_WRITE_SECONDS: float = Field(default=2.0, ge=0)
+
+    # Read-through cache for hall detail/list/recommendations (invalidated on writes)
+    CACHE_ENABLED: bool = Field(default=True)
+    CACHE_MAX_SIZE: int = Field(default=1024, ge=1)
+    CACHE_TTL_SECONDS: float = Field(default=60.0, gt=0, description="Upper bound on staleness for out-of-band DB edits")
+    # "memory" keeps entries per process (off with WEB_CONCURRENCY > 1, see app/server.py);
+    # "redis" shares them between workers and instances (needs REDIS_URL)
+    CACHE_BACKEND: Literal["memory", "redis"] = Field(default="memory")
+    REDIS_URL: str | None = Field(default=None, description="e.g. redis://localhost:6379/0")
+    # Redis backend: how long each process keeps its local copy of an entry
+    CACHE_LOCAL_TTL_SECONDS: float = Field(default=5.0, gt=0)
+    # Serve GET /db/music-halls from pre-serialized JSON bytes (+ gzip), rebuilt when the cached list changes
+    LIST_PRERENDER_ENABLED: bool = Field(default=False)
+    # Answer list/detail/recommendation reads from an in-memory copy of the catalogue, kept
+    # current via LISTEN/NOTIFY (needs migrations/0002_catalogue_notify.sql)
+    SNAPSHOT_MODE_ENABLED: bool = Field(default=False)
+    # Change feed of hall/recommendation events (SSE and long-poll); needs migrations/0003_change_feed.sql
+    CHANGE_FEED_ENABLED: bool = Field(default=False)
+    # Most recent events each worker keeps in memory for resuming clients; older resumes read the table
+    CHANGE_FEED_BUFFER_SIZE: int = Field(default=1000, ge=10, le=100_000)
+    # Events older than this are pruned; resuming from before the oldest kept event answers 410
+    CHANGE_FEED_RETENTION_HOURS: int = Field(default=72, ge=1)
+    # Concurrent identical reads (detail, list, recommendations) share one in-flight query
+    READ_COALESCING_ENABLED: bool = Field(default=True)
+
+    # Admission control (per worker): concurrent DB-backed reads / authenticated writes; requests
+    # beyond that queue, and are shed with 503 + Retry-After once the expected wait exceeds the budget.
+    # Unset = the worker's pool share (pool + overflow); a larger value is capped to it
+    ADMISSION_CONTROL_ENABLED: bool = Field(default=True)
+    ADMISSION_READ_CONCURRENCY: int | None = Field(default=None, ge=1)
+    ADMISSION_WRITE_CONCURRENCY: int | None = Field(default=None, ge=1)
+    ADMISSION_QUEUE_BUDGET_MS: float = Field(default=250.0, gt=0)
+    # Token bucket per API key (429 + Retry-After when empty); unset = no limit
+    API_KEY_RATE_LIMIT_PER_SECOND: float | None = Field(default=None, gt=0)
+    API_KEY_RATE_LIMIT_BURST: int = Field(default=20, ge=1)
+
+    # Bulk endpoints: max items per request and rows per INSERT statement
+    BULK_MAX_ITEMS: int = Field(default=5000, ge=1)
+    BULK_BATCH_SIZE: int = Field(default=500, ge=1, le=4000)
+
+    # Log a JSON record (route, params, SQL with timings, pool wait) for requests slower than this; unset = off
+    SLOW_REQUEST_THRESHOLD_MS: float | None = Field(default=None, gt=0)
+    # Allow authenticated callers to profile a request with `X-Profile: 1` (or `?profile=1`)
+    PROFILING_ENABLED: bool = Field(default=False)
+
+    # Negotiated gzip (and brotli/zstd when installed) for responses of at least COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED: bool = Field(default=True)
+    COMPRESSION_MIN_SIZE: int = Field(default=1024, ge=0)
+
+    # Cache-Control max-age for GET responses that carry an ETag (0 = always revalidate)
+    HTTP_CACHE_MAX_AGE: int = Field(default=0, ge=0)
+
+    @field_validator("DB_READ_REPLICA_URLS", mode="before")
+    @classmethod
+    def _split_urls(cls, value: object) -> object:
+        if isinstance(value, str):
+            return [url.strip() for url in value.split(",") if url.strip()]
+        return value
+
+    @model_validator(mode="after")
+    def _check_cache_backend(self) -> "Settings":
+        if self.CACHE_BACKEND == "redis" and not self.REDIS_URL:
+            raise ValueError("CACHE_BACKEND=redis requires REDIS_URL")
+        return self
 
     model_config = ConfigDict(
         env_file=".env",
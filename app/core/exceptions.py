@@ -18,8 +18,17 @@ class ErrorCode(str, Enum):
     MUSIC_HALL_LIST_EMPTY = "MUSIC_HALL_LIST_EMPTY"
     NO_FIELDS_TO_UPDATE = "NO_FIELDS_TO_UPDATE"
     INVALID_UPDATE_FIELDS = "INVALID_UPDATE_FIELDS"
+    INVALID_LIST_FIELDS = "INVALID_LIST_FIELDS"
+    INVALID_CURSOR = "INVALID_CURSOR"
+    INVALID_SYNC_TOKEN = "INVALID_SYNC_TOKEN"
+    INVALID_BULK_ITEM = "INVALID_BULK_ITEM"
+    BULK_LIMIT_EXCEEDED = "BULK_LIMIT_EXCEEDED"
     DUPLICATE_ENTRY = "DUPLICATE_ENTRY"
     INVALID_REFERENCE = "INVALID_REFERENCE"
+    SERVICE_OVERLOADED = "SERVICE_OVERLOADED"
+    RATE_LIMIT_EXCEEDED = "RATE_LIMIT_EXCEEDED"
+    CHANGE_FEED_UNAVAILABLE = "CHANGE_FEED_UNAVAILABLE"
+    CHANGE_FEED_EXPIRED = "CHANGE_FEED_EXPIRED"
     DATABASE_ERROR = "DATABASE_ERROR"
     INTERNAL_ERROR = "INTERNAL_ERROR"
 
@@ -29,6 +38,8 @@ class ErrorType(str, Enum):
     NOT_FOUND = "NOT_FOUND"
     VALIDATION = "VALIDATION"
     CONFLICT = "CONFLICT"
+    THROTTLED = "THROTTLED"
+    UNAVAILABLE = "UNAVAILABLE"
     INTERNAL = "INTERNAL"
 
 
@@ -48,7 +59,8 @@ class DomainException(Exception):
         error_code: ErrorCode,
         error_type: ErrorType,
         status_code: int,
-        details: dict[str, Any] | None = None
+        details: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None
     ):
         """
         Initialize domain exception.
@@ -59,6 +71,7 @@ class DomainException(Exception):
             error_type: Category of error
             status_code: HTTP status code
             details: Additional error context/metadata
+            headers: Extra HTTP response headers (e.g. Retry-After)
         """
         super().__init__(message)
         self.message = message
@@ -66,6 +79,7 @@ class DomainException(Exception):
         self.error_type = error_type
         self.status_code = status_code
         self.details = details or {}
+        self.headers = headers
     
     def to_http(self) -> HTTPException:
         """
@@ -81,7 +95,8 @@ class DomainException(Exception):
                 "error_type": self.error_type.value,
                 "message": self.message,
                 **self.details
-            }
+            },
+            headers=self.headers
         )
 
 
@@ -137,6 +152,126 @@ class InvalidUpdateFieldsError(DomainException):
         )
 
 
+class InvalidListFieldsError(DomainException):
+    """Raised when a list request asks for fields that cannot be projected"""
+    
+    def __init__(self, invalid_fields: set[str]):
+        self.invalid_fields = sorted(invalid_fields)
+        super().__init__(
+            message=f"Invalid fields requested: {', '.join(self.invalid_fields)}",
+            error_code=ErrorCode.INVALID_LIST_FIELDS,
+            error_type=ErrorType.VALIDATION,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            details={"invalid_fields": self.invalid_fields}
+        )
+
+
+class InvalidCursorError(DomainException):
+    """Raised when a pagination cursor is malformed or was not issued by this API"""
+    
+    def __init__(self, cursor: str):
+        super().__init__(
+            message="Invalid pagination cursor",
+            error_code=ErrorCode.INVALID_CURSOR,
+            error_type=ErrorType.VALIDATION,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            details={"cursor": cursor}
+        )
+
+
+class InvalidSyncTokenError(DomainException):
+    """Raised when a delta-sync version token is malformed or was not issued by this API"""
+    
+    def __init__(self, token: str):
+        super().__init__(
+            message="Invalid sync token",
+            error_code=ErrorCode.INVALID_SYNC_TOKEN,
+            error_type=ErrorType.VALIDATION,
+            status_code=status.HTTP_400_BAD_REQUEST,
+            details={"since": token}
+        )
+
+
+class InvalidBulkItemError(DomainException):
+    """Raised (per item) when one entry of a bulk request fails validation"""
+    
+    def __init__(self, errors: list[dict[str, Any]] | str):
+        super().__init__(
+            message="Invalid item",
+            error_code=ErrorCode.INVALID_BULK_ITEM,
+            error_type=ErrorType.VALIDATION,
+            status_code=422,  # Unprocessable Content; the constant's name differs across Starlette versions
+            details={"errors": errors}
+        )
+
+
+class BulkLimitExceededError(DomainException):
+    """Raised when a bulk request carries more items than allowed"""
+    
+    def __init__(self, max_items: int):
+        super().__init__(
+            message=f"Bulk requests are limited to {max_items} items",
+            error_code=ErrorCode.BULK_LIMIT_EXCEEDED,
+            error_type=ErrorType.VALIDATION,
+            status_code=413,  # Content Too Large; likewise renamed in newer Starlette
+            details={"max_items": max_items}
+        )
+
+
+class ServiceOverloadedError(DomainException):
+    """Raised when a request is shed because too many are already waiting for the database"""
+    
+    def __init__(self, route_class: str, retry_after: int):
+        super().__init__(
+            message="Service is overloaded, retry later",
+            error_code=ErrorCode.SERVICE_OVERLOADED,
+            error_type=ErrorType.THROTTLED,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"route_class": route_class, "retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class RateLimitExceededError(DomainException):
+    """Raised when an API key has used up its request rate"""
+    
+    def __init__(self, retry_after: int):
+        super().__init__(
+            message="Rate limit exceeded for this API key",
+            error_code=ErrorCode.RATE_LIMIT_EXCEEDED,
+            error_type=ErrorType.THROTTLED,
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            details={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class ChangeFeedUnavailableError(DomainException):
+    """Raised when the change feed is disabled or this worker is not listening yet"""
+    
+    def __init__(self, enabled: bool):
+        super().__init__(
+            message="Change feed is starting, retry shortly" if enabled else "Change feed is not enabled",
+            error_code=ErrorCode.CHANGE_FEED_UNAVAILABLE,
+            error_type=ErrorType.UNAVAILABLE,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE if enabled else status.HTTP_404_NOT_FOUND,
+            headers={"Retry-After": "1"} if enabled else None
+        )
+
+
+class ChangeFeedExpiredError(DomainException):
+    """Raised when a client resumes from an event that has already been pruned"""
+    
+    def __init__(self, after_id: int, oldest_id: int):
+        super().__init__(
+            message="Events after this id are no longer kept; reload the catalogue and resume from the latest event",
+            error_code=ErrorCode.CHANGE_FEED_EXPIRED,
+            error_type=ErrorType.NOT_FOUND,
+            status_code=status.HTTP_410_GONE,
+            details={"after": after_id, "oldest_event_id": oldest_id}
+        )
+
+
 # HTTP Exception Handlers
 # Using Strategy Pattern: Exceptions handle their own conversion
 def handle_db_exception(e: Exception) -> HTTPException:
@@ -0,0 +1,104 @@
+"""
+HTTP conditional GET helpers: strong ETags over the response payload and If-None-Match handling,
+plus pre-rendered payloads (JSON bytes, ETag and compressed variants computed once, served as-is).
+"""
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+from fastapi import Request, Response, status
+
+from app.core.compression import encode_variants, negotiate
+from app.core.config import settings
+from app.core.responses import TrustedJSONResponse
+
+
+def _etag_of(data: bytes) -> str:
+    return '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+
+
+def compute_etag(payload: Any) -> str:
+    """Strong ETag: hash of the payload's canonical (sorted-keys) JSON encoding."""
+    return _etag_of(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison as required for If-None-Match (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def cache_headers(etag: str) -> dict[str, str]:
+    """Validator and freshness headers shared by 200 and 304 responses."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+
+def conditional_response(
+    request: Request,
+    payload: Any,
+    extra_headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Serve a trusted payload (see app/core/responses.py) with ETag/Cache-Control and
+    extra_headers, or an empty 304 if the client already holds this representation.
+    extra_headers are part of the representation, so they are folded into the ETag.
+    """
+    etag = compute_etag([payload, extra_headers] if extra_headers else payload)
+    headers = {**cache_headers(etag), **(extra_headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return TrustedJSONResponse(payload, headers=headers)
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedPayload:
+    """A JSON response body serialized once, with its ETag and precompressed variants."""
+    body: bytes
+    etag: str
+    # content coding -> compressed body (see app/core/compression.py)
+    variants: dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def render(cls, payload: Any, extra_validator: str | None = None) -> "RenderedPayload":
+        """
+        Serialize payload; the ETag equals compute_etag(payload) unless extra_validator
+        (e.g. a next-page cursor that is not part of the body) is folded in.
+        """
+        body = orjson.dumps(payload)
+        canonical = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        if extra_validator is not None:
+            canonical += b"\n" + extra_validator.encode()
+        return cls(body=body, etag=_etag_of(canonical), variants=encode_variants(body))
+
+
+def rendered_response(
+    request: Request,
+    rendered: RenderedPayload,
+    extra_headers: dict[str, str] | None = None,
+) -> Response:
+    """
+    Serve a RenderedPayload as-is: 304 on a matching If-None-Match, otherwise the
+    stored bytes (the best precompressed variant the client accepts). No validation,
+    no re-serialization, no per-request compression. Each variant has its own ETag,
+    since strong validators differ per content coding.
+    """
+    body, etag, encoding_headers = rendered.body, rendered.etag, {}
+    if rendered.variants:
+        encoding_headers["Vary"] = "Accept-Encoding"
+        coding = negotiate(request.headers.get("accept-encoding"), tuple(rendered.variants))
+        if coding is not None:
+            body, etag = rendered.variants[coding], f'{rendered.etag[:-1]}-{coding}"'
+            encoding_headers["Content-Encoding"] = coding
+    headers = {**cache_headers(etag), **(extra_headers or {}), **encoding_headers}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,316 @@
+"""
+Request-level performance instrumentation.
+
+- A minimal in-process metrics registry rendered in Prometheus text format (/metrics).
+- RequestStats: per-request DB time, statement count and pool wait, carried in a
+  contextvar so the SQLAlchemy event hooks (app/db/instrumentation.py) can add to it.
+- MetricsMiddleware: per-route latency histograms, a Server-Timing response header and,
+  when SLOW_REQUEST_THRESHOLD_MS is set, a structured JSON log line per slow request.
+
+Metrics are per process; with several workers each exposes its own series.
+"""
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+
+slow_request_logger = setup_logger("app.slow_requests")
+# Statements longer than this are truncated in slow-request records
+_MAX_LOGGED_SQL = 2000
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for values, total in self._values.items():
+            yield f"{self.name}{_format_labels(self.labels, values)} {total}"
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+    def dec(self, amount: float = 1.0, *label_values: str) -> None:
+        self.inc(-amount, *label_values)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        for values, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, values, le_label)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, values)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labels, values)} {count}"
+
+
+class MetricsRegistry:
+    """Holds metrics and collectors (callbacks that refresh gauges right before rendering)."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._collectors: dict[str, Callable[[], None]] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, key: str, collector: Callable[[], None]) -> None:
+        """Register (or replace, by key) a callback run before every render."""
+        self._collectors[key] = collector
+
+    def remove_collector(self, key: str) -> None:
+        self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        for collector in list(self._collectors.values()):
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    labels=("method", "route", "status"),
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served",
+))
+db_request_time = registry.register(Histogram(
+    "db_time_per_request_seconds", "Time spent executing SQL per HTTP request", labels=("route",),
+))
+db_statements_per_request = registry.register(Histogram(
+    "db_statements_per_request", "SQL statements executed per HTTP request", labels=("route",), buckets=COUNT_BUCKETS,
+))
+db_statement_duration = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time", labels=("engine",),
+))
+db_pool_wait = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time waiting for a pooled connection (includes opening new ones)", labels=("engine",),
+))
+db_pool_checked_out = registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", labels=("engine",),
+))
+db_pool_capacity = registry.register(Gauge(
+    "db_pool_capacity", "Maximum connections the pool may hold (pool_size + max_overflow)", labels=("engine",),
+))
+db_pool_saturation = registry.register(Gauge(
+    "db_pool_saturation", "Checked-out connections as a fraction of pool capacity", labels=("engine",),
+))
+db_compiled_cache = registry.register(Counter(
+    "db_compiled_cache_total", "Statement executions by SQLAlchemy compiled-cache result (hit, miss, uncached)",
+    labels=("engine", "result"),
+))
+db_prepared_statement_lookups = registry.register(Counter(
+    "db_prepared_statement_lookups_total", "Statement executions that looked up a prepared statement",
+    labels=("engine",),
+))
+db_statements_prepared = registry.register(Counter(
+    "db_statements_prepared_total", "Statements prepared on the server (prepared-statement cache misses)",
+    labels=("engine",),
+))
+db_statement_cache_hit_ratio = registry.register(Gauge(
+    "db_statement_cache_hit_ratio", "Fraction of executions served from a statement cache (compiled or prepared)",
+    labels=("engine", "cache"),
+))
+admission_in_flight = registry.register(Gauge(
+    "admission_in_flight", "Admitted requests currently running, by route class", labels=("route_class",),
+))
+admission_queued = registry.register(Gauge(
+    "admission_queued", "Requests waiting for admission, by route class", labels=("route_class",),
+))
+admission_rejected = registry.register(Counter(
+    "admission_rejected_total", "Requests shed with 503 by admission control", labels=("route_class", "reason"),
+))
+rate_limited = registry.register(Counter(
+    "rate_limited_total", "Requests rejected with 429 by the per-API-key rate limit",
+))
+snapshot_halls = registry.register(Gauge(
+    "snapshot_halls", "Halls held by the in-memory catalogue snapshot (SNAPSHOT_MODE_ENABLED)",
+))
+snapshot_refreshes = registry.register(Counter(
+    "snapshot_refreshes_total", "Catalogue snapshot refreshes (full reloads and incremental updates)",
+    labels=("kind",),
+))
+change_feed_events = registry.register(Counter(
+    "change_feed_events_total", "Catalogue events received by the change feed (CHANGE_FEED_ENABLED)",
+    labels=("type",),
+))
+change_feed_subscribers = registry.register(Gauge(
+    "change_feed_subscribers", "Open change-feed streams and waiting long-poll requests",
+))
+read_coalesced_waiters = registry.register(Counter(
+    "read_coalesced_waiters_total", "Reads that joined an identical in-flight query instead of running their own",
+    labels=("namespace",),
+))
+reads_in_flight = registry.register(Gauge(
+    "reads_in_flight", "Distinct service reads currently running (coalescing keys)",
+))
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """
+    Per-request DB accounting filled in by the engine/pool event hooks.
+    `queries` collects (sql, seconds) only when slow-request logging is on.
+    """
+    db_time: float = 0.0
+    statements: int = 0
+    pool_wait: float = 0.0
+    queries: list[tuple[str, float]] | None = None
+    error_code: str | None = None
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar("current_request_stats", default=None)
+
+
+def _route_label(scope: Scope) -> str:
+    """Route template (e.g. /db/music-halls/{hall_id}) to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def server_timing(total: float, stats: RequestStats) -> str:
+    """Server-Timing header value (durations in ms)."""
+    return (
+        f"app;dur={total * 1000:.1f}, "
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.statements} queries", '
+        f"pool;dur={stats.pool_wait * 1000:.1f}"
+    )
+
+
+def log_slow_request(scope: Scope, status_code: int, duration: float, stats: RequestStats) -> None:
+    """Emit one JSON record describing a request slower than SLOW_REQUEST_THRESHOLD_MS."""
+    record = {
+        "event": "slow_request",
+        "method": scope["method"],
+        "route": _route_label(scope),
+        "path": scope["path"],
+        "path_params": scope.get("path_params", {}),
+        "query_string": scope.get("query_string", b"").decode("latin-1"),
+        "status": status_code,
+        "error_code": stats.error_code,
+        "duration_ms": round(duration * 1000, 2),
+        "db_time_ms": round(stats.db_time * 1000, 2),
+        "pool_wait_ms": round(stats.pool_wait * 1000, 2),
+        "statement_count": stats.statements,
+        "statements": [
+            {"sql": sql[:_MAX_LOGGED_SQL], "duration_ms": round(elapsed * 1000, 2)}
+            for sql, elapsed in stats.queries or ()
+        ],
+    }
+    slow_request_logger.warning(orjson.dumps(record, default=str).decode())
+
+
+class MetricsMiddleware:
+    """Times each HTTP request, records per-route metrics and adds a Server-Timing header."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        slow_threshold = settings.SLOW_REQUEST_THRESHOLD_MS
+        stats = RequestStats(queries=[] if slow_threshold is not None else None)
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timing = server_timing(time.perf_counter() - started, stats)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing.encode())]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            http_requests_in_progress.dec()
+            current_request_stats.reset(token)
+            duration = time.perf_counter() - started
+            route = _route_label(scope)
+            http_request_duration.observe(duration, scope["method"], route, str(status_code))
+            db_request_time.observe(stats.db_time, route)
+            db_statements_per_request.observe(stats.statements, route)
+            if slow_threshold is not None and duration * 1000 >= slow_threshold:
+                log_slow_request(scope, status_code, duration, stats)
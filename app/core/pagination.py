@@ -0,0 +1,64 @@
+"""
+Opaque keyset-pagination cursors and delta-sync version tokens.
+
+A cursor wraps the last seen primary key, a sync token the last seen row version; clients
+must treat both as opaque tokens.
+"""
+import base64
+import binascii
+
+import orjson
+
+from app.core.exceptions import InvalidCursorError, InvalidSyncTokenError
+
+
+def _encode(key: str, value: int) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps({key: value})).decode().rstrip("=")
+
+
+def _decode(token: str, key: str) -> int | None:
+    """The non-negative int under key in a token made by _encode, or None if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value = orjson.loads(raw)[key]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        return None
+    return value
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last returned id as a URL-safe opaque token."""
+    return _encode("id", last_id)
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a token produced by encode_cursor back to the last seen id.
+
+    Raises:
+        InvalidCursorError: If the token is malformed.
+    """
+    last_id = _decode(cursor, "id")
+    if last_id is None:
+        raise InvalidCursorError(cursor)
+    return last_id
+
+
+def encode_sync_token(version: int) -> str:
+    """Encode the last synced row version as a URL-safe opaque token."""
+    return _encode("v", version)
+
+
+def decode_sync_token(token: str) -> int:
+    """
+    Decode a token produced by encode_sync_token back to the last synced version.
+
+    Raises:
+        InvalidSyncTokenError: If the token is malformed.
+    """
+    version = _decode(token, "v")
+    if version is None:
+        raise InvalidSyncTokenError(token)
+    return version
@@ -0,0 +1,82 @@
+"""
+Opt-in per-request profiling (PROFILING_ENABLED).
+
+A caller holding the API key sends `X-Profile: 1` (or `?profile=1`) and gets back a
+cProfile report of that request instead of its normal body; the real status code is
+returned in X-Profiled-Status. Only one request is profiled at a time, since cProfile
+hooks the whole interpreter. The middleware is not installed when profiling is off.
+"""
+import asyncio
+import cProfile
+import hmac
+import io
+import pstats
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-profile"
+API_KEY_HEADER = b"x-api-key"
+# Functions shown in the report, sorted by cumulative time
+REPORT_LIMIT = 40
+
+
+def _wants_profile(scope: Scope) -> bool:
+    headers = dict(scope.get("headers", []))
+    # Compared as bytes: compare_digest rejects non-ASCII str with a TypeError
+    if not hmac.compare_digest(headers.get(API_KEY_HEADER, b""), settings.SECRET_KEY.encode()):
+        return False
+    if headers.get(PROFILE_HEADER) == b"1":
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile") == ["1"]
+
+
+def render_profile(profiler: cProfile.Profile, limit: int = REPORT_LIMIT) -> str:
+    """Plain-text pstats report, sorted by cumulative time."""
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return out.getvalue()
+
+
+class ProfilingMiddleware:
+    """Runs opted-in, authenticated requests under cProfile and returns the report."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard_body(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        async with self._lock:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard_body)
+            finally:
+                profiler.disable()
+
+        report = render_profile(profiler).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(report)).encode()),
+                (b"cache-control", b"no-store"),
+                (b"x-profiled-status", str(status_code).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": report})
@@ -0,0 +1,58 @@
+"""
+Per-API-key token-bucket rate limiting (API_KEY_RATE_LIMIT_PER_SECOND / _BURST).
+
+Each key's bucket holds up to `burst` tokens and refills at `rate` tokens per second;
+a request takes one token or is rejected with RateLimitExceededError (429 + Retry-After).
+Buckets are per worker process.
+"""
+import math
+import time
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError
+from app.core.metrics import rate_limited
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by an opaque string."""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        # key -> (tokens, time of last refill)
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def acquire(self, key: str) -> float:
+        """Take a token for key; returns 0 if granted, else seconds until one is available."""
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+api_key_limiter = (
+    TokenBucketLimiter(settings.API_KEY_RATE_LIMIT_PER_SECOND, settings.API_KEY_RATE_LIMIT_BURST)
+    if settings.API_KEY_RATE_LIMIT_PER_SECOND is not None
+    else None
+)
+
+
+def enforce_api_key_rate_limit(api_key: str) -> None:
+    """
+    Take one request from api_key's bucket (no-op when rate limiting is off).
+
+    Raises:
+        RateLimitExceededError: If the key's bucket is empty.
+    """
+    if api_key_limiter is None:
+        return
+    wait = api_key_limiter.acquire(api_key)
+    if wait > 0:
+        rate_limited.inc()
+        raise RateLimitExceededError(retry_after=max(math.ceil(wait), 1))
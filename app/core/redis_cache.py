@@ -0,0 +1,268 @@
+"""
+Shared cache backend over the Redis protocol (Redis, Valkey, KeyDB, ...).
+
+Every instance reads and writes the same entries, so replicas behind a load balancer
+answer alike and a cold instance is warmed by the others instead of by Neon.
+
+- Values are stored as orjson bytes under `{prefix}:{namespace}:v{version}:{key}` with
+  the cache TTL. Clearing a namespace is one INCR of its version: old entries become
+  unreachable and expire on their own.
+- Invalidating a key INCRs its generation (`{prefix}:{namespace}:gen:{key}`) along with
+  the DEL. A miss records the namespace version and key generation it saw, and the value
+  loaded after it is SET (WATCH/MULTI) only if both are unchanged: a load that started
+  before another instance's write cannot store the old row after that write's DEL, even
+  if the invalidation message has not reached this instance yet.
+- Each process keeps a small local copy (LOCAL_TTL seconds) in front of Redis. Writes
+  publish their invalidations on a pub/sub channel; every instance evicts its local
+  copy when it receives them. Versions are re-read at least every LOCAL_TTL seconds,
+  which bounds staleness if a message is lost while reconnecting.
+- Redis errors never fail a request: they are logged and treated as cache misses.
+
+Requires the `redis` package (redis>=5).
+"""
+import asyncio
+import time
+import uuid
+from collections import Counter
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+import orjson
+
+from app.core.cache import CacheBackend, MemoryCacheBackend, TTLCache
+from app.core.logger import setup_logger
+
+try:
+    import redis.asyncio as redis
+    from redis.exceptions import RedisError, WatchError
+except ImportError:
+    redis = None  # type: ignore[assignment]
+    RedisError = WatchError = OSError  # type: ignore[misc, assignment]
+
+logger = setup_logger(__name__)
+
+# Seconds between resubscribe attempts after the pub/sub connection drops
+_RECONNECT_DELAY_SECONDS = 1.0
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed CacheBackend with a local near-cache and pub/sub invalidation."""
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float,
+        local_maxsize: int,
+        local_ttl_seconds: float,
+        prefix: str = "backstage:cache",
+    ):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.prefix = prefix
+        self.channel = f"{prefix}:invalidations"
+        self.remote_stats = {"hits": 0, "misses": 0, "errors": 0, "stale_sets": 0}
+        self._redis = redis.from_url(url)
+        self._local = MemoryCacheBackend(local_maxsize, local_ttl_seconds)
+        self._instance_id = uuid.uuid4().hex
+        # namespace -> (version, monotonic time it was read)
+        self._versions: dict[str, tuple[int, float]] = {}
+        # Local invalidations whose DEL/INCR has not reached Redis yet: skip Redis for these
+        self._pending_keys: dict[str, Counter[str]] = {}
+        self._pending_clears: dict[str, int] = {}
+        # (namespace, key) -> (version, generation) seen by the last Redis miss, for set()
+        self._observed = TTLCache(local_maxsize, ttl_seconds)
+        self._tasks: set[asyncio.Task] = set()
+        self._listener: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self._redis.aclose()
+
+    def _key(self, namespace: str, version: int, key: str) -> str:
+        return f"{self.prefix}:{namespace}:v{version}:{key}"
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:version"
+
+    def _generation_key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}:{namespace}:gen:{key}"
+
+    async def _version(self, namespace: str) -> int:
+        """Namespace version, re-read from Redis when the local copy is older than LOCAL_TTL."""
+        cached = self._versions.get(namespace)
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < self.local_ttl_seconds:
+            return cached[0]
+        version = int(await self._redis.get(self._version_key(namespace)) or 0)
+        if cached is not None and cached[0] != version:
+            # Cleared elsewhere and we missed the message: drop the local copies too
+            self._local.clear(namespace)
+        self._versions[namespace] = (version, now)
+        return version
+
+    def _is_pending(self, namespace: str, key: str) -> bool:
+        return self._pending_clears.get(namespace, 0) > 0 or key in self._pending_keys.get(namespace, {})
+
+    async def get(self, namespace: str, key: str) -> Any:
+        value = await self._local.get(namespace, key)
+        if value is not None or self._is_pending(namespace, key):
+            return value
+        token = self._local.token(namespace)
+        try:
+            version = await self._version(namespace)
+            raw, generation = await self._redis.mget(
+                self._key(namespace, version, key), self._generation_key(namespace, key),
+            )
+        except RedisError as exc:
+            self._record_error("get", exc)
+            return None
+        if raw is None:
+            self.remote_stats["misses"] += 1
+            # The caller loads the value next; set() stores it only if neither has changed
+            self._observed.set((namespace, key), (version, int(generation or 0)))
+            return None
+        self.remote_stats["hits"] += 1
+        value = orjson.loads(raw)
+        await self._local.set(namespace, key, value, token)
+        return value
+
+    async def set(self, namespace: str, key: str, value: Any, token: Hashable) -> None:
+        if token != self.token(namespace):
+            return
+        observed = self._observed.get((namespace, key))
+        if observed is not None:
+            self._observed.invalidate((namespace, key))
+            try:
+                if not await self._set_if_unchanged(namespace, key, value, *observed):
+                    # Invalidated elsewhere while loading: the value may predate that write
+                    self.remote_stats["stale_sets"] += 1
+                    return
+            except RedisError as exc:
+                self._record_error("set", exc)
+        # Without an observed generation (Redis skipped or failing) the value is kept locally only
+        await self._local.set(namespace, key, value, token)
+
+    async def _set_if_unchanged(self, namespace: str, key: str, value: Any, version: int, generation: int) -> bool:
+        """SET the value unless the namespace version or the key generation moved since the miss."""
+        version_key, generation_key = self._version_key(namespace), self._generation_key(namespace, key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            await pipe.watch(version_key, generation_key)
+            current_version, current_generation = await pipe.mget(version_key, generation_key)
+            if (int(current_version or 0), int(current_generation or 0)) != (version, generation):
+                return False
+            pipe.multi()
+            pipe.set(self._key(namespace, version, key), orjson.dumps(value), px=int(self.ttl_seconds * 1000))
+            try:
+                await pipe.execute()
+            except WatchError:
+                return False
+        return True
+
+    def token(self, namespace: str) -> Hashable:
+        return self._local.token(namespace)
+
+    def invalidated_within(self, namespace: str, seconds: float) -> bool:
+        # Remote invalidations are applied to the local copy as their messages arrive
+        return self._local.invalidated_within(namespace, seconds)
+
+    def invalidate(self, namespace: str, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        self._local.invalidate(namespace, keys)
+        self._pending_keys.setdefault(namespace, Counter()).update(keys)
+        self._schedule(self._invalidate_remote(namespace, keys))
+
+    def clear(self, namespace: str) -> None:
+        self._local.clear(namespace)
+        self._pending_clears[namespace] = self._pending_clears.get(namespace, 0) + 1
+        self._schedule(self._clear_remote(namespace))
+
+    async def _invalidate_remote(self, namespace: str, keys: list[str]) -> None:
+        try:
+            version = await self._version(namespace)
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for key in keys:
+                    # Outlives any load that could still be holding the previous generation
+                    pipe.incr(self._generation_key(namespace, key))
+                    pipe.pexpire(self._generation_key(namespace, key), int(self.ttl_seconds * 1000))
+                pipe.delete(*(self._key(namespace, version, key) for key in keys))
+                await pipe.execute()
+            await self._publish({"op": "invalidate", "namespace": namespace, "keys": keys})
+        except RedisError as exc:
+            self._record_error("invalidate", exc)
+        finally:
+            pending = self._pending_keys[namespace]
+            pending.subtract(keys)
+            for key in set(keys):
+                if pending[key] <= 0:
+                    pending.pop(key, None)
+
+    async def _clear_remote(self, namespace: str) -> None:
+        try:
+            version = await self._redis.incr(self._version_key(namespace))
+            self._versions[namespace] = (version, time.monotonic())
+            await self._publish({"op": "clear", "namespace": namespace, "version": version})
+        except RedisError as exc:
+            self._record_error("clear", exc)
+            # Without a confirmed version, re-read it on the next access
+            self._versions.pop(namespace, None)
+        finally:
+            self._pending_clears[namespace] -= 1
+
+    async def _publish(self, message: dict) -> None:
+        await self._redis.publish(self.channel, orjson.dumps({**message, "origin": self._instance_id}))
+
+    def _schedule(self, coro) -> None:
+        """Run remote invalidation in the background (called from sync after-commit hooks)."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _apply(self, message: dict) -> None:
+        """Apply an invalidation published by another instance."""
+        if message.get("origin") == self._instance_id:
+            return
+        namespace = message["namespace"]
+        if message["op"] == "clear":
+            self._local.clear(namespace)
+            self._versions[namespace] = (int(message["version"]), time.monotonic())
+        else:
+            self._local.invalidate(namespace, message["keys"])
+
+    async def _listen(self) -> None:
+        """Subscribe to invalidations, resubscribing (and dropping local copies) after errors."""
+        while True:
+            pubsub = self._redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Messages may have been missed while disconnected
+                self._local.clear_all()
+                self._versions.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._apply(orjson.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, orjson.JSONDecodeError, KeyError) as exc:
+                self._record_error("subscribe", exc)
+            finally:
+                await pubsub.aclose()
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+    def _record_error(self, operation: str, exc: Exception) -> None:
+        self.remote_stats["errors"] += 1
+        logger.warning("Redis cache %s failed: %s", operation, exc)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        return {**self._local.snapshot(), "redis": dict(self.remote_stats)}
@@ -0,0 +1,22 @@
+"""
+Trusted JSON responses.
+
+Payloads the services build from database rows (RETURNING / Core row mappings) are
+already in their response shape, so they are serialized directly with orjson instead
+of being re-validated against the route's response_model. Routes keep response_model
+for the OpenAPI schema. Never use this for data that did not come from the database
+or a validated request model.
+"""
+from typing import Any
+
+import orjson
+from starlette.responses import Response
+
+
+class TrustedJSONResponse(Response):
+    """JSON response rendered with orjson, without response_model validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -0,0 +1,60 @@
+"""
+Single-flight: concurrent calls with the same key share one in-flight execution.
+
+Used for service reads so a burst of identical requests (or a hot cache key expiring)
+triggers one database query and holds one pooled connection, not one per request.
+Results (and exceptions) are shared, so they must be treated as read-only.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+
+    The first caller (the leader) runs the function; callers arriving while it runs
+    await the leader's result. If the leader is cancelled (e.g. its client went away),
+    one of the waiters takes over instead of failing with it.
+    """
+
+    def __init__(self, on_join: Callable[[Hashable], None] | None = None):
+        # Called with the key whenever a caller joins an in-flight call (e.g. to count it)
+        self._on_join = on_join
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return fn()'s result, sharing it with concurrent callers using the same key."""
+        while (future := self._calls.get(key)) is not None:
+            if self._on_join is not None:
+                self._on_join(key)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this waiter itself was cancelled
+                # The leader was cancelled; retry, possibly as the new leader
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved: no "never retrieved" warning without waiters
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,227 @@
+"""
+Change feed of catalogue events (CHANGE_FEED_ENABLED).
+
+migrations/0003_change_feed.sql appends every hall and recommendation change to the
+catalogue_events table (ids in commit order) and notifies channel `catalogue_events`. Each
+worker LISTENs for that, reads the new rows once and keeps the most recent
+CHANGE_FEED_BUFFER_SIZE events in memory: waiting clients are woken from there without a
+query of their own, and resumes from a recent event id are answered without the database.
+Because the log lives in Postgres, every worker and instance serves the same events under
+the same ids, whichever of them (or whatever script) made the write.
+
+The listener catches up from the table after (re)connecting, and once an hour even without
+a notification; the same pass prunes events older than CHANGE_FEED_RETENTION_HOURS.
+"""
+import asyncio
+import time
+from collections import deque
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
+from typing import Any
+
+import asyncpg
+import orjson
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.exceptions import ChangeFeedExpiredError
+from app.core.logger import setup_logger
+from app.core.metrics import change_feed_events
+from app.db.models import CatalogueEventModel
+from app.db.neondb import listen_dsn
+
+logger = setup_logger(__name__)
+
+CHANNEL = "catalogue_events"
+
+# Seconds between reconnect attempts of the listener
+_RECONNECT_DELAY_SECONDS = 1.0
+# Catch-up (in case a notification was lost) and pruning interval
+_PRUNE_INTERVAL_SECONDS = 3600.0
+
+_EVENTS = CatalogueEventModel.__table__
+_EVENT_COLUMNS = (_EVENTS.c.id, _EVENTS.c.event_type, _EVENTS.c.hall_id, _EVENTS.c.data, _EVENTS.c.created_at)
+
+
+class ChangeEvent:
+    """One catalogue change; its JSON is rendered once and shared by every subscriber."""
+
+    __slots__ = ("id", "type", "hall_id", "payload", "encoded")
+
+    def __init__(self, row: Mapping[str, Any]):
+        self.id = row["id"]
+        self.type = row["event_type"]
+        self.hall_id = row["hall_id"]
+        self.payload = {
+            "id": self.id,
+            "type": self.type,
+            "hall_id": self.hall_id,
+            "data": row["data"],
+            "created_at": row["created_at"],
+        }
+        self.encoded = orjson.dumps(self.payload)
+
+
+class ChangeFeed:
+    """The most recent events in id order, fed from LISTEN; older ones are read from the table."""
+
+    def __init__(self, buffer_size: int = settings.CHANGE_FEED_BUFFER_SIZE):
+        self.ready = False
+        self.last_id = 0
+        # Every event with an id above _floor is in _recent
+        self._floor = 0
+        self._recent: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        # Replaced after each set(), so every waiter of a batch is woken exactly once
+        self._arrived = asyncio.Event()
+        self._notified = asyncio.Event()
+        self._engine: AsyncEngine | None = None
+        self._task: asyncio.Task | None = None
+        self._pruned_at = 0.0
+
+    # Reads
+
+    def start_at(self, last_id: int) -> None:
+        """Serve events after last_id (the newest one at startup)."""
+        self.last_id = self._floor = last_id
+        self._recent.clear()
+
+    def append(self, events: Iterable[ChangeEvent]) -> None:
+        """Buffer new events (in id order) and wake the waiting subscribers."""
+        added = False
+        for event in events:
+            if event.id <= self.last_id:
+                continue
+            if len(self._recent) == self._recent.maxlen:
+                self._floor = self._recent[0].id
+            self._recent.append(event)
+            self.last_id = event.id
+            change_feed_events.inc(1.0, event.type)
+            added = True
+        if added:
+            self._arrived.set()
+            self._arrived = asyncio.Event()
+
+    def recent_after(self, after_id: int) -> list[ChangeEvent] | None:
+        """Buffered events with id > after_id, or None when some may have left the buffer."""
+        if after_id < self._floor:
+            return None
+        events = []
+        for event in reversed(self._recent):
+            if event.id <= after_id:
+                break
+            events.append(event)
+        events.reverse()
+        return events
+
+    async def events_after(self, after_id: int, limit: int) -> list[ChangeEvent]:
+        """Up to limit events with id > after_id; ChangeFeedExpiredError if some were pruned."""
+        events = self.recent_after(after_id)
+        if events is None:
+            return await self._read_after(after_id, limit)
+        return events[:limit]
+
+    async def wait_for_events(self, after_id: int, timeout: float, limit: int) -> list[ChangeEvent]:
+        """Like events_after, but waits up to timeout seconds for the first event to arrive."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        events = await self.events_after(after_id, limit)
+        while not events:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except TimeoutError:
+                break
+            events = await self.events_after(after_id, limit)
+        return events
+
+    async def _read_after(self, after_id: int, limit: int, check_retention: bool = True) -> list[ChangeEvent]:
+        async with self._engine.connect() as connection:
+            if check_retention:
+                oldest = await connection.scalar(select(func.min(_EVENTS.c.id)))
+                # Pruning always keeps the newest event, so an empty table has never had one
+                if oldest is not None and oldest > after_id + 1:
+                    raise ChangeFeedExpiredError(after_id, oldest)
+            rows = await connection.execute(
+                select(*_EVENT_COLUMNS).where(_EVENTS.c.id > after_id).order_by(_EVENTS.c.id).limit(limit)
+            )
+            return [ChangeEvent(row) for row in rows.mappings()]
+
+    # Listener
+
+    async def start(self, engine: AsyncEngine, db_url: str) -> None:
+        """Listen for new events in the background; `ready` once listening."""
+        self._engine = engine
+        self._task = asyncio.create_task(self._run(listen_dsn(db_url)))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _on_notify(self, _connection, _pid, _channel, _payload: str) -> None:
+        self._notified.set()
+
+    def _on_terminate(self, _connection) -> None:
+        self._notified.set()
+
+    async def _run(self, dsn: str) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                connection.add_termination_listener(self._on_terminate)
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if not self.ready:
+                    async with self._engine.connect() as db:
+                        self.start_at(await db.scalar(select(func.coalesce(func.max(_EVENTS.c.id), 0))))
+                    self.ready = True
+                    logger.info("Change feed listening from event %d", self.last_id)
+                # Events may have been committed while not listening
+                self._notified.set()
+                while not connection.is_closed():
+                    try:
+                        await asyncio.wait_for(self._notified.wait(), _PRUNE_INTERVAL_SECONDS)
+                    except TimeoutError:
+                        pass
+                    self._notified.clear()
+                    await self._catch_up()
+                    await self._prune_if_due()
+                logger.warning("Change feed listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Change feed refresh failed: %s", exc)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+    async def _catch_up(self) -> None:
+        page_size = self._recent.maxlen
+        while True:
+            # After a very long disconnect this skips what was pruned meanwhile
+            events = await self._read_after(self.last_id, page_size, check_retention=False)
+            self.append(events)
+            if len(events) < page_size:
+                return
+
+    async def _prune_if_due(self) -> None:
+        now = time.monotonic()
+        if self._pruned_at and now - self._pruned_at < _PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        cutoff = func.now() - timedelta(hours=settings.CHANGE_FEED_RETENTION_HOURS)
+        newest = select(func.max(_EVENTS.c.id)).scalar_subquery()
+        async with self._engine.begin() as connection:
+            result = await connection.execute(
+                delete(_EVENTS).where(_EVENTS.c.created_at < cutoff, _EVENTS.c.id < newest)
+            )
+        if result.rowcount:
+            logger.info("Pruned %d change feed events", result.rowcount)
+
+
+change_feed = ChangeFeed()
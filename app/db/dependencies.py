@@ -1,19 +1,60 @@
-"""Database session dependency: one async session per request, commit/rollback on success/error."""
+"""
+Database session dependencies: one async session per request.
+get_async_session commits/rolls back (writes); get_read_session runs in autocommit (reads).
+Both admit the request through its route class's admission controller (see
+app/core/admission.py) on the session's first statement, so overload is shed with a 503
+instead of queueing in the pool, while cache hits and coalesced reads are never shed.
+"""
 from collections.abc import AsyncGenerator
 
 from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.admission import READ, WRITE, admit
+from app.db.routing import client_last_write
+from app.db.snapshot import catalogue_snapshot
+
 
 async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Request-scoped async session: commit on success, rollback on error."""
     factory: async_sessionmaker[AsyncSession] = request.app.state.async_session_factory
-    async with factory() as session:
+    async with factory(admission=admit(WRITE)) as session:
         try:
             yield session
             await session.commit()
+            request.app.state.read_router.mark_write()
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-scoped autocommit session for read-only endpoints: no BEGIN/COMMIT round trips.
+    Served by a read replica when configured (see ReadRouter). Each statement runs on
+    its own, so never write through this session.
+    """
+    factory: async_sessionmaker[AsyncSession] = request.app.state.read_router.session_factory(
+        client_last_write(request),
+    )
+    async with factory(admission=admit(READ)) as session:
+        yield session
+
+
+async def get_catalogue_read_session(request: Request) -> AsyncGenerator[AsyncSession | None, None]:
+    """
+    get_read_session for the catalogue reads (list, detail, recommendations). While the
+    in-memory snapshot is serving them (SNAPSHOT_MODE_ENABLED) no session is opened and
+    no admission slot is taken: yields None. Within the read-after-write window (see
+    ReadRouter) reads go to the primary instead, as the snapshot may not have the write yet.
+    """
+    router = request.app.state.read_router
+    last_write = client_last_write(request)
+    if catalogue_snapshot.ready and not router.in_write_window(last_write):
+        yield None
+        return
+    factory: async_sessionmaker[AsyncSession] = router.session_factory(last_write)
+    async with factory(admission=admit(READ)) as session:
+        yield session
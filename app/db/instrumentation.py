@@ -0,0 +1,134 @@
+"""
+SQLAlchemy engine and pool instrumentation feeding app/core/metrics.py.
+
+- before/after_cursor_execute: statement durations, per-request DB time and statement count,
+  SQLAlchemy compiled-cache hits and prepared-statement lookups.
+- statement_name_func: counts asyncpg prepares (prepared-statement cache misses).
+- TimedAsyncAdaptedQueuePool: time spent waiting for a connection checkout.
+- Metrics collectors that sample pool occupancy/saturation and statement-cache hit ratios at scrape time.
+"""
+import time
+import uuid
+import weakref
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import (
+    current_request_stats,
+    db_compiled_cache,
+    db_pool_capacity,
+    db_pool_checked_out,
+    db_pool_saturation,
+    db_pool_wait,
+    db_prepared_statement_lookups,
+    db_statement_cache_hit_ratio,
+    db_statement_duration,
+    db_statements_prepared,
+    registry,
+)
+
+# Start time of context-less (internal) statements; one slot, overwritten by the next statement
+_STARTED_AT_KEY = "metrics_started_at"
+_CACHE_RESULTS = {CACHE_HIT: "hit", CACHE_MISS: "miss"}
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited (including connects)."""
+
+    engine_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            db_pool_wait.observe(waited, self.engine_name)
+            stats = current_request_stats.get()
+            if stats is not None:
+                stats.pool_wait += waited
+
+
+def statement_name_func(name: str, unique: bool) -> Callable[[], str | None]:
+    """
+    asyncpg `prepared_statement_name_func` for engine `name`: SQLAlchemy calls it for every
+    statement it prepares, i.e. on each prepared-statement cache miss, which is counted.
+    With unique=True every statement gets a process-wide unique name (transaction-mode
+    poolers such as PgBouncer would otherwise see clashing per-connection names);
+    otherwise asyncpg picks the name.
+    """
+    def statement_name() -> str | None:
+        db_statements_prepared.inc(1.0, name)
+        return f"__asyncpg_{uuid.uuid4().hex}__" if unique else None
+
+    return statement_name
+
+
+def statement_timing_hooks(
+    name: str, clock: Callable[[], float] = time.perf_counter,
+) -> tuple[Callable, Callable]:
+    """
+    before/after_cursor_execute listeners for engine `name`. Start times are kept in a
+    WeakKeyDictionary keyed by the statement's execution context, so a statement that
+    raises (and never reaches the after hook) leaves nothing behind once its context is gone.
+    """
+    started_at: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def before_cursor_execute(conn, _cursor, _statement, _parameters, context, _executemany):
+        if context is not None:
+            started_at[context] = clock()
+        else:
+            conn.info[_STARTED_AT_KEY] = clock()
+
+    def after_cursor_execute(conn, _cursor, statement, _parameters, context, executemany):
+        if context is not None:
+            elapsed = clock() - started_at.pop(context)
+            db_compiled_cache.inc(1.0, name, _CACHE_RESULTS.get(context.cache_hit, "uncached"))
+        else:
+            elapsed = clock() - conn.info.pop(_STARTED_AT_KEY)
+        db_statement_duration.observe(elapsed, name)
+        if not executemany:
+            # Single executions go through the prepared-statement cache (executemany does not)
+            db_prepared_statement_lookups.inc(1.0, name)
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.db_time += elapsed
+            stats.statements += 1
+            if stats.queries is not None:
+                stats.queries.append((statement, elapsed))
+
+    return before_cursor_execute, after_cursor_execute
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Attach statement timing hooks and pool/statement-cache collectors to engine, labelled `name`."""
+    sync_engine = engine.sync_engine
+    pool = sync_engine.pool
+    if isinstance(pool, TimedAsyncAdaptedQueuePool):
+        pool.engine_name = name
+
+    before_cursor_execute, after_cursor_execute = statement_timing_hooks(name)
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+    def collect_pool() -> None:
+        checked_out = pool.checkedout()
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        db_pool_checked_out.set(checked_out, name)
+        db_pool_capacity.set(capacity, name)
+        db_pool_saturation.set(checked_out / capacity if capacity else 0.0, name)
+
+    def collect_statement_caches() -> None:
+        hits = db_compiled_cache.value(name, "hit")
+        compiled = hits + db_compiled_cache.value(name, "miss")
+        db_statement_cache_hit_ratio.set(hits / compiled if compiled else 0.0, name, "compiled")
+        lookups = db_prepared_statement_lookups.value(name)
+        prepared = db_statements_prepared.value(name)
+        db_statement_cache_hit_ratio.set(max(lookups - prepared, 0) / lookups if lookups else 0.0, name, "prepared")
+
+    registry.add_collector(f"pool:{name}", collect_pool)
+    registry.add_collector(f"statement_cache:{name}", collect_statement_caches)
@@ -1,10 +1,13 @@
 """
 SQLAlchemy ORM models for Neon PostgreSQL (declarative style).
-Tables: music_halls, music_hall_recommendations.
+Tables: music_halls, music_hall_recommendations, music_hall_tombstones, catalogue_events.
 """
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    BigInteger, Boolean, Computed, DateTime, ForeignKey, Index, Integer, Sequence, String, Text, func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -13,10 +16,28 @@ class Base(DeclarativeBase):
     pass
 
 
+# Shared by music_halls.row_version and music_hall_tombstones.row_version
+ROW_VERSION_SEQ = Sequence("music_halls_row_version_seq", metadata=Base.metadata)
+
+
 class MusicHallModel(Base):
     """ORM model for music_halls table."""
 
     __tablename__ = "music_halls"
+    # Search indexes are created by migrations/0001_hall_search.sql
+    __table_args__ = (
+        Index("ix_music_halls_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_music_halls_hall_name_trgm", "hall_name",
+            postgresql_using="gin", postgresql_ops={"hall_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_music_halls_city_trgm", "city",
+            postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"},
+        ),
+        # Delta sync (migrations/0004_delta_sync.sql)
+        Index("ix_music_halls_row_version", "row_version", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     city: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -25,11 +46,34 @@ class MusicHallModel(Base):
     stage: Mapped[bool] = mapped_column(Boolean, nullable=False)
     pipe_height: Mapped[int] = mapped_column(Integer, nullable=False)
     stage_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Generated full-text document; deferred so regular hall queries never load it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(hall_name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(city, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+    # Bumped (with updated_at) on every change, in commit order, by the triggers in
+    # migrations/0004_delta_sync.sql; deferred so hall queries never load them implicitly
+    row_version: Mapped[int] = mapped_column(
+        BigInteger, server_default=ROW_VERSION_SEQ.next_value(), nullable=False, deferred=True,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, deferred=True,
+    )
 
+    # lazy="raise": relationships are never loaded implicitly; queries that need them
+    # opt in with selectinload()/joinedload(), so plain hall fetches stay one statement.
+    # passive_deletes: the FK's ON DELETE CASCADE removes recommendations, so deleting
+    # a hall must not load them first.
     recommendations: Mapped[list["MusicHallRecommendationModel"]] = relationship(
         "MusicHallRecommendationModel",
         back_populates="hall",
-        lazy="selectin",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     def to_dict(self) -> dict:
@@ -51,6 +95,9 @@ class MusicHallRecommendationModel(Base):
     """
 
     __tablename__ = "music_hall_recommendations"
+    __table_args__ = (
+        Index("ix_music_hall_recommendations_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     hall_id: Mapped[int] = mapped_column(
         Integer,
@@ -64,9 +111,14 @@ class MusicHallRecommendationModel(Base):
         nullable=False,
         server_default=func.now(),
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(recommendation, ''))", persisted=True),
+        deferred=True,
+    )
 
     hall: Mapped["MusicHallModel"] = relationship(
-        "MusicHallModel", back_populates="recommendations"
+        "MusicHallModel", back_populates="recommendations", lazy="raise"
     )
 
     def to_dict(self) -> dict:
@@ -74,3 +126,48 @@ class MusicHallRecommendationModel(Base):
             "recommendation": self.recommendation,
             "update_date": self.update_date.date() if self.update_date else None,
         }
+
+
+class MusicHallTombstoneModel(Base):
+    """
+    ORM model for music_hall_tombstones table: one row per deleted hall, for delta sync.
+    Written by the delete trigger in migrations/0004_delta_sync.sql; removed when the id is reused.
+    """
+
+    __tablename__ = "music_hall_tombstones"
+    __table_args__ = (
+        Index("ix_music_hall_tombstones_row_version", "row_version", unique=True),
+    )
+
+    hall_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    row_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class CatalogueEventModel(Base):
+    """
+    ORM model for catalogue_events table: the change feed's event log.
+    Rows are written only by the triggers in migrations/0003_change_feed.sql, in commit order.
+    """
+
+    __tablename__ = "catalogue_events"
+    __table_args__ = (
+        Index("ix_catalogue_events_created_at", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # hall.created | hall.updated | hall.deleted | recommendation.created | recommendation.deleted
+    event_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    hall_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # The hall's (or recommendation's) fields after the change; the deleted recommendation for
+    # recommendation.deleted; null for hall.deleted
+    data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
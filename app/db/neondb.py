@@ -5,10 +5,21 @@ You set DB_URL to your Neon connection string (e.g. with ?sslmode=require).
 We have to adjust it because:
 - SQLAlchemy async needs postgresql+asyncpg:// (not postgresql://).
 - asyncpg does not accept sslmode in the URL; we strip it and pass ssl=True instead.
+The same applies to the optional read-replica URLs (DB_READ_REPLICA_URLS).
+
+At startup warm_up_db() pre-opens DB_POOL_WARM_SIZE connections per engine in the
+background; /health/ready reports ready only once that has succeeded.
 """
+import asyncio
+import time
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
 from fastapi import FastAPI
+from sqlalchemy import Executable, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -17,16 +28,26 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.core.config import settings
+from app.core.logger import setup_logger
+from app.db.instrumentation import TimedAsyncAdaptedQueuePool, instrument_engine, statement_name_func
+from app.db.routing import REPLICA_SESSION_INFO, ReadRouter
+from app.db.sessions import AdmittedSession
+
+logger = setup_logger(__name__)
 
+# Backoff between pool warm-up attempts while the database is unreachable
+_WARMUP_RETRY_INITIAL_SECONDS = 0.5
+_WARMUP_RETRY_MAX_SECONDS = 30.0
 
-def _engine_url_and_ssl() -> tuple[str, dict]:
+
+def _engine_url_and_ssl(db_url: str) -> tuple[str, dict]:
     """
-    Build URL and connect_args for create_async_engine from DB_URL.
+    Build URL and connect_args for create_async_engine from a DB_URL-style URL.
     - Switches postgresql:// → postgresql+asyncpg://.
     - Removes sslmode (and related) from the URL and sets connect_args["ssl"] = True
       when SSL is required (Neon uses sslmode=require; asyncpg expects ssl=True).
     """
-    url = settings.DB_URL.strip()
+    url = db_url.strip()
     if url.startswith("postgresql://"):
         url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
     parsed = urlparse(url)
@@ -44,31 +65,199 @@ def _engine_url_and_ssl() -> tuple[str, dict]:
     return clean_url, connect_args
 
 
-async def init_db(app: FastAPI) -> None:
-    """Create async engine and session factory; attach to app.state."""
-    url, connect_args = _engine_url_and_ssl()
+def pool_limits_per_worker(pool_size: int, max_overflow: int, workers: int) -> tuple[int, int]:
+    """
+    Split server-wide pool_size/max_overflow evenly across worker processes, so the total
+    connection count per engine stays within the configured (Neon) budget of
+    pool_size + max_overflow. Every worker needs one pooled connection, so with more workers
+    than that budget the total is `workers` connections, over budget (app.server warns).
+
+    Not part of this budget: the LISTEN connections each worker opens to the direct
+    (non-pooler) host, see listener_connections().
+    """
+    per_worker = max((pool_size + max_overflow) // workers, 1)
+    pool = min(max(pool_size // workers, 1), per_worker)
+    return pool, per_worker - pool
+
+
+def listener_connections() -> int:
+    """
+    Dedicated LISTEN connections per worker, outside the pool and its budget: one for the
+    catalogue snapshot (SNAPSHOT_MODE_ENABLED), one for the change feed (CHANGE_FEED_ENABLED).
+    """
+    return int(settings.SNAPSHOT_MODE_ENABLED) + int(settings.CHANGE_FEED_ENABLED)
+
+
+def uses_transaction_pooler(db_url: str) -> bool:
+    """DB_TRANSACTION_POOLER, or, when unset, whether db_url is a Neon pooled ("-pooler") endpoint."""
+    if settings.DB_TRANSACTION_POOLER is not None:
+        return settings.DB_TRANSACTION_POOLER
+    return "-pooler" in (urlparse(db_url.strip()).hostname or "")
+
+
+def listen_dsn(db_url: str) -> str:
+    """
+    libpq-style DSN for the LISTEN connection. LISTEN needs a session of its own, so a
+    Neon pooled ("-pooler") host is swapped for the direct one; sslmode stays in the URL.
+    """
+    parsed = urlparse(db_url.strip().replace("postgresql+asyncpg://", "postgresql://", 1))
+    if parsed.hostname and "-pooler" in parsed.hostname:
+        parsed = parsed._replace(netloc=parsed.netloc.replace("-pooler", "", 1))
+    return urlunparse(parsed)
+
+
+def _statement_cache_args(db_url: str, name: str) -> dict:
+    """
+    asyncpg connect_args for prepared statements. SQLAlchemy prepares each statement once
+    per connection and keeps up to DB_STATEMENT_CACHE_SIZE of them, keyed by SQL text.
+    Behind a transaction-mode pooler consecutive transactions may run on different server
+    connections, so statement names are made unique (PgBouncer >= 1.21 with
+    max_prepared_statements, as on Neon, re-prepares them where needed) and asyncpg's own
+    statement cache is off. Set DB_STATEMENT_CACHE_SIZE=0 for poolers without
+    prepared-statement support.
+    """
+    transaction_pooler = uses_transaction_pooler(db_url)
+    args = {
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_name_func": statement_name_func(name, unique=transaction_pooler),
+    }
+    if transaction_pooler:
+        args["statement_cache_size"] = 0
+    return args
+
+
+def _create_engine(db_url: str, name: str) -> AsyncEngine:
+    """Engine with its own pool, instrumented for /metrics under label `name`."""
+    url, connect_args = _engine_url_and_ssl(db_url)
+    connect_args |= _statement_cache_args(db_url, name)
+    pool_size, max_overflow = pool_limits_per_worker(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.WEB_CONCURRENCY,
+    )
     engine = create_async_engine(
         url,
         connect_args=connect_args,
-        pool_size=settings.DB_POOL_SIZE,
-        max_overflow=settings.DB_MAX_OVERFLOW,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
         pool_pre_ping=True,
         echo=False,
     )
+    instrument_engine(engine, name)
+    return engine
+
+
+def _read_session_factory(engine: AsyncEngine, replica: bool = False) -> async_sessionmaker[AsyncSession]:
+    """Autocommit sessions on engine's pool: a read is a single SELECT, no BEGIN/COMMIT."""
+    return async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AdmittedSession,
+        expire_on_commit=False,
+        autoflush=False,
+        info={REPLICA_SESSION_INFO: replica},
+    )
+
+
+@dataclass
+class PoolWarmup:
+    """Readiness state of the pools (app.state.pool_warmup)."""
+    ready: bool = False
+    connections: int = 0
+    attempts: int = 0
+    seconds: float | None = None
+
+
+async def init_db(app: FastAPI) -> None:
+    """
+    Create async engines and session factories; attach to app.state.
+
+    - async_session_factory: transactional sessions on the primary (writes).
+    - async_read_session_factory: autocommit sessions on the primary.
+    - read_router: picks the read factory per request, spreading reads over
+      DB_READ_REPLICA_URLS (each with its own engine and pool) when configured.
+    """
+    engine = _create_engine(settings.DB_URL, "primary")
     session_factory = async_sessionmaker(
         engine,
-        class_=AsyncSession,
+        class_=AdmittedSession,
         expire_on_commit=False,
         autoflush=False,
         autocommit=False,
     )
+    read_session_factory = _read_session_factory(engine)
+    replicas = []
+    for index, replica_url in enumerate(settings.DB_READ_REPLICA_URLS):
+        replica_engine = _create_engine(replica_url, f"replica-{index}")
+        replicas.append((replica_engine, _read_session_factory(replica_engine, replica=True)))
     app.state.async_engine = engine
     app.state.async_session_factory = session_factory
+    app.state.async_read_session_factory = read_session_factory
+    app.state.replica_engines = [replica_engine for replica_engine, _ in replicas]
+    app.state.read_router = ReadRouter(read_session_factory, replicas, settings.DB_READ_AFTER_WRITE_SECONDS)
+    app.state.pool_warmup = PoolWarmup()
+
+
+async def warm_pool(
+    engine: AsyncEngine, size: int, statements: Sequence[tuple[Executable, dict[str, Any]]] = (),
+) -> int:
+    """
+    Open `size` connections on engine at once, run every (statement, params) on each (so it is
+    compiled and prepared on that connection), then return them all to the pool.
+    Connect, TLS, auth and (on Neon) compute wake-up are paid here, not by the first requests.
+
+    Returns:
+        Number of connections warmed.
+    """
+    if size <= 0:
+        return 0
+
+    async with AsyncExitStack() as stack:
+        async def open_connection() -> None:
+            connection = await stack.enter_async_context(engine.connect())
+            for statement, params in statements or ((text("SELECT 1"), {}),):
+                await connection.execute(statement, params)
+
+        results = await asyncio.gather(*(open_connection() for _ in range(size)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return size
+
+
+async def warm_up_db(app: FastAPI, statements: Sequence[tuple[Executable, dict[str, Any]]] = ()) -> None:
+    """
+    Warm DB_POOL_WARM_SIZE connections (capped at this worker's pool size) on the primary
+    and every replica, retrying with backoff while the database is unreachable, then mark
+    app.state.pool_warmup ready. Run as a background task so liveness answers meanwhile.
+    """
+    state: PoolWarmup = app.state.pool_warmup
+    pool_size, _ = pool_limits_per_worker(
+        settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, settings.WEB_CONCURRENCY,
+    )
+    size = min(settings.DB_POOL_WARM_SIZE, pool_size)
+    engines = [app.state.async_engine, *app.state.replica_engines]
+    started = time.perf_counter()
+    delay = _WARMUP_RETRY_INITIAL_SECONDS
+    while True:
+        state.attempts += 1
+        try:
+            warmed = await asyncio.gather(*(warm_pool(engine, size, statements) for engine in engines))
+            break
+        except Exception as exc:
+            logger.warning("Pool warm-up attempt %d failed: %s", state.attempts, exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _WARMUP_RETRY_MAX_SECONDS)
+    state.connections = sum(warmed)
+    state.seconds = round(time.perf_counter() - started, 3)
+    state.ready = True
+    logger.info("Pools warm: %d connection(s) in %.3fs", state.connections, state.seconds)
 
 
 async def close_db(app: FastAPI) -> None:
-    """Dispose engine on shutdown."""
+    """Dispose engines (primary and replicas) on shutdown."""
     engine: AsyncEngine | None = getattr(app.state, "async_engine", None)
     if engine is not None:
         await engine.dispose()
         app.state.async_engine = None
+    for replica_engine in getattr(app.state, "replica_engines", []):
+        await replica_engine.dispose()
+    app.state.replica_engines = []
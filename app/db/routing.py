@@ -0,0 +1,112 @@
+"""
+Read/write routing between the Neon primary and optional read replicas.
+"""
+import itertools
+import math
+import time
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Cookie (and header, for clients without a cookie jar) carrying the client's last write time
+LAST_WRITE_COOKIE = "last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+# Session.info flag set on replica sessions: their results may predate a recent write
+REPLICA_SESSION_INFO = "replica"
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def client_last_write(connection: HTTPConnection) -> float | None:
+    """The client's last write (Unix seconds) from its cookie or X-Last-Write header, if any."""
+    raw = connection.cookies.get(LAST_WRITE_COOKIE) or connection.headers.get(LAST_WRITE_HEADER)
+    if raw is None:
+        return None
+    try:
+        return int(raw) / 1000
+    except ValueError:
+        return None
+
+
+class ReadRouter:
+    """
+    Picks the session factory for read-only requests.
+
+    Reads go to the least busy replica (fewest checked-out connections, ties broken
+    round-robin). For `read_after_write_seconds` after a write, reads go to the primary
+    so clients see their own writes despite replication lag. The window is opened by a
+    write committed in this process, or by the client's own last-write time (see
+    ReadAfterWriteMiddleware), which works whichever worker or instance serves the read.
+    Clients that send neither cookie nor header get the per-process window only:
+    best-effort when several workers run. The same window keeps catalogue reads off the
+    snapshot (get_catalogue_read_session), which may not have applied the write yet.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: list[tuple[AsyncEngine, async_sessionmaker[AsyncSession]]],
+        read_after_write_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.read_after_write_seconds = read_after_write_seconds
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._last_write = float("-inf")
+        self._offsets = itertools.cycle(range(len(replicas) or 1))
+
+    def mark_write(self) -> None:
+        """Record that a write just committed; pins this process's reads to the primary for the window."""
+        self._last_write = self._clock()
+
+    def in_write_window(self, client_last_write: float | None = None) -> bool:
+        """Whether this process, or the reader (client_last_write, Unix seconds), wrote within the window."""
+        if self._clock() - self._last_write < self.read_after_write_seconds:
+            return True
+        return client_last_write is not None and self._wall_clock() - client_last_write < self.read_after_write_seconds
+
+    def session_factory(self, client_last_write: float | None = None) -> async_sessionmaker[AsyncSession]:
+        """Session factory for the next read; client_last_write is the reader's last write (Unix seconds)."""
+        if not self.replicas or self.in_write_window(client_last_write):
+            return self.primary
+        offset = next(self._offsets)
+        rotated = self.replicas[offset:] + self.replicas[:offset]
+        _, factory = min(rotated, key=lambda replica: replica[0].sync_engine.pool.checkedout())
+        return factory
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Stamps successful write responses with the write time (Set-Cookie and X-Last-Write, Unix ms),
+    so the client's next reads are routed to the primary for the window on any worker.
+    """
+
+    def __init__(self, app: ASGIApp, read_after_write_seconds: float, wall_clock: Callable[[], float] = time.time):
+        self.app = app
+        self.max_age = math.ceil(read_after_write_seconds)
+        self._wall_clock = wall_clock
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_stamp(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                stamp = str(int(self._wall_clock() * 1000))
+                headers = MutableHeaders(scope=message)
+                headers.append(LAST_WRITE_HEADER, stamp)
+                headers.append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={stamp}; Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_stamp)
@@ -0,0 +1,68 @@
+"""
+Sessions that take their admission slot (app/core/admission.py) on first database use.
+
+A request dependency opens a session before the service knows whether it needs the
+database: cache hits, snapshot reads and coalesced joiners of a single-flight load never
+touch it. Admitting on the first statement instead of on open means only the requests
+about to check out a connection count against (and are shed by) admission control.
+"""
+from typing import Any, AsyncContextManager
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AdmittedSession(AsyncSession):
+    """
+    AsyncSession that enters `admission` (e.g. admit(READ)) before its first statement
+    and leaves it on close(). Without `admission` it is a plain AsyncSession.
+    """
+
+    def __init__(self, *args: Any, admission: AsyncContextManager[None] | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._admission = admission
+        self._admitted = False
+
+    async def _admit(self) -> None:
+        if self._admission is not None and not self._admitted:
+            await self._admission.__aenter__()
+            self._admitted = True
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().execute(*args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().scalar(*args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().scalars(*args, **kwargs)
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().get(*args, **kwargs)
+
+    async def stream(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().stream(*args, **kwargs)
+
+    async def stream_scalars(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().stream_scalars(*args, **kwargs)
+
+    async def connection(self, *args: Any, **kwargs: Any) -> Any:
+        await self._admit()
+        return await super().connection(*args, **kwargs)
+
+    async def flush(self, *args: Any, **kwargs: Any) -> None:
+        await self._admit()
+        await super().flush(*args, **kwargs)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            if self._admitted:
+                admission, self._admission, self._admitted = self._admission, None, False
+                await admission.__aexit__(None, None, None)
@@ -0,0 +1,282 @@
+"""
+In-memory catalogue snapshot (SNAPSHOT_MODE_ENABLED).
+
+The whole catalogue (halls with their recommendations) is loaded from the primary at
+startup into compact __slots__ records, indexed by id (plus a sorted id list for keyset
+pages) and by city. While it is ready, the list, detail and recommendation reads are
+answered from it without a session or a pooled connection.
+
+It is kept current from Postgres LISTEN/NOTIFY: migrations/0002_catalogue_notify.sql
+notifies channel `catalogue_changes` with the hall ids each write statement touched, and
+those halls are re-read (coalesced, one refresh at a time). The listener connects
+before the initial load, so nothing committed during the load is missed; after a lost
+connection (or a {"reload": true} message) the snapshot is reloaded in full.
+Reads see a write once its notification has been applied, typically within milliseconds.
+While the listener is down, notifications are lost: the snapshot stops being `ready` at
+once, so reads go to the database until the reconnect's full reload has finished.
+"""
+import asyncio
+import bisect
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date
+from typing import Any
+
+import asyncpg
+import orjson
+from sqlalchemy import Date, cast, select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.logger import setup_logger
+from app.core.metrics import snapshot_halls, snapshot_refreshes
+from app.db.models import MusicHallRecommendationModel
+from app.db.neondb import listen_dsn
+from app.db.statements import HALL_COLUMNS, HALLS
+
+logger = setup_logger(__name__)
+
+CHANNEL = "catalogue_changes"
+
+# Seconds between reconnect attempts of the listener
+_RECONNECT_DELAY_SECONDS = 1.0
+
+_RECOMMENDATIONS = MusicHallRecommendationModel.__table__
+_RECOMMENDATION_COLUMNS = (
+    _RECOMMENDATIONS.c.hall_id,
+    _RECOMMENDATIONS.c.recommendation,
+    cast(_RECOMMENDATIONS.c.update_date, Date).label("update_date"),
+)
+
+
+class HallRecord:
+    """One hall with its recommendations (newest first) as (text, date) pairs."""
+
+    __slots__ = ("id", "city", "hall_name", "email", "stage", "pipe_height", "stage_type", "recommendations")
+
+    def __init__(self, row: Mapping[str, Any], recommendations: tuple[tuple[str, date], ...] = ()):
+        self.id = row["id"]
+        # Cities and stage types repeat across halls: share one string each
+        self.city = sys.intern(row["city"])
+        self.hall_name = row["hall_name"]
+        self.email = row["email"]
+        self.stage = row["stage"]
+        self.pipe_height = row["pipe_height"]
+        self.stage_type = sys.intern(row["stage_type"])
+        self.recommendations = recommendations
+
+    def __getitem__(self, name: str) -> Any:
+        """Row-style access, so records project like result mappings."""
+        return getattr(self, name)
+
+    def to_dict(self) -> dict:
+        """The hall's fields, as GET /db/music-halls/{id} returns them."""
+        return {
+            "id": self.id,
+            "city": self.city,
+            "hall_name": self.hall_name,
+            "email": self.email,
+            "stage": self.stage,
+            "pipe_height": self.pipe_height,
+            "stage_type": self.stage_type,
+        }
+
+    def recommendation_dicts(self) -> list[dict]:
+        return [{"recommendation": text, "update_date": day} for text, day in self.recommendations]
+
+
+async def load_records(engine: AsyncEngine, hall_ids: Iterable[int] | None = None) -> list[HallRecord]:
+    """Halls (all, or those in hall_ids that still exist) with their recommendations, by id."""
+    halls_stmt = select(*HALL_COLUMNS).order_by(HALLS.c.id)
+    recommendations_stmt = select(*_RECOMMENDATION_COLUMNS).order_by(
+        _RECOMMENDATIONS.c.hall_id, _RECOMMENDATIONS.c.update_date.desc(),
+    )
+    if hall_ids is not None:
+        hall_ids = list(hall_ids)
+        halls_stmt = halls_stmt.where(HALLS.c.id.in_(hall_ids))
+        recommendations_stmt = recommendations_stmt.where(_RECOMMENDATIONS.c.hall_id.in_(hall_ids))
+    async with engine.connect() as connection:
+        # One snapshot of both tables
+        await connection.execution_options(isolation_level="REPEATABLE READ")
+        halls = (await connection.execute(halls_stmt)).mappings().all()
+        recommendations: dict[int, list[tuple[str, date]]] = {}
+        for row in (await connection.execute(recommendations_stmt)).mappings():
+            recommendations.setdefault(row["hall_id"], []).append((row["recommendation"], row["update_date"]))
+    return [HallRecord(row, tuple(recommendations.get(row["id"], ()))) for row in halls]
+
+
+class CatalogueSnapshot:
+    """Halls by id, a sorted id list and per-city sorted id lists, refreshed from NOTIFY."""
+
+    def __init__(self):
+        # Serving reads: loaded and listening. `loaded` stays set through listener outages
+        self.ready = False
+        self.loaded = False
+        # Bumped on every change, so derived data (e.g. list pages) can be reused until then
+        self.version = 0
+        self._halls: dict[int, HallRecord] = {}
+        self._ids: list[int] = []
+        self._ids_by_city: dict[str, list[int]] = {}
+        self._pending: set[int] = set()
+        self._reload_requested = False
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._halls)
+
+    # Reads
+
+    def get(self, hall_id: int) -> HallRecord | None:
+        return self._halls.get(hall_id)
+
+    def iter_halls(self, city: str | None = None, after_id: int | None = None) -> Iterator[HallRecord]:
+        """Halls in id order, optionally only in city and only with id > after_id."""
+        ids = self._ids if city is None else self._ids_by_city.get(city, [])
+        start = 0 if after_id is None else bisect.bisect_right(ids, after_id)
+        halls = self._halls
+        for index in range(start, len(ids)):
+            yield halls[ids[index]]
+
+    # Updates (synchronous: each is applied between two reads, never during one)
+
+    def replace(self, records: Iterable[HallRecord]) -> None:
+        """Swap in a complete catalogue."""
+        halls = {record.id: record for record in records}
+        ids = sorted(halls)
+        ids_by_city: dict[str, list[int]] = {}
+        for hall_id in ids:
+            ids_by_city.setdefault(halls[hall_id].city, []).append(hall_id)
+        self._halls, self._ids, self._ids_by_city = halls, ids, ids_by_city
+        self._changed_version()
+
+    def apply(self, hall_ids: Iterable[int], records: Iterable[HallRecord]) -> None:
+        """Replace the given halls with records (halls without a record were deleted)."""
+        current = {record.id: record for record in records}
+        for hall_id in hall_ids:
+            old = self._halls.pop(hall_id, None)
+            if old is not None:
+                _remove_sorted(self._ids, hall_id)
+                city_ids = self._ids_by_city[old.city]
+                _remove_sorted(city_ids, hall_id)
+                if not city_ids:
+                    del self._ids_by_city[old.city]
+            new = current.get(hall_id)
+            if new is not None:
+                self._halls[hall_id] = new
+                bisect.insort(self._ids, hall_id)
+                bisect.insort(self._ids_by_city.setdefault(new.city, []), hall_id)
+        self._changed_version()
+
+    def _changed_version(self) -> None:
+        self.version += 1
+        snapshot_halls.set(len(self._halls))
+
+    # Refresh loop
+
+    async def start(self, engine: AsyncEngine, db_url: str) -> None:
+        """Listen for changes and load the catalogue in the background; `ready` once loaded."""
+        self._task = asyncio.create_task(self._run(engine, listen_dsn(db_url)))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+            if message.get("reload"):
+                self._reload_requested = True
+            else:
+                self._pending.update(int(hall_id) for hall_id in message["hall_ids"])
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError):
+            logger.warning("Unexpected %s payload, reloading the snapshot: %r", CHANNEL, payload)
+            self._reload_requested = True
+        self._changed.set()
+
+    def _on_terminate(self, _connection) -> None:
+        self._mark_stale()
+        self._changed.set()
+
+    def _mark_stale(self) -> None:
+        if self.ready:
+            self.ready = False
+            logger.warning("Snapshot listener lost: catalogue reads go to the database until it is reloaded")
+
+    async def _run(self, engine: AsyncEngine, dsn: str) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                connection.add_termination_listener(self._on_terminate)
+                await connection.add_listener(CHANNEL, self._on_notify)
+                # Changes may have been missed while not listening
+                self._reload_requested = True
+                self._changed.set()
+                while not connection.is_closed():
+                    await self._changed.wait()
+                    self._changed.clear()
+                    await self._apply_changes(engine)
+                logger.warning("Snapshot listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Snapshot refresh failed: %s", exc)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self._mark_stale()
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+    async def _apply_changes(self, engine: AsyncEngine) -> None:
+        if self._reload_requested:
+            self._reload_requested = False
+            self._pending.clear()
+            self.replace(await load_records(engine))
+            snapshot_refreshes.inc(1.0, "full")
+            if not self.ready:
+                self.ready = self.loaded = True
+                logger.info("Catalogue snapshot loaded: %d halls", len(self))
+        elif self._pending:
+            hall_ids, self._pending = self._pending, set()
+            self.apply(hall_ids, await load_records(engine, hall_ids))
+            snapshot_refreshes.inc(1.0, "incremental")
+
+    # Reporting
+
+    def memory_report(self) -> dict[str, int]:
+        """Approximate bytes held (records, strings, recommendation tuples and indexes)."""
+        seen: set[int] = set()
+
+        def size(obj: object) -> int:
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            return sys.getsizeof(obj)
+
+        total = size(self._halls) + size(self._ids) + size(self._ids_by_city)
+        for city, ids in self._ids_by_city.items():
+            total += size(city) + size(ids)
+        recommendation_count = 0
+        for record in self._halls.values():
+            total += size(record) + sum(size(getattr(record, slot)) for slot in HallRecord.__slots__)
+            for recommendation in record.recommendations:
+                recommendation_count += 1
+                total += size(recommendation) + size(recommendation[0]) + size(recommendation[1])
+        halls = len(self._halls)
+        return {
+            "halls": halls,
+            "recommendations": recommendation_count,
+            "bytes": total,
+            "bytes_per_10k_halls": round(total * 10_000 / halls) if halls else 0,
+        }
+
+
+def _remove_sorted(ids: list[int], hall_id: int) -> None:
+    index = bisect.bisect_left(ids, hall_id)
+    if index < len(ids) and ids[index] == hall_id:
+        del ids[index]
+
+
+catalogue_snapshot = CatalogueSnapshot()
@@ -0,0 +1,92 @@
+"""
+Pre-built statements for the hot read paths (hall by id, hall list, recommendations, sync)
+and the catalogue writers' lock.
+
+Each statement is built once, with bound parameters for every value, and reused:
+a request neither constructs a new select() nor regenerates its cache key (Select
+memoizes it), so SQLAlchemy finds the compiled SQL straight away, and the SQL text is
+identical on every call, so the per-connection prepared-statement cache hits too
+(see DB_STATEMENT_CACHE_SIZE). Pass values as execute() parameters, never inline.
+"""
+from functools import lru_cache
+
+from sqlalchemy import (
+    BigInteger, Date, Integer, Select, bindparam, cast, false, func, literal_column, null, select, true,
+)
+
+from app.db.models import MusicHallModel, MusicHallRecommendationModel, MusicHallTombstoneModel
+
+HALLS = MusicHallModel.__table__
+HALL_COLUMNS = tuple(
+    HALLS.c[name] for name in ("id", "city", "hall_name", "email", "stage", "pipe_height", "stage_type")
+)
+_RECOMMENDATIONS = MusicHallRecommendationModel.__table__
+
+# Parameters: hall_id
+HALL_BY_ID = select(*HALL_COLUMNS).where(HALLS.c.id == bindparam("hall_id"))
+
+# Parameters: hall_id
+RECOMMENDATIONS_BY_HALL = (
+    select(
+        _RECOMMENDATIONS.c.recommendation,
+        cast(_RECOMMENDATIONS.c.update_date, Date).label("update_date"),
+    )
+    .where(_RECOMMENDATIONS.c.hall_id == bindparam("hall_id"))
+    .order_by(_RECOMMENDATIONS.c.update_date.desc())
+)
+
+# List filters by parameter name (the matching MusicHallListQuery field)
+LIST_FILTERS = {
+    "city": HALLS.c.city == bindparam("city"),
+    "stage_type": HALLS.c.stage_type == bindparam("stage_type"),
+    "stage": HALLS.c.stage == bindparam("stage"),
+    "min_pipe_height": HALLS.c.pipe_height >= bindparam("min_pipe_height"),
+    "max_pipe_height": HALLS.c.pipe_height <= bindparam("max_pipe_height"),
+}
+
+
+@lru_cache(maxsize=256)
+def hall_list(columns: tuple[str, ...], filters: tuple[str, ...], keyset: bool, limited: bool) -> Select:
+    """
+    List SELECT for one query shape, ordered by id; built once per shape.
+
+    Parameters: one per name in filters (see LIST_FILTERS), after_id if keyset, limit if limited.
+    Pass columns and filters in a canonical (e.g. sorted) order so equal shapes share a statement.
+    """
+    stmt = select(*(HALLS.c[name] for name in columns)).order_by(HALLS.c.id)
+    if keyset:
+        stmt = stmt.where(HALLS.c.id > bindparam("after_id", type_=Integer))
+    for name in filters:
+        stmt = stmt.where(LIST_FILTERS[name])
+    if limited:
+        stmt = stmt.limit(bindparam("limit", type_=Integer))
+    return stmt
+
+
+_TOMBSTONES = MusicHallTombstoneModel.__table__
+_SINCE_VERSION = bindparam("since", type_=BigInteger)
+_CHANGED_HALLS = (
+    select(HALLS.c.row_version.label("version"), false().label("deleted"), *HALL_COLUMNS, HALLS.c.updated_at)
+    .where(HALLS.c.row_version > _SINCE_VERSION)
+)
+
+# Parameters: since, limit. Halls changed after version `since`, in version order
+HALLS_BY_VERSION = _CHANGED_HALLS.order_by(HALLS.c.row_version).limit(bindparam("limit", type_=Integer))
+
+# Parameters: since, limit. Changed halls and tombstones (deleted, id and version set) after
+# version `since`, in version order; one statement, so both come from one snapshot
+HALL_CHANGES = (
+    _CHANGED_HALLS.union_all(
+        select(
+            _TOMBSTONES.c.row_version, true(), _TOMBSTONES.c.hall_id,
+            *(null() for _ in HALL_COLUMNS[1:]), _TOMBSTONES.c.deleted_at,
+        ).where(_TOMBSTONES.c.row_version > _SINCE_VERSION)
+    )
+    .order_by(literal_column("version"))
+    .limit(bindparam("limit", type_=Integer))
+)
+
+
+# Transaction-level advisory lock serializing catalogue writers, so change-feed event ids and
+# row versions follow commit order (migrations 0003/0004 take it in their triggers too)
+LOCK_CATALOGUE_WRITES = select(func.pg_advisory_xact_lock(func.hashtext("catalogue_events")))
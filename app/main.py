@@ -1,13 +1,25 @@
+import asyncio
 from pathlib import Path
 from contextlib import asynccontextmanager
 
+import asyncpg
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse, FileResponse, JSONResponse
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.routes.health import router as health_router
 from app.routes.neon import router as neon_router
-from app.db.neondb import init_db, close_db
+from app.routes.metrics import router as metrics_router
+from app.core.compression import CompressionMiddleware, static_file_response
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, current_request_stats
+from app.core.responses import TrustedJSONResponse
+from app.db.neondb import init_db, close_db, warm_up_db
+from app.db.routing import LAST_WRITE_HEADER, ReadAfterWriteMiddleware
+from app.db.change_feed import change_feed
+from app.db.snapshot import catalogue_snapshot
+from app.services.neon import cache, hot_read_statements
 from app.core.exceptions import DomainException, handle_domain_exception, handle_db_exception
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -18,10 +30,30 @@ def _response_content(detail: dict | str) -> dict:
     return detail if isinstance(detail, dict) else {"detail": detail}
 
 
+def _record_error_code(detail: dict | str) -> None:
+    """Attach the response error code to the request's stats for the slow-request log."""
+    stats = current_request_stats.get()
+    if stats is not None and isinstance(detail, dict):
+        stats.error_code = detail.get("error_code")
+
+
 @asynccontextmanager
 async def lifespan(fastapi_app: FastAPI):
     await init_db(fastapi_app)
+    await cache.start()
+    # Pools warm in the background: liveness answers at once, readiness once they are warm
+    warmup = asyncio.create_task(warm_up_db(fastapi_app, hot_read_statements()))
+    if settings.SNAPSHOT_MODE_ENABLED:
+        # The snapshot comes from the primary: replicas may not have a notified change yet
+        await catalogue_snapshot.start(fastapi_app.state.async_engine, settings.DB_URL)
+    if settings.CHANGE_FEED_ENABLED:
+        await change_feed.start(fastapi_app.state.async_engine, settings.DB_URL)
     yield
+    await change_feed.close()
+    await catalogue_snapshot.close()
+    warmup.cancel()
+    await asyncio.gather(warmup, return_exceptions=True)
+    await cache.close()
     await close_db(fastapi_app)
 
 
@@ -35,17 +67,36 @@ app = FastAPI(
 
 
 @app.exception_handler(DomainException)
-async def domain_exception_handler(_request: Request, exc: DomainException) -> JSONResponse:
+async def domain_exception_handler(_request: Request, exc: DomainException) -> TrustedJSONResponse:
     http_exc = handle_domain_exception(exc)
-    return JSONResponse(status_code=http_exc.status_code, content=_response_content(http_exc.detail))
+    _record_error_code(http_exc.detail)
+    return TrustedJSONResponse(
+        status_code=http_exc.status_code, content=_response_content(http_exc.detail), headers=http_exc.headers,
+    )
+
+
+@app.exception_handler(SQLAlchemyError)
+@app.exception_handler(asyncpg.PostgresError)
+async def database_exception_handler(_request: Request, exc: Exception) -> TrustedJSONResponse:
+    """
+    Database errors (duplicate -> 409, bad reference -> 400, other -> 500). Registered per type
+    rather than under Exception, so they are handled inside MetricsMiddleware, which then
+    records the mapped status and error code.
+    """
+    http_exc = handle_db_exception(exc)
+    _record_error_code(http_exc.detail)
+    return TrustedJSONResponse(status_code=http_exc.status_code, content=_response_content(http_exc.detail))
 
 
 @app.exception_handler(Exception)
-async def unhandled_exception_handler(_request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(_request: Request, exc: Exception) -> TrustedJSONResponse:
+    """Last resort. Runs outside MetricsMiddleware, which has already recorded the request as a 500."""
     if isinstance(exc, HTTPException):
-        return JSONResponse(status_code=exc.status_code, content=_response_content(exc.detail))
+        return TrustedJSONResponse(
+            status_code=exc.status_code, content=_response_content(exc.detail), headers=exc.headers,
+        )
     http_exc = handle_db_exception(exc)
-    return JSONResponse(status_code=http_exc.status_code, content=_response_content(http_exc.detail))
+    return TrustedJSONResponse(status_code=http_exc.status_code, content=_response_content(http_exc.detail))
 
 
 app.add_middleware(
@@ -54,12 +105,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag", "X-Next-Cursor", "Link", "Server-Timing", "X-Profiled-Status", "Retry-After",
+        LAST_WRITE_HEADER,
+    ],
 )
+if settings.DB_READ_REPLICA_URLS or settings.SNAPSHOT_MODE_ENABLED:
+    app.add_middleware(ReadAfterWriteMiddleware, read_after_write_seconds=settings.DB_READ_AFTER_WRITE_SECONDS)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
 
 app.include_router(health_router)
 app.include_router(neon_router)
+app.include_router(metrics_router)
 
 
 @app.get("/ads.txt", include_in_schema=False)
-async def ads():
-    return FileResponse(BASE_DIR / "static" / "ads.txt")
+async def ads(request: Request):
+    return static_file_response(request, BASE_DIR / "static" / "ads.txt", "text/plain")
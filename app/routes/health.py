@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, status
+
+from app.core.config import settings
+from app.core.responses import TrustedJSONResponse
+from app.db.snapshot import catalogue_snapshot
+from app.services.neon import cache_stats
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -6,4 +11,40 @@ router = APIRouter(prefix="/health", tags=["Health"])
 @router.get("/", summary="Health check")
 async def health_check():
     """Simple liveness check; no DB dependency."""
-    return {"message": "ITS ALIVE!!!"}
\ No newline at end of file
+    return {"message": "ITS ALIVE!!!"}
+
+
+@router.get("/ready", summary="Readiness check")
+async def readiness_check(request: Request):
+    """
+    Ready once this worker's DB pools are warm (DB_POOL_WARM_SIZE) and, in snapshot mode,
+    the catalogue snapshot has first loaded; 503 while warming. A listener outage later
+    does not make the worker unready: its catalogue reads fall back to the database.
+    """
+    warmup = getattr(request.app.state, "pool_warmup", None)
+    snapshot_loading = settings.SNAPSHOT_MODE_ENABLED and not catalogue_snapshot.loaded
+    if warmup is None or not warmup.ready or snapshot_loading:
+        return TrustedJSONResponse(
+            {"status": "warming", "attempts": warmup.attempts if warmup else 0},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return TrustedJSONResponse(
+        {"status": "ready", "warm_connections": warmup.connections, "warmup_seconds": warmup.seconds},
+    )
+
+
+@router.get("/cache", summary="Cache statistics")
+async def cache_statistics():
+    """Hit/miss/eviction counters of the hall caches (this process's view); no DB dependency."""
+    return cache_stats()
+
+
+@router.get("/snapshot", summary="Catalogue snapshot statistics")
+async def snapshot_statistics():
+    """Size and approximate memory of the in-memory catalogue snapshot (snapshot mode); no DB dependency."""
+    return {
+        "enabled": settings.SNAPSHOT_MODE_ENABLED,
+        "ready": catalogue_snapshot.ready,
+        "version": catalogue_snapshot.version,
+        **catalogue_snapshot.memory_report(),
+    }
@@ -1,4 +1,9 @@
-from fastapi import APIRouter, Depends, Path, Body, status
+from collections.abc import AsyncIterator
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Path, Body, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.neon import (
@@ -6,31 +11,200 @@ from app.schemas.neon import (
     UpdateMusicHall,
     MusicHallResponse,
     MusicHallListItem,
+    MusicHallListQuery,
     MusicHallRecommendation,
+    MusicHallUpsert,
+    MusicHallSearchResult,
+    MusicHallSyncPage,
+    BulkResult,
 )
 from app.services.neon import (
     insert_music_hall,
     get_music_hall,
     update_music_hall,
     get_music_hall_list,
+    get_music_hall_list_rendered,
     get_music_hall_recommendations,
     delete_music_hall,
+    insert_music_halls,
+    insert_music_halls_ndjson,
+    upsert_music_halls,
+    delete_music_halls,
+    summarize_bulk_results,
+    LIST_PAGE_SIZE,
 )
+from app.services.search import search_music_halls
+from app.services.changes import open_change_stream, poll_changes
+from app.services.sync import sync_music_halls
 from app.core.auth import verify_api_key
-from app.db.dependencies import get_async_session
+from app.core.config import settings
+from app.core.exceptions import BulkLimitExceededError
+from app.core.http_cache import conditional_response, rendered_response
+from app.core.responses import TrustedJSONResponse
+from app.db.dependencies import get_async_session, get_catalogue_read_session, get_read_session
 
 router = APIRouter(prefix="/db", tags=["Music Hall Management"])
 
 
+def _check_bulk_size(count: int) -> None:
+    if count > settings.BULK_MAX_ITEMS:
+        raise BulkLimitExceededError(settings.BULK_MAX_ITEMS)
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[bytes]:
+    """Yield non-empty lines of the request body as they arrive."""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def _next_page_headers(request: Request, next_cursor: str | None, query: MusicHallListQuery) -> dict | None:
+    """X-Next-Cursor and Link: rel="next" for a list page that has a successor."""
+    if next_cursor is None:
+        return None
+    next_url = request.url.include_query_params(after=next_cursor, limit=query.limit or LIST_PAGE_SIZE)
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{next_url}>; rel="next"'}
+
+
 @router.get(
     "/music-halls",
     response_model=list[MusicHallListItem],
+    response_model_exclude_unset=True,
     summary="List all music halls",
-    description="Retrieve a list of all music halls with their IDs and combined city/hall name",
+    description=(
+        "Retrieve music halls with their IDs and combined city/hall name. "
+        "Supports filters, `fields=` projection and keyset pagination via `limit`/`after`; "
+        "the next page's cursor is returned in the X-Next-Cursor header (and a `Link: rel=\"next\"`)."
+    ),
+)
+async def fetch_music_hall_list(
+    request: Request,
+    query: Annotated[MusicHallListQuery, Query()],
+    session: AsyncSession | None = Depends(get_catalogue_read_session),
+):
+    if settings.LIST_PRERENDER_ENABLED:
+        # Pre-serialized bytes straight from memory: no response_model validation or re-encoding
+        rendered, next_cursor = await get_music_hall_list_rendered(session, query)
+        return rendered_response(request, rendered, _next_page_headers(request, next_cursor, query))
+    hall_list, next_cursor = await get_music_hall_list(session, query)
+    return conditional_response(request, hall_list, _next_page_headers(request, next_cursor, query))
+
+
+@router.get(
+    "/music-halls/search",
+    response_model=list[MusicHallSearchResult],
+    summary="Search music halls",
+    description=(
+        "Type-ahead search over hall names, cities and recommendation text: every word is matched as a "
+        "prefix, with fuzzy (trigram) matching on names and cities. Results are ranked, best first."
+    ),
+)
+async def search_halls(
+    q: str = Query(..., min_length=1, max_length=100, description="Search text"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return TrustedJSONResponse(await search_music_halls(session, q, limit, offset))
+
+
+@router.get(
+    "/music-halls/export",
+    response_class=StreamingResponse,
+    summary="Export the full catalogue",
+    description=(
+        "Stream every music hall with its recommendations as NDJSON (one hall per line) or CSV "
+        "(one row per recommendation), optionally gzip-encoded. Rows are read through a server-side "
+        "cursor, so memory stays flat. Requires API key authentication."
+    ),
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
 )
-async def fetch_music_hall_list(session: AsyncSession = Depends(get_async_session)):
-    hall_list = await get_music_hall_list(session)
-    return hall_list
+async def export_music_halls(
+    request: Request,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Output format"),
+    gzip: bool = Query(False, description="gzip the stream (sent with Content-Encoding: gzip)"),
+    api_key: str = Depends(verify_api_key),
+):
+    # Imported on first use: export is rare and should not add to worker start-up time
+    from app.services.export import export_chunks, iter_catalogue
+
+    # The stream outlives the request handler, so it owns its session instead of using get_async_session
+    session_factory = request.app.state.async_session_factory
+
+    async def body():
+        async with session_factory() as session:
+            async for chunk in export_chunks(iter_catalogue(session), fmt, compress=gzip):
+                yield chunk
+
+    headers = {"Content-Disposition": f'attachment; filename="music-halls.{fmt}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "text/csv"
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
+
+
+@router.get(
+    "/music-halls/sync",
+    response_model=MusicHallSyncPage,
+    summary="Sync changes since a version token",
+    description=(
+        "Delta sync for offline clients: the halls created or updated (full state) and the IDs deleted "
+        "since the `since` token, oldest change first. Without `since`, pages through the whole catalogue. "
+        "Store `next_token` and pass it as `since` next time; while `has_more` is true, sync again at once."
+    ),
+)
+async def sync_halls(
+    since: str | None = Query(None, description="Opaque `next_token` from the previous sync"),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return TrustedJSONResponse(await sync_music_halls(session, since, limit))
+
+
+@router.get(
+    "/music-halls/changes",
+    summary="Poll for catalogue changes",
+    description=(
+        "Long-poll the change feed: returns the hall and recommendation events after event id `after` "
+        "(default: only new events), waiting up to `timeout` seconds for the first one. Pass the returned "
+        "`last_event_id` as the next `after`. 410 when `after` is older than the kept history: reload "
+        "the catalogue and continue from the latest event. Needs CHANGE_FEED_ENABLED."
+    ),
+)
+async def poll_catalogue_changes(
+    after: int | None = Query(None, ge=0, description="Last event id seen"),
+    timeout: float = Query(25.0, ge=0, le=60, description="Seconds to wait for an event"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    return TrustedJSONResponse(await poll_changes(after, timeout, limit))
+
+
+@router.get(
+    "/music-halls/changes/stream",
+    response_class=StreamingResponse,
+    summary="Stream catalogue changes",
+    description=(
+        "Server-sent events (`text/event-stream`) for hall and recommendation changes: `event:` is the "
+        "type (hall.created, hall.updated, hall.deleted, recommendation.created, recommendation.deleted), "
+        "`id:` the event id and `data:` the event as JSON. Reconnecting EventSource clients resume "
+        "from their Last-Event-ID header; `after` does the same for other clients. Needs CHANGE_FEED_ENABLED."
+    ),
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_catalogue_changes(
+    after: int | None = Query(None, ge=0, description="Last event id seen"),
+    last_event_id: int | None = Header(None, alias="Last-Event-ID", ge=0),
+):
+    # On reconnect the header is newer than the `after` still in the URL
+    stream = await open_change_stream(last_event_id if last_event_id is not None else after)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
 
 
 @router.get(
@@ -40,11 +214,12 @@ async def fetch_music_hall_list(session: AsyncSession = Depends(get_async_sessio
     description="Retrieve detailed information about a specific music hall by its ID",
 )
 async def fetch_music_hall(
+    request: Request,
     hall_id: int = Path(..., gt=0, description="Unique identifier of the music hall"),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession | None = Depends(get_catalogue_read_session),
 ):
     hall = await get_music_hall(hall_id, session)
-    return hall
+    return conditional_response(request, hall)
 
 
 @router.post(
@@ -60,7 +235,79 @@ async def create_music_hall(
     session: AsyncSession = Depends(get_async_session),
 ):
     inserted = await insert_music_hall(session, hall)
-    return inserted
+    return TrustedJSONResponse(inserted, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/music-halls/bulk",
+    response_model=BulkResult,
+    summary="Create music halls in bulk",
+    description=(
+        f"Create up to {settings.BULK_MAX_ITEMS} music halls in one transaction. "
+        "Returns per-item results in request order. Requires API key authentication."
+    ),
+)
+async def create_music_halls_bulk(
+    halls: list[MusicHall] = Body(...),
+    api_key: str = Depends(verify_api_key),
+    session: AsyncSession = Depends(get_async_session),
+):
+    _check_bulk_size(len(halls))
+    return TrustedJSONResponse(summarize_bulk_results(await insert_music_halls(session, halls)))
+
+
+@router.post(
+    "/music-halls/bulk/ndjson",
+    response_model=BulkResult,
+    summary="Create music halls from an NDJSON stream",
+    description=(
+        "Stream `application/x-ndjson` with one music hall object per line. Lines are validated and "
+        "inserted in batches as they arrive, in one transaction; invalid lines are reported per item. "
+        "Requires API key authentication."
+    ),
+    openapi_extra={
+        "requestBody": {"required": True, "content": {"application/x-ndjson": {"schema": {"type": "string"}}}},
+    },
+)
+async def create_music_halls_ndjson(
+    request: Request,
+    api_key: str = Depends(verify_api_key),
+    session: AsyncSession = Depends(get_async_session),
+):
+    return TrustedJSONResponse(await insert_music_halls_ndjson(session, _ndjson_lines(request)))
+
+
+@router.put(
+    "/music-halls/bulk",
+    response_model=BulkResult,
+    summary="Upsert music halls in bulk",
+    description=(
+        "Create or replace music halls in one transaction: items with an `id` replace that hall "
+        "(or create it with that id), items without one are created. Requires API key authentication."
+    ),
+)
+async def upsert_music_halls_bulk(
+    halls: list[MusicHallUpsert] = Body(...),
+    api_key: str = Depends(verify_api_key),
+    session: AsyncSession = Depends(get_async_session),
+):
+    _check_bulk_size(len(halls))
+    return TrustedJSONResponse(await upsert_music_halls(session, halls))
+
+
+@router.post(
+    "/music-halls/bulk-delete",
+    response_model=BulkResult,
+    summary="Delete music halls in bulk",
+    description="Delete the music halls with the given IDs in one statement. Requires API key authentication.",
+)
+async def delete_music_halls_bulk(
+    hall_ids: list[Annotated[int, Field(gt=0)]] = Body(..., description="IDs of the halls to delete"),
+    api_key: str = Depends(verify_api_key),
+    session: AsyncSession = Depends(get_async_session),
+):
+    _check_bulk_size(len(hall_ids))
+    return TrustedJSONResponse(await delete_music_halls(session, hall_ids))
 
 
 @router.put(
@@ -76,7 +323,7 @@ async def update_hall(
     session: AsyncSession = Depends(get_async_session),
 ):
     updates = hall_data.model_dump(exclude_unset=True)
-    return await update_music_hall(hall_id, updates, session)
+    return TrustedJSONResponse(await update_music_hall(hall_id, updates, session))
 
 
 @router.delete(
@@ -100,8 +347,9 @@ async def delete_hall(
     description="Retrieve all recommendations for a specific music hall, ordered by most recent first",
 )
 async def fetch_music_hall_recommendations(
+    request: Request,
     hall_id: int = Path(..., gt=0, description="Unique identifier of the music hall"),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession | None = Depends(get_catalogue_read_session),
 ):
     recommendations = await get_music_hall_recommendations(hall_id, session)
-    return recommendations
+    return conditional_response(request, recommendations)
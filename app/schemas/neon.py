@@ -1,5 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
@@ -68,16 +69,79 @@ class MusicHallResponse(MusicHall):
     )
 
 
+class MusicHallSearchResult(MusicHallResponse):
+    """Search hit: the hall plus its relevance score (higher is better)"""
+    rank: float = Field(..., description="Relevance score")
+
+
+class MusicHallSyncItem(MusicHallResponse):
+    """Changed (or created) hall in a sync page"""
+    updated_at: datetime = Field(..., description="When the hall last changed")
+
+
+class MusicHallSyncPage(BaseModel):
+    """Changes since a sync token: apply `changed` and `deleted`, then sync again from `next_token`"""
+    changed: list[MusicHallSyncItem] = Field(..., description="Halls created or updated, full current state")
+    deleted: list[int] = Field(..., description="IDs of deleted halls (may include halls the client never had)")
+    next_token: str = Field(..., description="Opaque token to pass as `since` next time")
+    has_more: bool = Field(..., description="More changes are waiting: sync again right away")
+
+
+class MusicHallUpsert(MusicHall):
+    """Bulk upsert item: with an id the existing hall is replaced (or created with that id), without one it is inserted."""
+    id: int | None = Field(None, gt=0, description="Existing hall ID to replace")
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request; `error` uses the standard error body format."""
+    index: int = Field(..., description="Position of the item in the request")
+    status: int = Field(..., description="HTTP-style status of this item (201 created, 200 updated, 204 deleted, 4xx failed)")
+    hall_id: int | None = None
+    hall: MusicHallResponse | None = None
+    error: dict[str, Any] | None = None
+
+
+class BulkResult(BaseModel):
+    """Per-item results of a bulk request, in request order"""
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
+
+
 class MusicHallListItem(BaseModel):
-    """Simplified music hall item for list endpoints"""
+    """
+    Music hall item for list endpoints.
+    By default only id and city_and_hall_name are returned; `fields=` projects other columns.
+    """
     id: int = Field(..., description="Unique identifier for the music hall")
-    city_and_hall_name: str = Field(..., description="Combined city and hall name")
+    city_and_hall_name: str | None = Field(None, description="Combined city and hall name")
+    city: str | None = None
+    hall_name: str | None = None
+    email: str | None = None
+    stage: bool | None = None
+    pipe_height: int | None = None
+    stage_type: StageType | None = None
 
     model_config = ConfigDict(
         from_attributes=True
     )
 
 
+class MusicHallListQuery(BaseModel):
+    """Query parameters for the hall list: keyset pagination, filters and field projection."""
+    limit: int | None = Field(None, ge=1, le=500, description="Page size; omit (with no `after`) to list every hall")
+    after: str | None = Field(None, description="Opaque cursor from the previous page's X-Next-Cursor header")
+    city: str | None = Field(None, max_length=100, description="Only halls in this city (exact match)")
+    stage_type: StageType | None = Field(None, description="Only halls with this stage type")
+    stage: bool | None = Field(None, description="Only halls with (or without) a stage")
+    min_pipe_height: int | None = Field(None, ge=0, le=100)
+    max_pipe_height: int | None = Field(None, ge=0, le=100)
+    fields: str | None = Field(
+        None,
+        description="Comma-separated fields to return, e.g. `id,city,hall_name,email,stage,pipe_height,stage_type`",
+    )
+
+
 class MusicHallRecommendation(BaseModel):
     """Recommendation for a music hall"""
     update_date: date = Field(..., description="Date when the recommendation was last updated")
@@ -0,0 +1,74 @@
+"""
+Production launcher: `python -m app.server`.
+
+Runs uvicorn with WEB_CONCURRENCY worker processes (one event loop per core), using
+uvloop and httptools when installed (uvicorn[standard]). On SIGTERM each worker stops
+accepting connections, waits up to GRACEFUL_SHUTDOWN_SECONDS for in-flight requests,
+then runs the lifespan shutdown, which disposes its pools via close_db().
+
+DB_POOL_SIZE/DB_MAX_OVERFLOW are server-wide totals; init_db() gives each worker its share.
+The launcher logs the resulting connection count (and warns when it exceeds the budget).
+
+The memory cache backend is private to each worker and a write invalidates it only in
+the worker that served it, so with several workers the launcher turns it off (use
+CACHE_BACKEND=redis to cache across workers).
+"""
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.logger import setup_logger
+from app.db.neondb import listener_connections, pool_limits_per_worker
+
+logger = setup_logger(__name__)
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def _log_connection_budget() -> None:
+    workers = settings.WEB_CONCURRENCY
+    budget = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    pool_size, max_overflow = pool_limits_per_worker(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, workers)
+    pooled = (pool_size + max_overflow) * workers
+    if pooled > budget:
+        logger.warning(
+            "%d workers need one DB connection each: up to %d per engine, over DB_POOL_SIZE + "
+            "DB_MAX_OVERFLOW = %d; lower WEB_CONCURRENCY or raise the budget", workers, pooled, budget,
+        )
+    listeners = listener_connections() * workers
+    logger.info(
+        "DB connections: up to %d pooled per engine (%d per worker) plus %d LISTEN to the direct host",
+        pooled, pool_size + max_overflow, listeners,
+    )
+
+
+def _disable_per_process_cache() -> None:
+    """Workers read their settings from the environment: turn CACHE_ENABLED off for them."""
+    if settings.WEB_CONCURRENCY > 1 and settings.CACHE_ENABLED and settings.CACHE_BACKEND == "memory":
+        logger.warning(
+            "CACHE_BACKEND=memory cannot be invalidated across %d workers: cache disabled; "
+            "use CACHE_BACKEND=redis to cache with several workers", settings.WEB_CONCURRENCY,
+        )
+        os.environ["CACHE_ENABLED"] = "false"
+
+
+def main() -> None:
+    _log_connection_budget()
+    _disable_per_process_cache()
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WEB_CONCURRENCY,
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Change feed responses: long-poll pages and a server-sent event stream over the worker's
+ChangeFeed. Neither holds a session while waiting; only resumes from events that have left
+the in-memory buffer read the database.
+"""
+from collections.abc import AsyncIterator
+from contextlib import contextmanager
+
+from app.core.config import settings
+from app.core.exceptions import ChangeFeedUnavailableError
+from app.core.metrics import change_feed_subscribers
+from app.db.change_feed import ChangeEvent, ChangeFeed, change_feed
+
+# Events per long-poll response or per SSE write
+CHANGES_PAGE_SIZE = 100
+# Seconds between keep-alive comments on an idle stream (proxies drop silent connections)
+SSE_HEARTBEAT_SECONDS = 15.0
+# Reconnect delay suggested to EventSource clients
+SSE_RETRY_MS = 3000
+
+
+def available_change_feed() -> ChangeFeed:
+    if not settings.CHANGE_FEED_ENABLED or not change_feed.ready:
+        raise ChangeFeedUnavailableError(enabled=settings.CHANGE_FEED_ENABLED)
+    return change_feed
+
+
+@contextmanager
+def _subscribed():
+    change_feed_subscribers.inc()
+    try:
+        yield
+    finally:
+        change_feed_subscribers.dec()
+
+
+async def poll_changes(after: int | None, timeout: float, limit: int = CHANGES_PAGE_SIZE) -> dict:
+    """
+    Events after `after` (default: the latest event), waiting up to timeout seconds for one.
+    `last_event_id` is the cursor for the next poll.
+    """
+    feed = available_change_feed()
+    after_id = feed.last_id if after is None else after
+    with _subscribed():
+        events = await feed.wait_for_events(after_id, timeout, limit)
+    return {
+        "events": [event.payload for event in events],
+        "last_event_id": events[-1].id if events else after_id,
+    }
+
+
+def sse_frame(event: ChangeEvent) -> bytes:
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (event.id, event.type.encode(), event.encoded)
+
+
+async def open_change_stream(after: int | None) -> AsyncIterator[bytes]:
+    """
+    The event stream after `after` (default: the latest event). Checked and primed before the
+    response starts, so an unavailable feed or an expired resume point is a normal error response.
+    """
+    feed = available_change_feed()
+    after_id = feed.last_id if after is None else after
+    backlog = await feed.events_after(after_id, CHANGES_PAGE_SIZE)
+    return _change_stream(feed, after_id, backlog)
+
+
+async def _change_stream(feed: ChangeFeed, after_id: int, backlog: list[ChangeEvent]) -> AsyncIterator[bytes]:
+    # The generator is closed when the client disconnects (or the server shuts down)
+    with _subscribed():
+        yield b"retry: %d\n\n" % SSE_RETRY_MS
+        events = backlog
+        while True:
+            if events:
+                yield b"".join(sse_frame(event) for event in events)
+                after_id = events[-1].id
+            else:
+                yield b": keep-alive\n\n"
+            events = await feed.wait_for_events(after_id, SSE_HEARTBEAT_SECONDS, CHANGES_PAGE_SIZE)
@@ -0,0 +1,101 @@
+"""
+Full-catalogue export: halls with their recommendations, streamed from a server-side
+cursor and encoded incrementally as NDJSON or CSV, so memory stays flat regardless of size.
+"""
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator, Iterable
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import MusicHallModel, MusicHallRecommendationModel
+
+# Rows fetched per server-side cursor round trip
+EXPORT_FETCH_SIZE = 1000
+# Encoded bytes buffered before a chunk is sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+CSV_COLUMNS = (
+    "id", "city", "hall_name", "email", "stage", "pipe_height", "stage_type",
+    "recommendation", "update_date",
+)
+
+
+async def iter_catalogue(session: AsyncSession) -> AsyncIterator[dict]:
+    """
+    Yield every hall (to_dict shape) with a `recommendations` list (newest first), ordered by id.
+
+    One LEFT JOIN query streamed with yield_per; consecutive rows of the same hall are grouped.
+    """
+    stmt = (
+        select(MusicHallModel, MusicHallRecommendationModel)
+        .outerjoin(MusicHallModel.recommendations)
+        .order_by(MusicHallModel.id, MusicHallRecommendationModel.update_date.desc())
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+    result = await session.stream(stmt)
+    current: dict | None = None
+    async for hall, recommendation in result.tuples():
+        if current is None or current["id"] != hall.id:
+            if current is not None:
+                yield current
+            current = {**hall.to_dict(), "recommendations": []}
+        if recommendation is not None:
+            current["recommendations"].append(recommendation.to_dict())
+    if current is not None:
+        yield current
+
+
+def encode_ndjson(hall: dict) -> bytes:
+    """One hall per line."""
+    return orjson.dumps(hall) + b"\n"
+
+
+def encode_csv_header() -> bytes:
+    return ",".join(CSV_COLUMNS).encode() + b"\r\n"
+
+
+def encode_csv(hall: dict) -> bytes:
+    """One row per recommendation (a single row with empty recommendation columns if none)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    base = [hall[c] for c in CSV_COLUMNS[:7]]
+    for recommendation in hall["recommendations"] or [{"recommendation": "", "update_date": ""}]:
+        writer.writerow([*base, recommendation["recommendation"], recommendation["update_date"]])
+    return buffer.getvalue().encode()
+
+
+async def export_chunks(
+    halls: AsyncIterator[dict],
+    fmt: str,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Encode halls as `fmt` ("ndjson" or "csv"), optionally gzip them, and yield ~EXPORT_CHUNK_BYTES chunks.
+    The first hall is sent as soon as it is read so clients get the first byte immediately.
+    """
+    encode = encode_ndjson if fmt == "ndjson" else encode_csv
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def pack(parts: Iterable[bytes]) -> bytes:
+        data = b"".join(parts)
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+
+    pending: list[bytes] = [encode_csv_header()] if fmt == "csv" else []
+    pending_size = 0
+    first = True
+    async for hall in halls:
+        line = encode(hall)
+        pending.append(line)
+        pending_size += len(line)
+        if first or pending_size >= EXPORT_CHUNK_BYTES:
+            yield pack(pending)
+            pending, pending_size, first = [], 0, False
+    tail = pack(pending) if pending else b""
+    if compressor:
+        tail += compressor.flush()
+    if tail:
+        yield tail
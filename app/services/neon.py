@@ -1,65 +1,364 @@
 """
 Music hall domain services using SQLAlchemy async session (Neon PostgreSQL).
+
+Hall detail, hall list and recommendation reads go through the configured cache
+backend (CACHE_BACKEND). Concurrent identical reads are coalesced into one in-flight
+query, so a burst for one venue (or a popular key expiring) costs one query and one
+pooled connection. Writes invalidate the affected entries once their transaction commits.
 """
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from typing import Any
+
+import orjson
+from pydantic import ValidationError
+
+from sqlalchemy import Select, cast, delete, func, insert, literal_column, select, update
+from sqlalchemy.dialects.postgresql import REGCLASS, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache, create_cache_backend
+from app.core.config import settings
+from app.core.http_cache import RenderedPayload
+from app.core.metrics import read_coalesced_waiters, reads_in_flight, registry
 from app.core.exceptions import (
+    DomainException,
     MusicHallNotFoundError,
     MusicHallListEmptyError,
     NoFieldsToUpdateError,
     InvalidUpdateFieldsError,
+    InvalidListFieldsError,
+    InvalidBulkItemError,
+    BulkLimitExceededError,
 )
-from app.db.models import MusicHallModel, MusicHallRecommendationModel
-from app.schemas.neon import MusicHall
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.singleflight import SingleFlight
+from app.db import statements
+from app.db.events import run_after_commit
+from app.db.routing import REPLICA_SESSION_INFO
+from app.db.snapshot import catalogue_snapshot
+from app.schemas.neon import MusicHall, MusicHallListQuery, MusicHallUpsert
 
 # Allowed columns for updates (whitelist to prevent SQL injection)
 ALLOWED_UPDATE_COLUMNS = {
     "city", "hall_name", "email", "stage", "pipe_height", "stage_type"
 }
 
+# Writes use Core statements on the table: one round trip each, no identity-map overhead.
+# Hot reads use the pre-built statements of app/db/statements.py.
+_HALLS = statements.HALLS
+_HALL_COLUMNS = statements.HALL_COLUMNS
+
+# Fields a list request may project with `fields=`; city_and_hall_name is derived
+LIST_FIELDS = ALLOWED_UPDATE_COLUMNS | {"id", "city_and_hall_name"}
+DEFAULT_LIST_FIELDS = ("id", "city_and_hall_name")
+# Page size when a cursor is given without an explicit limit
+LIST_PAGE_SIZE = 100
+
+# Session.info key: the transaction that holds the catalogue writers' lock
+_WRITE_LOCK_INFO = "catalogue_write_lock"
+
+# Cache namespaces: hall detail and recommendations keyed by hall id, list by the list query
+HALL_CACHE = "hall"
+HALL_LIST_CACHE = "hall_list"
+RECOMMENDATIONS_CACHE = "recommendations"
+CACHE_NAMESPACES = (HALL_CACHE, HALL_LIST_CACHE, RECOMMENDATIONS_CACHE)
+
+cache = create_cache_backend(settings)
+# Pre-rendered list pages (LIST_PRERENDER_ENABLED): list cache key -> (cached page, rendering).
+# A rendering is reused while the list cache returns the very same page object, so it is
+# rebuilt only when a write (or the cache TTL) replaces the page.
+rendered_list_cache = TTLCache(maxsize=settings.CACHE_MAX_SIZE, ttl_seconds=settings.CACHE_TTL_SECONDS)
+# Snapshot mode (SNAPSHOT_MODE_ENABLED): list cache key -> (snapshot version, page)
+snapshot_list_pages = TTLCache(maxsize=settings.CACHE_MAX_SIZE, ttl_seconds=settings.CACHE_TTL_SECONDS)
+read_flights = SingleFlight(on_join=lambda key: read_coalesced_waiters.inc(1.0, key[0]))
+registry.add_collector("read_flights", lambda: reads_in_flight.set(len(read_flights)))
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss/eviction counters for the service caches."""
+    return cache.snapshot()
+
+
+def clear_caches() -> None:
+    """Drop every cached entry (tests, benchmarks)."""
+    for namespace in CACHE_NAMESPACES:
+        cache.clear(namespace)
+    rendered_list_cache.clear()
+    snapshot_list_pages.clear()
+
+
+async def _read_through(
+    namespace: str, key: str, load: Callable[[], Awaitable[Any]], session: AsyncSession | None = None,
+) -> Any:
+    """
+    Cached value for key, loading it (through session) on a miss.
+
+    Concurrent loads of the same key share one query (the others never touch their
+    session, so they hold no connection and no admission slot). The cache token is part of the flight key, so
+    a read that starts after a write's invalidation never joins a load that started
+    before it; this holds with the cache disabled too, since writes still invalidate.
+
+    A value read from a replica within DB_READ_AFTER_WRITE_SECONDS of an invalidation may
+    predate the write (replication lag): it is returned but not cached, so it cannot be
+    served to later readers, including those routed to the primary.
+    """
+    if settings.CACHE_ENABLED:
+        cached = await cache.get(namespace, key)
+        if cached is not None:
+            return cached
+    token = cache.token(namespace)
+
+    async def load_and_store() -> Any:
+        value = await load()
+        if settings.CACHE_ENABLED and not (
+            _reads_replica(session)
+            and cache.invalidated_within(namespace, settings.DB_READ_AFTER_WRITE_SECONDS)
+        ):
+            await cache.set(namespace, key, value, token)
+        return value
+
+    if not settings.READ_COALESCING_ENABLED:
+        return await load_and_store()
+    return await read_flights.do((namespace, key, token), load_and_store)
+
+
+def _reads_replica(session: AsyncSession | None) -> bool:
+    return session is not None and session.info.get(REPLICA_SESSION_INFO, False)
+
+
+async def _lock_catalogue_writes(session: AsyncSession) -> None:
+    """
+    Take the catalogue writers' advisory lock, once per transaction, before the first
+    statement touches a row. The triggers of migrations 0003/0004 take it as well, but
+    only once the statement holds its row locks: a writer holding the lock that then
+    waited for one of those rows would deadlock with the writer holding it.
+    """
+    transaction = session.sync_session.get_transaction()
+    if transaction is not None and session.info.get(_WRITE_LOCK_INFO) is transaction:
+        return
+    await session.execute(statements.LOCK_CATALOGUE_WRITES)
+    session.info[_WRITE_LOCK_INFO] = session.sync_session.get_transaction()
+
+
+def _column_values(values: dict[str, object]) -> dict[str, object]:
+    """Column values for a Core INSERT/UPDATE; enums are stored by value."""
+    return {key: getattr(value, "value", value) for key, value in values.items()}
+
+
+def _invalidate_hall_after_commit(session: AsyncSession, hall_id: int | None, deleted: bool = False) -> None:
+    """Drop the hall's detail entry (if any) and every cached list once the write commits."""
+    _invalidate_halls_after_commit(session, () if hall_id is None else (hall_id,), deleted)
+
+
+def _invalidate_halls_after_commit(session: AsyncSession, hall_ids: Iterable[int], deleted: bool = False) -> None:
+    """
+    Drop the given halls' detail entries (and recommendations, when deleted) and every
+    cached list once the write commits.
+    """
+    keys = [str(hall_id) for hall_id in hall_ids]
+
+    def invalidate() -> None:
+        cache.invalidate(HALL_CACHE, keys)
+        if deleted:
+            cache.invalidate(RECOMMENDATIONS_CACHE, keys)
+        cache.clear(HALL_LIST_CACHE)
+
+    run_after_commit(session, invalidate)
 
-async def get_music_hall_list(session: AsyncSession) -> list[dict]:
+
+def _list_columns(fields: str | None) -> tuple[str, ...]:
     """
-    Retrieve a list of all music halls (id and city_and_hall_name).
+    Parse the comma-separated `fields=` projection (id is always included).
 
     Raises:
-        MusicHallListEmptyError: If no music halls are found in the database.
+        InvalidListFieldsError: If any requested field is not projectable.
     """
-    result = await session.execute(
-        select(MusicHallModel.id, MusicHallModel.city, MusicHallModel.hall_name)
+    if not fields:
+        return DEFAULT_LIST_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    invalid = set(requested) - LIST_FIELDS
+    if invalid:
+        raise InvalidListFieldsError(invalid)
+    return ("id", *dict.fromkeys(f for f in requested if f != "id"))
+
+
+async def get_music_hall_list(
+    session: AsyncSession | None,
+    query: MusicHallListQuery | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    Retrieve music halls ordered by id, optionally filtered, projected and paginated.
+
+    Without `limit`/`after` every matching hall is returned. Otherwise at most `limit`
+    halls (default LIST_PAGE_SIZE) after the cursor are returned, fetched by keyset on id.
+    Without a session (get_catalogue_read_session, snapshot mode) the page comes from the
+    catalogue snapshot in memory.
+
+    Returns:
+        (items, next_cursor); next_cursor is None on the last page.
+
+    Raises:
+        MusicHallListEmptyError: If the unfiltered catalogue is empty.
+        InvalidListFieldsError: If `fields` names an unknown field.
+        InvalidCursorError: If `after` is not a cursor issued by this API.
+    """
+    _, page = await _music_hall_list_page(session, query)
+    hall_list, next_cursor = page
+    return hall_list, next_cursor
+
+
+async def get_music_hall_list_rendered(
+    session: AsyncSession | None,
+    query: MusicHallListQuery | None = None,
+) -> tuple[RenderedPayload, str | None]:
+    """
+    Same page as get_music_hall_list, as pre-serialized JSON bytes (with ETag and gzip
+    variant). Rendered once per cached page, then served from memory until a write.
+
+    Raises:
+        Same as get_music_hall_list.
+    """
+    cache_key, page = await _music_hall_list_page(session, query)
+    hall_list, next_cursor = page
+    entry = rendered_list_cache.get(cache_key)
+    if entry is not None and entry[0] is page:
+        return entry[1], next_cursor
+    rendered = RenderedPayload.render(hall_list, extra_validator=next_cursor)
+    rendered_list_cache.set(cache_key, (page, rendered))
+    return rendered, next_cursor
+
+
+async def _music_hall_list_page(session: AsyncSession | None, query: MusicHallListQuery | None) -> tuple[str, Any]:
+    """(list cache key, cached (items, next_cursor) page) for a list query."""
+    query = query or MusicHallListQuery()
+    columns = _list_columns(query.fields)
+    cache_key = orjson.dumps([*query.model_dump(exclude={"fields"}).values(), columns]).decode()
+    if session is None:
+        return cache_key, _snapshot_list_page(query, columns, cache_key)
+    page = await _read_through(
+        HALL_LIST_CACHE, cache_key, lambda: _load_music_hall_list(session, query, columns), session,
     )
-    rows = result.all()
-    if not rows:
+    return cache_key, page
+
+
+def _list_statement(query: MusicHallListQuery, columns: tuple[str, ...]) -> tuple[Select, dict[str, Any]]:
+    """Pre-built SELECT for a list query's shape, and its parameters (filters, keyset page plus one row)."""
+    select_columns = {"id"} | {c for c in columns if c != "city_and_hall_name"}
+    if "city_and_hall_name" in columns:
+        select_columns |= {"city", "hall_name"}
+    params: dict[str, Any] = {
+        name: getattr(query, name) for name in statements.LIST_FILTERS if getattr(query, name) is not None
+    }
+    if query.stage_type is not None:
+        params["stage_type"] = query.stage_type.value
+    if query.after is not None:
+        params["after_id"] = decode_cursor(query.after)
+    limited = query.limit is not None or query.after is not None
+    if limited:
+        # One extra row tells us whether another page exists
+        params["limit"] = (query.limit or LIST_PAGE_SIZE) + 1
+    stmt = statements.hall_list(
+        tuple(sorted(select_columns)),
+        tuple(name for name in statements.LIST_FILTERS if name in params),
+        query.after is not None,
+        limited,
+    )
+    return stmt, params
+
+
+async def _load_music_hall_list(
+    session: AsyncSession,
+    query: MusicHallListQuery,
+    columns: tuple[str, ...],
+) -> tuple[list[dict], str | None]:
+    stmt, params = _list_statement(query, columns)
+    result = await session.execute(stmt, params)
+    return _list_page(result.mappings().all(), query, columns)
+
+
+def _snapshot_list_page(query: MusicHallListQuery, columns: tuple[str, ...], cache_key: str) -> Any:
+    """The list page from the catalogue snapshot, reused until the snapshot changes."""
+    entry = snapshot_list_pages.get(cache_key)
+    if entry is not None and entry[0] == catalogue_snapshot.version:
+        return entry[1]
+    limited = query.limit is not None or query.after is not None
+    limit = (query.limit or LIST_PAGE_SIZE) + 1
+    stage_type = query.stage_type.value if query.stage_type is not None else None
+    after_id = decode_cursor(query.after) if query.after is not None else None
+    rows = []
+    for hall in catalogue_snapshot.iter_halls(query.city, after_id):
+        if (
+            (stage_type is not None and hall.stage_type != stage_type)
+            or (query.stage is not None and hall.stage != query.stage)
+            or (query.min_pipe_height is not None and hall.pipe_height < query.min_pipe_height)
+            or (query.max_pipe_height is not None and hall.pipe_height > query.max_pipe_height)
+        ):
+            continue
+        rows.append(hall)
+        if limited and len(rows) == limit:
+            break
+    page = _list_page(rows, query, columns)
+    snapshot_list_pages.set(cache_key, (catalogue_snapshot.version, page))
+    return page
+
+
+def _list_page(
+    rows: Sequence[Any],
+    query: MusicHallListQuery,
+    columns: tuple[str, ...],
+) -> tuple[list[dict], str | None]:
+    """
+    (items, next_cursor) from the fetched rows (result mappings or snapshot records),
+    which include one look-ahead row when paginated.
+    """
+    paginated = query.limit is not None or query.after is not None
+    limit = query.limit or LIST_PAGE_SIZE
+    is_filtered = any(
+        v is not None for k, v in query.model_dump().items() if k not in ("limit", "fields")
+    )
+    if not rows and not is_filtered:
         raise MusicHallListEmptyError()
-    return [
+
+    next_cursor = None
+    if paginated and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["id"])
+    hall_list = [
         {
-            "id": r.id,
-            "city_and_hall_name": f"{r.city}, {r.hall_name}",
+            c: f"{r['city']}, {r['hall_name']}" if c == "city_and_hall_name" else r[c]
+            for c in columns
         }
         for r in rows
     ]
+    return hall_list, next_cursor
 
 
-async def get_music_hall(hall_id: int, session: AsyncSession) -> dict:
+async def get_music_hall(hall_id: int, session: AsyncSession | None) -> dict:
     """
-    Retrieve a music hall by its ID.
+    Retrieve a music hall by its ID; from the catalogue snapshot when session is None.
 
     Raises:
         MusicHallNotFoundError: If the music hall with the given ID does not exist.
     """
-    result = await session.execute(
-        select(MusicHallModel).where(MusicHallModel.id == hall_id)
-    )
-    hall = result.scalar_one_or_none()
-    if hall is None:
-        raise MusicHallNotFoundError(hall_id)
-    return hall.to_dict()
+    if session is None:
+        hall = catalogue_snapshot.get(hall_id)
+        if hall is None:
+            raise MusicHallNotFoundError(hall_id)
+        return hall.to_dict()
+
+    async def load() -> dict:
+        result = await session.execute(statements.HALL_BY_ID, {"hall_id": hall_id})
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise MusicHallNotFoundError(hall_id)
+        return dict(row)
+
+    return await _read_through(HALL_CACHE, str(hall_id), load, session)
 
 
 async def insert_music_hall(session: AsyncSession, hall: MusicHall) -> dict:
     """
-    Insert a new music hall.
+    Insert a new music hall with a single INSERT ... RETURNING (no ORM unit of work).
 
     Args:
         session: Async SQLAlchemy session.
@@ -68,18 +367,15 @@ async def insert_music_hall(session: AsyncSession, hall: MusicHall) -> dict:
     Returns:
         Inserted row as dict with id, city, hall_name, email, stage, pipe_height, stage_type.
     """
-    stage_type_val = hall.stage_type.value if hasattr(hall.stage_type, "value") else hall.stage_type
-    model = MusicHallModel(
-        city=hall.city,
-        hall_name=hall.hall_name,
-        email=hall.email,
-        stage=hall.stage,
-        pipe_height=hall.pipe_height,
-        stage_type=stage_type_val,
+    await _lock_catalogue_writes(session)
+    result = await session.execute(
+        insert(_HALLS)
+        .values(_column_values(hall.model_dump()))
+        .returning(*_HALL_COLUMNS)
     )
-    session.add(model)
-    await session.flush()
-    return model.to_dict()
+    inserted = dict(result.mappings().one())
+    _invalidate_hall_after_commit(session, None)
+    return inserted
 
 
 async def update_music_hall(
@@ -88,7 +384,7 @@ async def update_music_hall(
     session: AsyncSession,
 ) -> dict:
     """
-    Update an existing music hall.
+    Update an existing music hall with a single UPDATE ... RETURNING.
 
     Raises:
         NoFieldsToUpdateError: If updates is empty.
@@ -102,50 +398,214 @@ async def update_music_hall(
     if invalid_columns:
         raise InvalidUpdateFieldsError(invalid_columns)
 
+    await _lock_catalogue_writes(session)
     result = await session.execute(
-        select(MusicHallModel).where(MusicHallModel.id == hall_id)
+        update(_HALLS)
+        .where(_HALLS.c.id == hall_id)
+        .values(_column_values(updates))
+        .returning(*_HALL_COLUMNS)
     )
-    hall = result.scalar_one_or_none()
-    if hall is None:
+    row = result.mappings().one_or_none()
+    if row is None:
         raise MusicHallNotFoundError(hall_id)
-
-    for key, value in updates.items():
-        if hasattr(value, "value"):  # enum
-            setattr(hall, key, value.value)
-        else:
-            setattr(hall, key, value)
-    await session.flush()
-    return hall.to_dict()
+    _invalidate_hall_after_commit(session, hall_id)
+    return dict(row)
 
 
 async def get_music_hall_recommendations(
     hall_id: int,
-    session: AsyncSession,
+    session: AsyncSession | None,
 ) -> list[dict]:
     """
-    Retrieve recommendations for a music hall, newest first.
+    Retrieve recommendations for a music hall, newest first; from the catalogue snapshot
+    when session is None.
     """
-    result = await session.execute(
-        select(MusicHallRecommendationModel)
-        .where(MusicHallRecommendationModel.hall_id == hall_id)
-        .order_by(MusicHallRecommendationModel.update_date.desc())
-    )
-    recommendations = result.scalars().all()
-    return [r.to_dict() for r in recommendations]
+    if session is None:
+        hall = catalogue_snapshot.get(hall_id)
+        return hall.recommendation_dicts() if hall is not None else []
+
+    async def load() -> list[dict]:
+        result = await session.execute(statements.RECOMMENDATIONS_BY_HALL, {"hall_id": hall_id})
+        return [dict(row) for row in result.mappings()]
+
+    return await _read_through(RECOMMENDATIONS_CACHE, str(hall_id), load, session)
+
+
+def hot_read_statements() -> list[tuple[Select, dict[str, Any]]]:
+    """
+    The statements behind the hot GET routes (detail, recommendations, first and next
+    list page) with parameters that match few or no rows. Run on every warmed
+    connection at startup so they are compiled and prepared before the first request.
+    """
+    return [
+        (statements.HALL_BY_ID, {"hall_id": 0}),
+        (statements.RECOMMENDATIONS_BY_HALL, {"hall_id": 0}),
+        _list_statement(MusicHallListQuery(limit=1), DEFAULT_LIST_FIELDS),
+        _list_statement(MusicHallListQuery(limit=1, after=encode_cursor(0)), DEFAULT_LIST_FIELDS),
+    ]
 
 
 async def delete_music_hall(hall_id: int, session: AsyncSession) -> None:
     """
-    Delete a music hall by ID.
+    Delete a music hall by ID with a single DELETE ... RETURNING id.
+    Recommendations are removed by the foreign key's ON DELETE CASCADE.
 
     Raises:
         MusicHallNotFoundError: If the music hall does not exist.
     """
+    await _lock_catalogue_writes(session)
     result = await session.execute(
-        select(MusicHallModel).where(MusicHallModel.id == hall_id)
+        delete(_HALLS).where(_HALLS.c.id == hall_id).returning(_HALLS.c.id)
     )
-    hall = result.scalar_one_or_none()
-    if hall is None:
+    if result.scalar_one_or_none() is None:
         raise MusicHallNotFoundError(hall_id)
-    await session.delete(hall)
-    await session.flush()
+    _invalidate_hall_after_commit(session, hall_id, deleted=True)
+
+
+def summarize_bulk_results(results: list[dict]) -> dict:
+    """Wrap per-item results with success/failure counts."""
+    failed = sum(1 for r in results if r["error"] is not None)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+def _item_result(index: int, status: int, hall: dict | None = None, hall_id: int | None = None) -> dict:
+    return {
+        "index": index,
+        "status": status,
+        "hall_id": hall["id"] if hall is not None else hall_id,
+        "hall": hall,
+        "error": None,
+    }
+
+
+def _item_error(index: int, exc: DomainException, hall_id: int | None = None) -> dict:
+    """Per-item failure in the same body format the exception handlers return."""
+    return {"index": index, "status": exc.status_code, "hall_id": hall_id, "hall": None, "error": exc.to_http().detail}
+
+
+async def insert_music_halls(session: AsyncSession, halls: list[MusicHall]) -> list[dict]:
+    """
+    Insert many music halls in one multi-row INSERT ... RETURNING (batched by the driver).
+
+    Returns:
+        Per-item results in input order.
+    """
+    if not halls:
+        return []
+    await _lock_catalogue_writes(session)
+    result = await session.execute(
+        insert(_HALLS).returning(*_HALL_COLUMNS, sort_by_parameter_order=True),
+        [_column_values(hall.model_dump(exclude={"id"})) for hall in halls],
+    )
+    inserted = [dict(row) for row in result.mappings()]
+    _invalidate_halls_after_commit(session, ())
+    return [_item_result(i, 201, hall) for i, hall in enumerate(inserted)]
+
+
+async def upsert_music_halls(session: AsyncSession, halls: list[MusicHallUpsert]) -> dict:
+    """
+    Create or replace many music halls in one transaction.
+
+    Items with an id go through INSERT ... ON CONFLICT (id) DO UPDATE (one statement per
+    BULK_BATCH_SIZE items); items without one are inserted. Repeating an id within one
+    request is reported as an item error, since Postgres cannot upsert the same row twice
+    in a statement.
+    """
+    results: list[dict | None] = [None] * len(halls)
+    by_id: dict[int, tuple[int, MusicHallUpsert]] = {}
+    new_halls: list[tuple[int, MusicHall]] = []
+    for index, hall in enumerate(halls):
+        if hall.id is None:
+            new_halls.append((index, hall))
+        elif hall.id in by_id:
+            results[index] = _item_error(index, InvalidBulkItemError(f"Duplicate id {hall.id} in request"), hall.id)
+        else:
+            by_id[hall.id] = (index, hall)
+
+    items = list(by_id.values())
+    if items:
+        await _lock_catalogue_writes(session)
+    created_with_id = False
+    for start in range(0, len(items), settings.BULK_BATCH_SIZE):
+        batch = items[start:start + settings.BULK_BATCH_SIZE]
+        stmt = pg_insert(_HALLS).values([_column_values(hall.model_dump()) for _, hall in batch])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[_HALLS.c.id],
+            set_={name: stmt.excluded[name] for name in ALLOWED_UPDATE_COLUMNS},
+        ).returning(*_HALL_COLUMNS, literal_column("xmax = 0").label("inserted"))
+        result = await session.execute(stmt)
+        for row in result.mappings():
+            hall = {column.name: row[column.name] for column in _HALL_COLUMNS}
+            index = by_id[hall["id"]][0]
+            created_with_id |= row["inserted"]
+            results[index] = _item_result(index, 201 if row["inserted"] else 200, hall)
+    if created_with_id:
+        # Explicit ids bypass the serial sequence; move it past them so later inserts don't collide
+        sequence = cast(func.pg_get_serial_sequence(_HALLS.name, "id"), REGCLASS)
+        await session.execute(select(func.setval(sequence, func.greatest(
+            select(func.max(_HALLS.c.id)).scalar_subquery(),
+            func.coalesce(func.pg_sequence_last_value(sequence), 1),
+        ))))
+
+    new_results = await insert_music_halls(session, [hall for _, hall in new_halls])
+    for (index, _), item in zip(new_halls, new_results):
+        results[index] = {**item, "index": index}
+    _invalidate_halls_after_commit(session, by_id)
+    return summarize_bulk_results(results)
+
+
+async def insert_music_halls_ndjson(session: AsyncSession, lines: AsyncIterator[bytes]) -> dict:
+    """
+    Insert music halls read from an NDJSON stream (one MusicHall object per line).
+
+    Lines are validated as they arrive and inserted every BULK_BATCH_SIZE valid items, so
+    memory stays bounded by the batch. Invalid lines become per-item errors; everything
+    runs in the caller's transaction.
+
+    Raises:
+        BulkLimitExceededError: If the stream has more than BULK_MAX_ITEMS lines.
+    """
+    results: list[dict] = []
+    batch: list[tuple[int, MusicHall]] = []
+
+    async def flush() -> None:
+        inserted = await insert_music_halls(session, [hall for _, hall in batch])
+        for (index, _), item in zip(batch, inserted):
+            results.append({**item, "index": index})
+        batch.clear()
+
+    index = 0
+    async for line in lines:
+        if index >= settings.BULK_MAX_ITEMS:
+            raise BulkLimitExceededError(settings.BULK_MAX_ITEMS)
+        try:
+            batch.append((index, MusicHall.model_validate_json(line)))
+        except ValidationError as e:
+            results.append(_item_error(index, InvalidBulkItemError(e.errors(include_url=False, include_context=False))))
+        if len(batch) >= settings.BULK_BATCH_SIZE:
+            await flush()
+        index += 1
+    await flush()
+    results.sort(key=lambda r: r["index"])
+    return summarize_bulk_results(results)
+
+
+async def delete_music_halls(session: AsyncSession, hall_ids: list[int]) -> dict:
+    """
+    Delete many music halls with a single DELETE ... WHERE id = ANY(...) RETURNING id.
+    Ids that did not exist are reported per item as MusicHallNotFoundError.
+    """
+    deleted: set[int] = set()
+    if hall_ids:
+        await _lock_catalogue_writes(session)
+        result = await session.execute(
+            delete(_HALLS).where(_HALLS.c.id.in_(set(hall_ids))).returning(_HALLS.c.id)
+        )
+        deleted = set(result.scalars())
+    _invalidate_halls_after_commit(session, deleted, deleted=True)
+    return summarize_bulk_results([
+        _item_result(index, 204, hall_id=hall_id)
+        if hall_id in deleted
+        else _item_error(index, MusicHallNotFoundError(hall_id), hall_id)
+        for index, hall_id in enumerate(hall_ids)
+    ])
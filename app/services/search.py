@@ -0,0 +1,57 @@
+"""
+Ranked hall search: prefix full-text match on hall name/city (tsvector + GIN), fuzzy
+word-similarity match (pg_trgm) and full-text match on recommendation text.
+Requires migrations/0001_hall_search.sql.
+"""
+import re
+
+from sqlalchemy import func, literal, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import MusicHallModel, MusicHallRecommendationModel
+
+_WORD = re.compile(r"\w+")
+
+
+def prefix_tsquery(text: str) -> str | None:
+    """
+    Build a to_tsquery() string matching every word of text as a prefix ("bar tel" -> "bar:* & tel:*").
+    Only word characters survive, so user input cannot inject tsquery operators.
+    """
+    words = _WORD.findall(text.lower())
+    return " & ".join(f"{word}:*" for word in words) if words else None
+
+
+async def search_music_halls(session: AsyncSession, text: str, limit: int, offset: int = 0) -> list[dict]:
+    """
+    Return halls (to_dict shape plus `rank`) matching text, best first.
+
+    Each match condition is a separate indexed lookup; their ids are unioned before the
+    halls are ranked, so every branch can use its own GIN index.
+    """
+    tsquery_text = prefix_tsquery(text)
+    if tsquery_text is None:
+        return []
+    tsquery = func.to_tsquery("simple", tsquery_text)
+    term = literal(text)
+    hall = MusicHallModel
+    recommendation = MusicHallRecommendationModel
+
+    candidate_ids = union(
+        select(hall.id).where(hall.search_vector.op("@@")(tsquery)),
+        select(hall.id).where(term.op("<%")(hall.hall_name)),
+        select(hall.id).where(term.op("<%")(hall.city)),
+        select(recommendation.hall_id).where(recommendation.search_vector.op("@@")(tsquery)),
+    ).subquery()
+    rank = (
+        func.ts_rank(hall.search_vector, tsquery)
+        + func.greatest(func.word_similarity(term, hall.hall_name), func.word_similarity(term, hall.city))
+    ).label("rank")
+    result = await session.execute(
+        select(hall.id, hall.city, hall.hall_name, hall.email, hall.stage, hall.pipe_height, hall.stage_type, rank)
+        .join(candidate_ids, candidate_ids.c.id == hall.id)
+        .order_by(rank.desc(), hall.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return [dict(row) for row in result.mappings()]
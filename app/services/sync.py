@@ -0,0 +1,47 @@
+"""
+Delta sync: the halls changed or deleted since a client's version token, in version order.
+
+Every hall carries a row_version from one sequence, re-assigned on each change, and each
+delete leaves a tombstone with a version from the same sequence (migrations/0004_delta_sync.sql).
+Versions follow commit order, so "everything above my token" never misses a write that
+committed late, and a page is an index range scan on the versions: its cost follows the
+number of changes, not the catalogue size.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_sync_token, encode_sync_token
+from app.db.statements import HALL_CHANGES, HALLS_BY_VERSION
+
+SYNC_PAGE_SIZE = 500
+
+_HALL_FIELDS = ("id", "city", "hall_name", "email", "stage", "pipe_height", "stage_type", "updated_at")
+
+
+async def sync_music_halls(session: AsyncSession, since: str | None, limit: int = SYNC_PAGE_SIZE) -> dict:
+    """
+    Up to limit changes after the version in `since` (MusicHallSyncPage shape). Without a
+    token the whole catalogue is paged through; tombstones are skipped, as there is nothing
+    to delete yet.
+
+    Raises:
+        InvalidSyncTokenError: If `since` is not a token issued by this API.
+    """
+    version = 0 if since is None else decode_sync_token(since)
+    stmt = HALLS_BY_VERSION if since is None else HALL_CHANGES
+    rows = (await session.execute(stmt, {"since": version, "limit": limit + 1})).mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changed, deleted = [], []
+    for row in rows:
+        if row["deleted"]:
+            deleted.append(row["id"])
+        else:
+            changed.append({name: row[name] for name in _HALL_FIELDS})
+    if rows:
+        version = rows[-1]["version"]
+    return {
+        "changed": changed,
+        "deleted": deleted,
+        "next_token": encode_sync_token(version),
+        "has_more": has_more,
+    }
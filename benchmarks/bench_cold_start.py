@@ -0,0 +1,120 @@
+"""
+Cold start: time from launching `python -m app.server` to its first successful
+database-backed response, for each DB_POOL_WARM_SIZE given.
+
+Each run starts a fresh server process on a free port and, like a load balancer,
+polls /health/ (live) and /health/ready (ready) before sending the first request to
+--path. Reported per warm size (ms, over --runs runs):
+
+- live:         process start -> /health/ answers
+- ready:        process start -> /health/ready answers 200 (pools warm)
+- first_db:     process start -> first successful --path response
+- first_db_request: latency of that first --path request alone
+
+Warming moves the connection set-up out of first_db_request and into ready.
+
+Usage (DB_URL and SECRET_KEY set, catalogue seeded with benchmarks/seed.py):
+    PYTHONPATH=. python benchmarks/bench_cold_start.py --warm-sizes 0,2 --runs 5
+"""
+import argparse
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+
+from benchmarks.stats import git_revision, summarize
+
+POLL_INTERVAL_SECONDS = 0.01
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(client: httpx.Client, path: str, deadline: float) -> None:
+    """Poll path until it answers 200 or the deadline passes."""
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(path).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass  # not accepting connections yet
+        time.sleep(POLL_INTERVAL_SECONDS)
+    raise TimeoutError(f"{path} not ready in time")
+
+
+def cold_start(warm_size: int, path: str, timeout: float) -> dict[str, float]:
+    """One server launch; seconds from process start to each milestone."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": "1",
+        "DB_POOL_WARM_SIZE": str(warm_size),
+    }
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=timeout) as client:
+            _wait_for(client, "/health/", deadline)
+            live = time.perf_counter()
+            _wait_for(client, "/health/ready", deadline)
+            ready = time.perf_counter()
+            response = client.get(path)
+            first_db = time.perf_counter()
+            response.raise_for_status()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return {
+        "live": live - started,
+        "ready": ready - started,
+        "first_db": first_db - started,
+        "first_db_request": first_db - ready,
+    }
+
+
+def run(warm_sizes: list[int], runs: int, path: str, timeout: float) -> dict:
+    results = {}
+    for warm_size in warm_sizes:
+        samples = [cold_start(warm_size, path, timeout) for _ in range(runs)]
+        results[f"warm_size_{warm_size}"] = {
+            metric: summarize([sample[metric] for sample in samples]) for metric in samples[0]
+        }
+    return {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "path": path,
+            "runs": runs,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--warm-sizes", default="0,2", help="comma-separated DB_POOL_WARM_SIZE values")
+    parser.add_argument("--runs", type=int, default=5, help="server launches per warm size")
+    parser.add_argument("--path", default="/db/music-halls/1", help="DB-backed route for the first request")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds a launch may take")
+    args = parser.parse_args()
+    warm_sizes = [int(size) for size in args.warm_sizes.split(",")]
+    print(orjson.dumps(run(warm_sizes, args.runs, args.path, args.timeout), option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
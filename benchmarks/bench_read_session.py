@@ -0,0 +1,67 @@
+"""
+Per-request latency of a hall detail read through each session dependency:
+
+- transactional (get_async_session): BEGIN / SELECT / COMMIT
+- autocommit    (get_read_session):  SELECT
+
+Runs against DB_URL from the environment/.env; the difference is mostly network RTT to Neon.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_read_session.py --hall-id 1 --iterations 200
+"""
+import argparse
+import asyncio
+import time
+
+import orjson
+from fastapi import FastAPI
+from sqlalchemy import select
+
+from app.db.models import MusicHallModel
+from app.db.neondb import close_db, init_db
+from benchmarks.stats import summarize
+
+
+async def run(hall_id: int, iterations: int, warmup: int) -> dict:
+    app = FastAPI()
+    await init_db(app)
+    stmt = select(MusicHallModel).where(MusicHallModel.id == hall_id)
+
+    async def transactional() -> None:
+        async with app.state.async_session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def autocommit() -> None:
+        async with app.state.async_read_session_factory() as session:
+            await session.execute(stmt)
+
+    results = {}
+    try:
+        for name, read in (("transactional", transactional), ("autocommit", autocommit)):
+            for _ in range(warmup):
+                await read()
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                await read()
+                samples.append(time.perf_counter() - started)
+            results[name] = summarize(samples)
+    finally:
+        await close_db(app)
+    results["p50_saving_ms"] = round(results["transactional"]["p50_ms"] - results["autocommit"]["p50_ms"], 3)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hall-id", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.hall_id, args.iterations, args.warmup))
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-response CPU cost of serializing read payloads, no database needed:
+
+- validated: what FastAPI does for a returned dict with a response_model
+  (validate into the model, including EmailStr, then dump to JSON)
+- trusted:   orjson.dumps of the row dicts (TrustedJSONResponse)
+
+Payloads: hall detail (1 hall), recommendations (20) and a 1000-hall list page.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_serialization.py --iterations 2000
+"""
+import argparse
+import time
+from datetime import date
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.schemas.neon import MusicHallListItem, MusicHallRecommendation, MusicHallResponse
+
+
+def _hall(hall_id: int) -> dict:
+    return {
+        "id": hall_id,
+        "city": "Tel Aviv",
+        "hall_name": f"Barby {hall_id}",
+        "email": f"bookings{hall_id}@example.com",
+        "stage": True,
+        "pipe_height": 7,
+        "stage_type": "raised",
+    }
+
+
+PAYLOADS = {
+    "detail": (MusicHallResponse, _hall(1)),
+    "recommendations": (
+        list[MusicHallRecommendation],
+        [{"recommendation": f"great sound, friendly crew {n}", "update_date": date(2024, 1, n % 28 + 1)}
+         for n in range(20)],
+    ),
+    "list_1000": (
+        list[MusicHallListItem],
+        [{"id": n, "city_and_hall_name": f"Tel Aviv, Barby {n}"} for n in range(1000)],
+    ),
+}
+
+
+def cpu_per_call_us(fn, iterations: int) -> float:
+    """Mean process CPU time per call, in microseconds."""
+    for _ in range(min(iterations, 100)):
+        fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return round((time.process_time() - started) / iterations * 1e6, 2)
+
+
+def run(iterations: int) -> dict:
+    results = {}
+    for name, (model, payload) in PAYLOADS.items():
+        adapter = TypeAdapter(model)
+
+        def validated():
+            return adapter.dump_json(adapter.validate_python(payload), exclude_unset=True)
+
+        def trusted():
+            return orjson.dumps(payload)
+
+        before = cpu_per_call_us(validated, iterations)
+        after = cpu_per_call_us(trusted, iterations)
+        results[name] = {
+            "validated_us": before,
+            "trusted_us": after,
+            "speedup": round(before / after, 1) if after else None,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    print(orjson.dumps(run(args.iterations), option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
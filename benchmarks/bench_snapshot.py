@@ -0,0 +1,105 @@
+"""
+Catalogue snapshot mode (SNAPSHOT_MODE_ENABLED), no database needed: memory per 10k
+halls and read latency of the service calls answered from the snapshot.
+
+A synthetic catalogue (same generator as seed.py) is loaded into the app's snapshot;
+memory is reported both by the snapshot's own estimate (memory_report) and by
+tracemalloc. Reads: hall detail, recommendations and a 100-hall list page, each with
+a random id/cursor.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_snapshot.py --halls 10000,100000 --requests 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+import orjson
+
+from app.core.pagination import encode_cursor
+from app.db.snapshot import HallRecord, catalogue_snapshot
+from app.schemas.neon import MusicHallListQuery
+from app.services.neon import (
+    clear_caches,
+    get_music_hall,
+    get_music_hall_list,
+    get_music_hall_recommendations,
+)
+from benchmarks.seed import HALL_COLUMNS, generate_halls, generate_recommendations
+from benchmarks.stats import summarize
+
+
+def build_records(halls: int, max_recommendations: int, rng: random.Random) -> list[HallRecord]:
+    recommendations: dict[int, list] = {}
+    for hall_id, text, updated in generate_recommendations(halls, max_recommendations, rng):
+        recommendations.setdefault(hall_id, []).append((text, updated.date()))
+    records = []
+    for row in generate_halls(halls, rng):
+        hall = dict(zip(HALL_COLUMNS, row))
+        newest_first = sorted(recommendations.pop(hall["id"], []), key=lambda r: r[1], reverse=True)
+        records.append(HallRecord(hall, tuple(newest_first)))
+    return records
+
+
+async def _latencies(call, requests: int) -> dict[str, float]:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+async def run_size(halls: int, max_recommendations: int, requests: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    clear_caches()
+    # Traced from before the records exist; generator temporaries are freed by the end
+    tracemalloc.start()
+    records = build_records(halls, max_recommendations, rng)
+    catalogue_snapshot.replace(records)
+    del records  # the snapshot holds the only references now
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    catalogue_snapshot.ready = True
+
+    def random_id() -> int:
+        return rng.randint(1, halls)
+
+    report = catalogue_snapshot.memory_report()
+    results = {
+        "memory": {**report, "tracemalloc_bytes_per_10k_halls": round(traced * 10_000 / halls)},
+        "detail": await _latencies(lambda: get_music_hall(random_id(), None), requests),
+        "recommendations": await _latencies(lambda: get_music_hall_recommendations(random_id(), None), requests),
+        "list_page_100": await _latencies(
+            lambda: get_music_hall_list(None, MusicHallListQuery(limit=100, after=encode_cursor(random_id()))),
+            requests,
+        ),
+    }
+    catalogue_snapshot.ready = False
+    catalogue_snapshot.replace([])
+    return results
+
+
+async def run(sizes: list[int], max_recommendations: int, requests: int, seed: int) -> dict:
+    return {
+        f"halls_{halls}": await run_size(halls, max_recommendations, requests, seed)
+        for halls in sizes
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--halls", default="10000", help="comma-separated catalogue sizes")
+    parser.add_argument("--max-recommendations", type=int, default=5, help="per hall (match seed.py)")
+    parser.add_argument("--requests", type=int, default=5000, help="reads per call type")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.halls.split(",")]
+    results = asyncio.run(run(sizes, args.max_recommendations, args.requests, args.seed))
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare two benchmarks/load.py result files and fail on regressions.
+
+A route regresses when its latency percentile grows, or its throughput drops, by more
+than --threshold (relative) compared with the baseline. Exits 1 if any route regressed,
+so CI can run it after load.py.
+
+Usage:
+    python benchmarks/compare.py baseline.json current.json --threshold 0.15 --metric p95_ms
+"""
+import argparse
+import sys
+
+import orjson
+
+LATENCY_METRICS = ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+
+
+def compare(baseline: dict, current: dict, metric: str, threshold: float) -> list[dict]:
+    """One row per route present in both files, flagged `regressed` past the threshold."""
+    rows = []
+    for route, base in baseline["routes"].items():
+        cur = current["routes"].get(route)
+        if cur is None:
+            continue
+        latency_change = (cur[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+        throughput_change = (
+            (cur["throughput_rps"] - base["throughput_rps"]) / base["throughput_rps"]
+            if base["throughput_rps"] else 0.0
+        )
+        rows.append({
+            "route": route,
+            "baseline": base[metric],
+            "current": cur[metric],
+            "latency_change": latency_change,
+            "throughput_change": throughput_change,
+            "new_errors": cur["errors"] > base["errors"],
+            "regressed": (
+                latency_change > threshold or throughput_change < -threshold or cur["errors"] > base["errors"]
+            ),
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--metric", choices=LATENCY_METRICS, default="p95_ms")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative change (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline, "rb") as f:
+        baseline = orjson.loads(f.read())
+    with open(args.current, "rb") as f:
+        current = orjson.loads(f.read())
+
+    rows = compare(baseline, current, args.metric, args.threshold)
+    print(f"{'route':<18} {args.metric:>10} {'was':>10} {'latency':>9} {'rps':>9}")
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['route']:<18} {row['current']:>10.2f} {row['baseline']:>10.2f} "
+            f"{row['latency_change']:>+8.1%} {row['throughput_change']:>+8.1%}{flag}"
+        )
+    if any(row["regressed"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Throughput and p50/p95/p99 latency per route of app/routes/neon.py.
+
+Two modes:
+- in-process (default): the app is driven through httpx.ASGITransport, so the numbers
+  cover the app and the database only, without a server or the network;
+- --url http://host:port: real HTTP against a running server (uvicorn, Docker, ...).
+
+Each route gets --requests requests from --concurrency concurrent workers, after a
+short warm-up. Export and write routes only run with --api-key (use a seeded,
+disposable DB); deletes are left out so repeated runs see the same catalogue.
+Results are printed and, with --output, written as JSON for benchmarks/compare.py.
+
+Usage:
+    PYTHONPATH=. python benchmarks/load.py --halls 10000 --concurrency 16 --output results.json
+    PYTHONPATH=. python benchmarks/load.py --url http://localhost:10000 --routes detail,search
+"""
+import argparse
+import asyncio
+import platform
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import httpx
+import orjson
+
+from benchmarks.seed import CITIES, NAME_WORDS, REVIEW_WORDS
+from benchmarks.stats import git_revision, summarize
+
+# A request factory returns (method, url, json body or None)
+RequestSpec = tuple[str, str, Any]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[random.Random, int], RequestSpec]
+    needs_api_key: bool = False
+    # Left out unless named in --routes (export reads the whole catalogue per request)
+    default: bool = True
+
+
+def _new_hall(rng: random.Random) -> dict:
+    n = rng.randint(1, 10**9)
+    return {
+        "city": rng.choice(CITIES),
+        "hall_name": f"Bench {rng.choice(NAME_WORDS)} {n}",
+        "email": f"bench{n}@example.com",
+        "stage": True,
+        "pipe_height": rng.randint(0, 30),
+        "stage_type": "open",
+    }
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("list", lambda rng, halls: ("GET", "/db/music-halls?limit=100", None)),
+        Scenario("list_filtered", lambda rng, halls: (
+            "GET", f"/db/music-halls?limit=100&city={rng.choice(CITIES)}&fields=id,city,hall_name", None,
+        )),
+        Scenario("detail", lambda rng, halls: ("GET", f"/db/music-halls/{rng.randint(1, halls)}", None)),
+        Scenario("recommendations", lambda rng, halls: (
+            "GET", f"/db/music-halls/{rng.randint(1, halls)}/recommendations", None,
+        )),
+        Scenario("search", lambda rng, halls: (
+            "GET", f"/db/music-halls/search?q={rng.choice(NAME_WORDS + REVIEW_WORDS)[:4]}", None,
+        )),
+        Scenario("export", lambda rng, halls: (
+            "GET", "/db/music-halls/export?gzip=true", None,
+        ), needs_api_key=True, default=False),
+        Scenario("create", lambda rng, halls: ("POST", "/db/music-halls", _new_hall(rng)), needs_api_key=True),
+        Scenario("update", lambda rng, halls: (
+            "PUT", f"/db/music-halls/{rng.randint(1, halls)}", {"pipe_height": rng.randint(0, 30)},
+        ), needs_api_key=True),
+        Scenario("bulk_create", lambda rng, halls: (
+            "POST", "/db/music-halls/bulk", [_new_hall(rng) for _ in range(100)],
+        ), needs_api_key=True),
+    )
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    halls: int,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    rng: random.Random,
+) -> dict:
+    """Issue `requests` requests from `concurrency` workers; return latency/throughput summary."""
+    for _ in range(warmup):
+        method, url, body = scenario.build(rng, halls)
+        await client.request(method, url, json=body)
+
+    specs = [scenario.build(rng, halls) for _ in range(requests)]
+    samples: list[float] = []
+    statuses: dict[str, int] = {}
+    next_index = 0
+
+    async def worker() -> None:
+        nonlocal next_index
+        while next_index < len(specs):
+            method, url, body = specs[next_index]
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            samples.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "status_codes": statuses,
+        "throughput_rps": round(len(samples) / elapsed, 1),
+        **summarize(samples),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if args.routes:
+        routes = args.routes.split(",")
+    else:
+        routes = [
+            name for name, scenario in SCENARIOS.items()
+            if scenario.default and (args.api_key or not scenario.needs_api_key)
+        ]
+    unknown = [name for name in routes if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown routes: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    if not args.api_key and any(SCENARIOS[name].needs_api_key for name in routes):
+        raise SystemExit("export and write routes need --api-key")
+
+    headers = {"X-API-Key": args.api_key} if args.api_key else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    app = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=30)
+    else:
+        from app.db.neondb import init_db
+        from app.main import app
+
+        await init_db(app)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=30)
+
+    rng = random.Random(args.seed)
+    results = {}
+    try:
+        async with client:
+            for name in routes:
+                results[name] = await run_scenario(
+                    client, SCENARIOS[name], args.halls, args.requests, args.concurrency, args.warmup, rng,
+                )
+    finally:
+        if app is not None:
+            from app.db.neondb import close_db
+
+            await close_db(app)
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mode": "http" if args.url else "in-process",
+            "url": args.url,
+            "halls": args.halls,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "routes": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server; default drives the app in-process")
+    parser.add_argument("--routes", help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--halls", type=int, default=10_000, help="ids 1..N are requested (match seed.py --halls)")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--api-key", help="X-API-Key; enables the export and write routes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    payload = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(payload)
+    print(payload.decode())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Seed DB_URL with a synthetic, reproducible catalogue for load tests.
+
+Creates the schema (including the search extension/indexes) if missing, then bulk-loads
+halls and recommendations with COPY. The same --seed always produces the same data.
+Point DB_URL at a disposable database (see docker-compose.bench.yml), never at Neon prod.
+
+Usage:
+    PYTHONPATH=. python benchmarks/seed.py --halls 100000 --max-recommendations 5 --reset
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import orjson
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.db.models import Base
+from app.db.neondb import close_db, init_db
+from app.schemas.neon import StageType
+
+CITIES = (
+    "Tel Aviv", "Jerusalem", "Haifa", "Beer Sheva", "Eilat", "Netanya", "Ashdod", "Herzliya",
+    "Rishon LeZion", "Petah Tikva", "Holon", "Ramat Gan", "Rehovot", "Nazareth", "Tiberias", "Akko",
+)
+NAME_WORDS = (
+    "Barby", "Zappa", "Reading", "Ozen", "Levontin", "Gagarin", "Shablul", "Yellow", "Submarine",
+    "Harbour", "Opera", "Cultural", "Center", "Hall", "Club", "Stage", "Garden", "Theatre",
+)
+REVIEW_WORDS = (
+    "great", "sound", "load-in", "parking", "crew", "friendly", "tight", "backstage", "power",
+    "monitors", "rigging", "elevator", "stairs", "loud", "quiet", "early", "curfew", "catering",
+)
+BATCH_SIZE = 10_000
+HALL_COLUMNS = ["id", "city", "hall_name", "email", "stage", "pipe_height", "stage_type"]
+RECOMMENDATION_COLUMNS = ["hall_id", "recommendation", "update_date"]
+
+
+def generate_halls(count: int, rng: random.Random):
+    stage_types = [stage_type.value for stage_type in StageType]
+    for hall_id in range(1, count + 1):
+        name = f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {hall_id}"
+        yield (
+            hall_id,
+            rng.choice(CITIES),
+            name,
+            f"bookings{hall_id}@example.com",
+            rng.random() < 0.8,
+            rng.randint(0, 30),
+            rng.choice(stage_types),
+        )
+
+
+def generate_recommendations(hall_count: int, max_per_hall: int, rng: random.Random):
+    epoch = datetime(2020, 1, 1)
+    for hall_id in range(1, hall_count + 1):
+        for n in range(rng.randint(0, max_per_hall)):
+            words = " ".join(rng.choices(REVIEW_WORDS, k=rng.randint(4, 12)))
+            yield hall_id, f"{words} ({n})", epoch + timedelta(minutes=rng.randint(0, 3_000_000))
+
+
+async def copy_batches(driver_conn, table: str, columns: list[str], rows) -> int:
+    total = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            await driver_conn.copy_records_to_table(table, records=batch, columns=columns)
+            total += len(batch)
+            batch.clear()
+    if batch:
+        await driver_conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    return total
+
+
+async def seed(halls: int, max_recommendations: int, seed_value: int, reset: bool) -> dict:
+    app = FastAPI()
+    await init_db(app)
+    rng = random.Random(seed_value)
+    started = time.perf_counter()
+    try:
+        async with app.state.async_engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.run_sync(Base.metadata.create_all)
+            if reset:
+                await conn.execute(text("TRUNCATE music_halls RESTART IDENTITY CASCADE"))
+            raw = await conn.get_raw_connection()
+            driver_conn = raw.driver_connection
+            hall_rows = await copy_batches(driver_conn, "music_halls", HALL_COLUMNS, generate_halls(halls, rng))
+            recommendation_rows = await copy_batches(
+                driver_conn, "music_hall_recommendations", RECOMMENDATION_COLUMNS,
+                generate_recommendations(halls, max_recommendations, rng),
+            )
+            # Ids were supplied explicitly, so move the sequence past them for later inserts
+            await conn.execute(text(
+                "SELECT setval(pg_get_serial_sequence('music_halls', 'id'), "
+                "(SELECT coalesce(max(id), 1) FROM music_halls))"
+            ))
+        async with app.state.async_engine.connect() as conn:
+            await conn.execute(text("ANALYZE music_halls"))
+            await conn.execute(text("ANALYZE music_hall_recommendations"))
+            await conn.commit()
+    finally:
+        await close_db(app)
+    return {
+        "halls": hall_rows,
+        "recommendations": recommendation_rows,
+        "seed": seed_value,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--halls", type=int, default=10_000)
+    parser.add_argument("--max-recommendations", type=int, default=5, help="per hall (uniform 0..N)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="truncate both tables first")
+    args = parser.parse_args()
+    result = asyncio.run(seed(args.halls, args.max_recommendations, args.seed, args.reset))
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+
+
+if __name__ == "__main__":
+    main()
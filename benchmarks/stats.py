@@ -0,0 +1,26 @@
+"""Shared helpers for the benchmark scripts."""
+import statistics
+import subprocess
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Latency percentiles in milliseconds."""
+    if len(samples) < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    q = statistics.quantiles(samples, n=100)
+    return {
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(q[49] * 1000, 3),
+        "p95_ms": round(q[94] * 1000, 3),
+        "p99_ms": round(q[98] * 1000, 3),
+    }
+
+
+def git_revision() -> str | None:
+    """Current commit hash, so result files can be matched to the code they measured."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,24 @@
+-- Full-text and fuzzy search over halls and recommendations (GET /db/music-halls/search).
+-- Idempotent; apply with: psql "$DB_URL" -f migrations/0001_hall_search.sql
+-- The 'simple' configuration (no stemming/stop words) works for Hebrew as well as transliterations.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE music_halls ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(hall_name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(city, '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_music_halls_search_vector
+    ON music_halls USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS ix_music_halls_hall_name_trgm
+    ON music_halls USING gin (hall_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_music_halls_city_trgm
+    ON music_halls USING gin (city gin_trgm_ops);
+
+ALTER TABLE music_hall_recommendations ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('simple', coalesce(recommendation, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_music_hall_recommendations_search_vector
+    ON music_hall_recommendations USING gin (search_vector);
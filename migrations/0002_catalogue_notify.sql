@@ -0,0 +1,86 @@
+-- Change notifications for the in-memory catalogue snapshot (SNAPSHOT_MODE_ENABLED).
+-- Idempotent; apply with: psql "$DB_URL" -f migrations/0002_catalogue_notify.sql
+--
+-- Every INSERT/UPDATE/DELETE statement on music_halls or music_hall_recommendations sends
+-- one NOTIFY on channel 'catalogue_changes' (delivered at commit) with the affected hall ids:
+--   {"hall_ids": [1, 2, 3]}
+-- Statements touching more than 500 halls (and TRUNCATE) send {"reload": true} instead, keeping the
+-- payload under the 8000-byte NOTIFY limit; listeners then reload everything.
+-- Statement-level triggers with transition tables: one notification per statement, so
+-- bulk writes do not flood listeners.
+
+CREATE OR REPLACE FUNCTION notify_catalogue_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    -- Hall id column of the triggering table: 'id' (music_halls) or 'hall_id' (recommendations)
+    id_column text := TG_ARGV[0];
+    hall_ids int[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM new_rows', id_column) INTO hall_ids;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM old_rows', id_column) INTO hall_ids;
+    ELSE
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT hall_id) FROM ('
+            'SELECT %1$I AS hall_id FROM new_rows UNION SELECT %1$I FROM old_rows) AS changed',
+            id_column
+        ) INTO hall_ids;
+    END IF;
+
+    IF hall_ids IS NULL THEN
+        RETURN NULL;
+    ELSIF cardinality(hall_ids) > 500 THEN
+        PERFORM pg_notify('catalogue_changes', '{"reload": true}');
+    ELSE
+        PERFORM pg_notify('catalogue_changes', json_build_object('hall_ids', hall_ids)::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS music_halls_notify_insert ON music_halls;
+CREATE TRIGGER music_halls_notify_insert AFTER INSERT ON music_halls
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('id');
+
+DROP TRIGGER IF EXISTS music_halls_notify_update ON music_halls;
+CREATE TRIGGER music_halls_notify_update AFTER UPDATE ON music_halls
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('id');
+
+DROP TRIGGER IF EXISTS music_halls_notify_delete ON music_halls;
+CREATE TRIGGER music_halls_notify_delete AFTER DELETE ON music_halls
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('id');
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_notify_insert ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_notify_insert AFTER INSERT ON music_hall_recommendations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('hall_id');
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_notify_update ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_notify_update AFTER UPDATE ON music_hall_recommendations
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('hall_id');
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_notify_delete ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_notify_delete AFTER DELETE ON music_hall_recommendations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_change('hall_id');
+
+CREATE OR REPLACE FUNCTION notify_catalogue_reload() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_notify('catalogue_changes', '{"reload": true}');
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS music_halls_notify_truncate ON music_halls;
+CREATE TRIGGER music_halls_notify_truncate AFTER TRUNCATE ON music_halls
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_reload();
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_notify_truncate ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_notify_truncate AFTER TRUNCATE ON music_hall_recommendations
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalogue_reload();
@@ -0,0 +1,101 @@
+-- Event log for the change feed (CHANGE_FEED_ENABLED: GET /db/music-halls/changes[/stream]).
+-- Idempotent; apply with: psql "$DB_URL" -f migrations/0003_change_feed.sql
+--
+-- Every INSERT/UPDATE/DELETE statement on music_halls or music_hall_recommendations appends
+-- one catalogue_events row per affected hall or recommendation, then sends an empty NOTIFY on
+-- channel 'catalogue_events' (delivered at commit); listeners read the rows after the last id
+-- they have seen. Writers take a transaction-level advisory lock before appending, so event ids
+-- are assigned in commit order and a reader that has seen id N never later finds a smaller id
+-- committing (catalogue writes are serialized for the remainder of their transaction).
+-- A trigger takes the lock only after its statement holds its row locks, so a transaction
+-- that writes again after waiting for it could deadlock with one holding it: the API takes
+-- the lock at the start of every write transaction, before touching any row
+-- (statements.LOCK_CATALOGUE_WRITES); multi-statement scripts should do the same.
+-- Recommendation changes made by deleting their hall (ON DELETE CASCADE) are covered by
+-- hall.deleted and are not logged separately.
+
+CREATE TABLE IF NOT EXISTS catalogue_events (
+    id bigserial PRIMARY KEY,
+    event_type varchar(30) NOT NULL,
+    hall_id integer NOT NULL,
+    data jsonb,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS ix_catalogue_events_created_at ON catalogue_events (created_at);
+
+CREATE OR REPLACE FUNCTION record_hall_events() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('catalogue_events'));
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO catalogue_events (event_type, hall_id, data)
+        SELECT 'hall.created', n.id, to_jsonb(n) - 'search_vector' FROM new_rows AS n ORDER BY n.id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Only halls whose fields actually changed
+        INSERT INTO catalogue_events (event_type, hall_id, data)
+        SELECT 'hall.updated', n.id, to_jsonb(n) - 'search_vector'
+        FROM new_rows AS n JOIN old_rows AS o ON o.id = n.id
+        WHERE to_jsonb(n) - 'search_vector' IS DISTINCT FROM to_jsonb(o) - 'search_vector'
+        ORDER BY n.id;
+    ELSE
+        INSERT INTO catalogue_events (event_type, hall_id, data)
+        SELECT 'hall.deleted', o.id, NULL FROM old_rows AS o ORDER BY o.id;
+    END IF;
+    PERFORM pg_notify('catalogue_events', '');
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION record_recommendation_events() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('catalogue_events'));
+    -- An UPDATE (the recommendation's key is its text and date) is logged as deleted + created
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO catalogue_events (event_type, hall_id, data)
+        SELECT 'recommendation.deleted', o.hall_id,
+               jsonb_build_object('recommendation', o.recommendation, 'update_date', o.update_date::date)
+        FROM old_rows AS o
+        WHERE EXISTS (SELECT 1 FROM music_halls AS h WHERE h.id = o.hall_id)
+        ORDER BY o.hall_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO catalogue_events (event_type, hall_id, data)
+        SELECT 'recommendation.created', n.hall_id,
+               jsonb_build_object('recommendation', n.recommendation, 'update_date', n.update_date::date)
+        FROM new_rows AS n ORDER BY n.hall_id;
+    END IF;
+    PERFORM pg_notify('catalogue_events', '');
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS music_halls_events_insert ON music_halls;
+CREATE TRIGGER music_halls_events_insert AFTER INSERT ON music_halls
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_hall_events();
+
+DROP TRIGGER IF EXISTS music_halls_events_update ON music_halls;
+CREATE TRIGGER music_halls_events_update AFTER UPDATE ON music_halls
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_hall_events();
+
+DROP TRIGGER IF EXISTS music_halls_events_delete ON music_halls;
+CREATE TRIGGER music_halls_events_delete AFTER DELETE ON music_halls
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_hall_events();
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_events_insert ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_events_insert AFTER INSERT ON music_hall_recommendations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_recommendation_events();
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_events_update ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_events_update AFTER UPDATE ON music_hall_recommendations
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_recommendation_events();
+
+DROP TRIGGER IF EXISTS music_hall_recommendations_events_delete ON music_hall_recommendations;
+CREATE TRIGGER music_hall_recommendations_events_delete AFTER DELETE ON music_hall_recommendations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION record_recommendation_events();
@@ -0,0 +1,67 @@
+-- Row versions and tombstones for delta sync (GET /db/music-halls/sync).
+-- Idempotent; apply with: psql "$DB_URL" -f migrations/0004_delta_sync.sql
+--
+-- Every hall gets a row_version from one sequence, re-assigned (with updated_at) whenever
+-- one of its fields actually changes; deleting a hall leaves a tombstone with a version
+-- from the same sequence. Before taking a version, writers take the same transaction-level
+-- advisory lock as the change feed (0003), so versions are assigned in commit order: a
+-- client that has seen version N never later finds a smaller one committing. As with 0003,
+-- the API takes that lock first thing in each write transaction, so it never waits for it
+-- while holding row locks.
+-- Adding the column numbers the existing halls (rewriting music_halls once).
+
+CREATE SEQUENCE IF NOT EXISTS music_halls_row_version_seq;
+
+ALTER TABLE music_halls
+    ADD COLUMN IF NOT EXISTS row_version bigint NOT NULL DEFAULT nextval('music_halls_row_version_seq'),
+    ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+CREATE UNIQUE INDEX IF NOT EXISTS ix_music_halls_row_version ON music_halls (row_version);
+
+CREATE TABLE IF NOT EXISTS music_hall_tombstones (
+    hall_id integer PRIMARY KEY,
+    row_version bigint NOT NULL,
+    deleted_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_music_hall_tombstones_row_version ON music_hall_tombstones (row_version);
+
+CREATE OR REPLACE FUNCTION bump_hall_row_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND (NEW.id, NEW.city, NEW.hall_name, NEW.email, NEW.stage, NEW.pipe_height, NEW.stage_type)
+           IS NOT DISTINCT FROM
+           (OLD.id, OLD.city, OLD.hall_name, OLD.email, OLD.stage, OLD.pipe_height, OLD.stage_type) THEN
+        -- Nothing changed: keep the version, so clients are not sent the hall again
+        NEW.row_version := OLD.row_version;
+        NEW.updated_at := OLD.updated_at;
+        RETURN NEW;
+    END IF;
+    PERFORM pg_advisory_xact_lock(hashtext('catalogue_events'));
+    NEW.row_version := nextval('music_halls_row_version_seq');
+    NEW.updated_at := now();
+    IF TG_OP = 'INSERT' THEN
+        -- The id is live again (e.g. an upsert with an explicit id)
+        DELETE FROM music_hall_tombstones WHERE hall_id = NEW.id;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION record_hall_tombstone() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('catalogue_events'));
+    INSERT INTO music_hall_tombstones (hall_id, row_version)
+    VALUES (OLD.id, nextval('music_halls_row_version_seq'))
+    ON CONFLICT (hall_id) DO UPDATE SET row_version = EXCLUDED.row_version, deleted_at = now();
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS music_halls_row_version ON music_halls;
+CREATE TRIGGER music_halls_row_version BEFORE INSERT OR UPDATE ON music_halls
+    FOR EACH ROW EXECUTE FUNCTION bump_hall_row_version();
+
+DROP TRIGGER IF EXISTS music_halls_tombstone ON music_halls;
+CREATE TRIGGER music_halls_tombstone AFTER DELETE ON music_halls
+    FOR EACH ROW EXECUTE FUNCTION record_hall_tombstone();
@@ -0,0 +1,69 @@
+import os
+from dataclasses import dataclass, field
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.main import app
+from app.db.neondb import init_db, close_db
+from app.services.neon import clear_caches
+
+
+@pytest.fixture
+def test_db(monkeypatch):
+    """
+    Point the app at TEST_DB_URL, a disposable database, for tests that write; skipped
+    without it, so they never write to the catalogue behind DB_URL. Request it before `client`.
+    """
+    url = os.environ.get("TEST_DB_URL")
+    if not url:
+        pytest.skip("writes to the database: set TEST_DB_URL to a disposable one")
+    monkeypatch.setattr(settings, "DB_URL", url)
+    return url
+
+
+@pytest_asyncio.fixture
+async def client():
+    """Async HTTP client with app lifespan (DB init/close) so DB-dependent tests work."""
+    await init_db(app)
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as ac:
+            yield ac
+    finally:
+        await close_db(app)
+
+
+@dataclass
+class QueryCounter:
+    """SQL statements sent to the database since the last reset()."""
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture
+def query_counter(client: AsyncClient):
+    """Count statements executed on the app engine; caches are cleared so reads hit the DB."""
+    clear_caches()
+    counter = QueryCounter()
+    sync_engine = app.state.async_engine.sync_engine
+
+    def before_cursor_execute(_conn, _cursor, statement, _params, _context, _executemany):
+        counter.statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from sqlalchemy import text
+
+from app.core.admission import AdmissionController, concurrency_limit
+from app.core.config import settings
+from app.core.exceptions import RateLimitExceededError, ServiceOverloadedError
+from app.core.ratelimit import TokenBucketLimiter
+from app.db.sessions import AdmittedSession
+from app.main import domain_exception_handler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_shed_when_the_budget_runs_out():
+    controller = AdmissionController("read", limit=1, queue_budget=0.05)
+    async with controller.admit():
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            async with controller.admit():
+                pass
+    assert exc_info.value.headers == {"Retry-After": "1"}
+    assert controller.active == controller.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_request_runs_when_a_slot_frees_in_time():
+    controller = AdmissionController("write", limit=1, queue_budget=1.0)
+    order = []
+
+    async def request(name: str) -> None:
+        async with controller.admit():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(request("first"), request("second"))
+    assert order == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_request_is_rejected_on_arrival_when_the_expected_wait_is_too_long():
+    clock = FakeClock()
+    controller = AdmissionController("read", limit=1, queue_budget=0.5, clock=clock)
+    for _ in range(20):
+        async with controller.admit():
+            clock.now += 2.0  # slow requests: the service-time average approaches 2s
+    async with controller.admit():
+        with pytest.raises(ServiceOverloadedError) as exc_info:
+            async with controller.admit():
+                pass
+    assert exc_info.value.details["retry_after"] == 2
+
+
+@pytest.mark.asyncio
+async def test_session_takes_its_slot_on_the_first_statement_only():
+    controller = AdmissionController("read", limit=1, queue_budget=0.01)
+    async with controller.admit():
+        # Opened but never queried (a cache hit, a coalesced read): nothing to shed
+        async with AdmittedSession(admission=controller.admit()):
+            pass
+        async with AdmittedSession(admission=controller.admit()) as session:
+            with pytest.raises(ServiceOverloadedError):
+                await session.execute(text("SELECT 1"))
+    assert controller.active == controller.waiting == 0
+
+
+def test_concurrency_is_sized_from_the_worker_pool_share(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 8)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 12)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)  # 2 pooled + 3 overflow per worker
+    assert concurrency_limit(None) == 5
+    assert concurrency_limit(50) == 5
+    assert concurrency_limit(2) == 2
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(rate=2.0, burst=3, clock=clock)
+    assert [limiter.acquire("key") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("key") == pytest.approx(0.5)
+    assert limiter.acquire("other") == 0.0
+    clock.now += 0.5
+    assert limiter.acquire("key") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_throttling_errors_use_the_error_format_with_retry_after():
+    response = await domain_exception_handler(None, RateLimitExceededError(retry_after=3))
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert response.body == (
+        b'{"error_code":"RATE_LIMIT_EXCEEDED","error_type":"THROTTLED",'
+        b'"message":"Rate limit exceeded for this API key","retry_after":3}'
+    )
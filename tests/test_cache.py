@@ -0,0 +1,144 @@
+import asyncio
+import os
+
+import pytest
+
+from app.core.cache import MemoryCacheBackend, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache = TTLCache(maxsize=2, ttl_seconds=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl_seconds=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats.evictions == 1
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+
+
+def test_cache_skips_stale_set_after_invalidation():
+    cache = TTLCache(maxsize=2, ttl_seconds=10)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_namespaces_are_independent():
+    backend = MemoryCacheBackend(maxsize=10, ttl_seconds=10)
+    await backend.set("hall", "1", {"id": 1}, backend.token("hall"))
+    await backend.set("hall_list", "all", [1], backend.token("hall_list"))
+    backend.clear("hall_list")
+    assert await backend.get("hall", "1") == {"id": 1}
+    assert await backend.get("hall_list", "all") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_drops_set_with_stale_token():
+    backend = MemoryCacheBackend(maxsize=10, ttl_seconds=10)
+    token = backend.token("hall")
+    backend.invalidate("hall", ["1"])
+    await backend.set("hall", "1", "stale", token)
+    assert await backend.get("hall", "1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_shares_entries_and_invalidations():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core.redis_cache import RedisCacheBackend
+
+    server = fakeredis.FakeServer()
+    backends = []
+    for _ in range(2):
+        backend = RedisCacheBackend("redis://fake", ttl_seconds=60, local_maxsize=10, local_ttl_seconds=60)
+        backend._redis = fakeredis.FakeAsyncRedis(server=server)
+        await backend.start()
+        backends.append(backend)
+    first, second = backends
+    try:
+        await asyncio.sleep(0.05)  # let both subscribe
+        assert await first.get("hall", "1") is None
+        await first.set("hall", "1", {"id": 1}, first.token("hall"))
+        assert await second.get("hall", "1") == {"id": 1}
+
+        first.invalidate("hall", ["1"])
+        await asyncio.sleep(0.05)  # DEL + publish + delivery
+        assert await second.get("hall", "1") is None
+    finally:
+        for backend in backends:
+            await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_drops_a_load_that_raced_another_instances_write():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core.redis_cache import RedisCacheBackend
+
+    server = fakeredis.FakeServer()
+
+    def backend():
+        instance = RedisCacheBackend("redis://fake", ttl_seconds=60, local_maxsize=10, local_ttl_seconds=60)
+        instance._redis = fakeredis.FakeAsyncRedis(server=server)
+        return instance
+
+    writer, reader = backend(), backend()  # the reader never receives the invalidation message
+    try:
+        # The reader misses and starts loading the old row before the writer commits
+        assert await reader.get("hall", "1") is None
+        token = reader.token("hall")
+        writer.invalidate("hall", ["1"])
+        await asyncio.gather(*writer._tasks)  # INCR generation + DEL done
+        await reader.set("hall", "1", {"id": 1, "city": "old"}, token)
+        assert reader.remote_stats["stale_sets"] == 1
+        assert await writer.get("hall", "1") is None
+        assert await reader.get("hall", "1") is None
+
+        # A load that starts after the write is stored as usual
+        await reader.set("hall", "1", {"id": 1, "city": "new"}, reader.token("hall"))
+        assert await writer.get("hall", "1") == {"id": 1, "city": "new"}
+    finally:
+        for instance in (writer, reader):
+            await instance.close()
+
+
+def test_launcher_turns_the_memory_cache_off_for_several_workers(monkeypatch):
+    from app.core.config import settings
+    from app.server import _disable_per_process_cache
+
+    monkeypatch.delenv("CACHE_ENABLED", raising=False)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    _disable_per_process_cache()
+    assert "CACHE_ENABLED" not in os.environ
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    _disable_per_process_cache()
+    assert os.environ["CACHE_ENABLED"] == "false"
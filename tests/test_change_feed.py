@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.db.change_feed import ChangeEvent, ChangeFeed, change_feed
+from app.services.changes import open_change_stream
+
+
+def _event(event_id: int, event_type: str = "hall.updated", hall_id: int = 1) -> ChangeEvent:
+    return ChangeEvent({
+        "id": event_id,
+        "event_type": event_type,
+        "hall_id": hall_id,
+        "data": {"id": hall_id, "city": "Haifa"} if event_type.startswith("hall.") else None,
+        "created_at": datetime(2024, 5, 1, tzinfo=timezone.utc),
+    })
+
+
+@pytest.fixture
+def listening_feed(monkeypatch):
+    """The app's change feed, enabled and listening from event 10."""
+    monkeypatch.setattr(settings, "CHANGE_FEED_ENABLED", True)
+    change_feed.start_at(10)
+    change_feed.ready = True
+    try:
+        yield change_feed
+    finally:
+        change_feed.ready = False
+        change_feed.start_at(0)
+
+
+def test_buffer_answers_resumes_until_events_leave_it():
+    feed = ChangeFeed(buffer_size=3)
+    feed.start_at(10)
+    feed.append([_event(11), _event(13), _event(14)])  # 12 rolled back
+    assert [event.id for event in feed.recent_after(10)] == [11, 13, 14]
+    assert [event.id for event in feed.recent_after(13)] == [14]
+    assert feed.recent_after(14) == []
+    feed.append([_event(14), _event(15)])  # already-seen ids are ignored
+    assert feed.last_id == 15
+    assert [event.id for event in feed.recent_after(11)] == [13, 14, 15]
+    assert feed.recent_after(10) is None  # 11 was evicted: read from the table
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_woken_by_new_events():
+    feed = ChangeFeed()
+    feed.start_at(10)
+    waiter = asyncio.create_task(feed.wait_for_events(10, timeout=5, limit=100))
+    await asyncio.sleep(0)
+    feed.append([_event(11), _event(12)])
+    assert [event.id for event in await waiter] == [11, 12]
+    assert await feed.wait_for_events(12, timeout=0.01, limit=100) == []
+
+
+@pytest.mark.asyncio
+async def test_long_poll_returns_events_and_the_next_cursor(client: AsyncClient, listening_feed):
+    listening_feed.append([_event(11, "hall.created", 4), _event(12, "hall.deleted", 2)])
+    response = await client.get("/db/music-halls/changes", params={"after": 10, "limit": 1})
+    assert response.status_code == 200
+    assert response.json() == {
+        "events": [{
+            "id": 11, "type": "hall.created", "hall_id": 4,
+            "data": {"id": 4, "city": "Haifa"}, "created_at": "2024-05-01T00:00:00+00:00",
+        }],
+        "last_event_id": 11,
+    }
+    response = await client.get("/db/music-halls/changes", params={"after": 12, "timeout": 0})
+    assert response.json() == {"events": [], "last_event_id": 12}
+
+
+@pytest.mark.asyncio
+async def test_change_feed_is_404_when_disabled(client: AsyncClient):
+    response = await client.get("/db/music-halls/changes/stream")
+    assert response.status_code == 404
+    assert response.json()["error_code"] == "CHANGE_FEED_UNAVAILABLE"
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_the_backlog_then_new_events(listening_feed):
+    listening_feed.append([_event(11, "recommendation.created", 3)])
+    stream = await open_change_stream(after=10)
+    try:
+        assert await anext(stream) == b"retry: 3000\n\n"
+        first = await anext(stream)
+        assert first.startswith(b"id: 11\nevent: recommendation.created\ndata: {\"id\":11,")
+        assert first.endswith(b"}\n\n")
+        next_frame = asyncio.create_task(anext(stream))
+        await asyncio.sleep(0)
+        listening_feed.append([_event(12)])
+        assert (await next_frame).startswith(b"id: 12\nevent: hall.updated\n")
+    finally:
+        await stream.aclose()
@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
+
+from app.core.compression import CompressionMiddleware, negotiate, static_file_response
+
+LARGE = "x" * 4096
+
+
+def test_negotiate_respects_q_values():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("*") is not None
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("br", available=("gzip",)) is None
+    assert negotiate(None) is None
+
+
+@pytest.fixture
+def compressing_client():
+    app = FastAPI()
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield LARGE.encode()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter([LARGE]), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_compressed_with_weak_etag(compressing_client):
+    async with compressing_client as client:
+        response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == LARGE
+
+
+@pytest.mark.asyncio
+async def test_small_and_event_stream_responses_pass_through(compressing_client):
+    async with compressing_client as client:
+        small = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        events = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in events.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_incrementally(compressing_client):
+    async with compressing_client as client:
+        response = await client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == LARGE.encode() * 3  # httpx decodes Content-Encoding
+
+
+def test_static_file_is_served_with_validators_and_revalidated(tmp_path):
+    path = tmp_path / "ads.txt"
+    path.write_text(LARGE)
+
+    def get(**headers):
+        raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+        return static_file_response(Request({"type": "http", "headers": raw}), path, "text/plain")
+
+    plain = get()
+    assert plain.status_code == 200 and plain.body == LARGE.encode()
+    assert plain.headers["last-modified"].endswith("GMT")
+    gzipped = get(accept_encoding="gzip")
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+    not_modified = get(accept_encoding="gzip", if_none_match=gzipped.headers["etag"])
+    assert not_modified.status_code == 304 and not_modified.body == b""
+    assert not_modified.headers["etag"] == gzipped.headers["etag"]
+    assert "content-encoding" not in not_modified.headers
+
+    # A changed file gets a new validator, so the client's copy is no longer current
+    os.utime(path, (0, 0))
+    assert get(if_none_match=plain.headers["etag"]).status_code == 200
@@ -0,0 +1,30 @@
+import gzip
+
+from app.core.http_cache import RenderedPayload, compute_etag, etag_matches
+
+
+def test_etag_is_stable_across_key_order():
+    assert compute_etag({"a": 1, "b": 2}) == compute_etag({"b": 2, "a": 1})
+    assert compute_etag({"a": 1}) != compute_etag({"a": 2})
+
+
+def test_etag_matches_if_none_match_lists():
+    etag = compute_etag([1, 2, 3])
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_rendered_payload_matches_computed_etag():
+    payload = [{"id": i, "city_and_hall_name": f"Haifa, Hall {i}"} for i in range(50)]
+    rendered = RenderedPayload.render(payload)
+    assert rendered.etag == compute_etag(payload)
+    assert gzip.decompress(rendered.variants["gzip"]) == rendered.body
+    assert RenderedPayload.render(payload, extra_validator="cursor").etag != rendered.etag
+
+
+def test_small_payloads_are_not_gzipped():
+    assert RenderedPayload.render([{"id": 1}]).variants == {}
+
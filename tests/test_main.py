@@ -1,23 +1,8 @@
 import pytest
-import pytest_asyncio
-from httpx import ASGITransport, AsyncClient
+from httpx import AsyncClient
 
+from app.core.config import settings
 from app.main import app
-from app.db.neondb import init_db, close_db
-
-
-@pytest_asyncio.fixture
-async def client():
-    """Async HTTP client with app lifespan (DB init/close) so DB-dependent tests work."""
-    await init_db(app)
-    try:
-        async with AsyncClient(
-            transport=ASGITransport(app=app),
-            base_url="http://test",
-        ) as ac:
-            yield ac
-    finally:
-        await close_db(app)
 
 
 @pytest.mark.asyncio
@@ -27,6 +12,19 @@ async def test_check_app_health(client: AsyncClient):
     assert response.json() == {"message": "ITS ALIVE!!!"}
 
 
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_pool(client: AsyncClient):
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming"
+
+    warmup = app.state.pool_warmup
+    warmup.ready, warmup.connections, warmup.seconds = True, 2, 0.1
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "warm_connections": 2, "warmup_seconds": 0.1}
+
+
 @pytest.mark.asyncio
 async def test_db_first_element(client: AsyncClient):
     response = await client.get("/db/music-halls/1")
@@ -42,3 +40,17 @@ async def test_db_first_element(client: AsyncClient):
         "stage_type": "raised",
     }
     assert response.json() == hall_1
+
+
+@pytest.mark.asyncio
+async def test_bulk_limit_is_a_413_error(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 1)
+    hall = {
+        "city": "Haifa", "hall_name": "Bulk", "email": "bulk@example.com",
+        "stage": True, "pipe_height": 10, "stage_type": "open",
+    }
+    response = await client.post(
+        "/db/music-halls/bulk", json=[hall, hall], headers={"X-API-Key": settings.SECRET_KEY},
+    )
+    assert response.status_code == 413
+    assert response.json()["error_code"] == "BULK_LIMIT_EXCEEDED"
@@ -0,0 +1,115 @@
+import logging
+from types import SimpleNamespace
+
+import asyncpg
+import orjson
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.metrics import (
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    RequestStats,
+    log_slow_request,
+    current_request_stats,
+    registry,
+    server_timing,
+)
+from app.db.instrumentation import statement_timing_hooks
+from app.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency", labels=("route",), buckets=(0.1, 1.0)))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_collectors_run_before_render():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("scrapes_total", "Scrapes"))
+    registry.add_collector("scrapes", lambda: counter.inc())
+    assert "scrapes_total 1.0" in registry.render()
+    assert "scrapes_total 2.0" in registry.render()
+
+
+def test_server_timing_header():
+    header = server_timing(0.0125, RequestStats(db_time=0.004, statements=2, pool_wait=0.0002))
+    assert header == 'app;dur=12.5, db;dur=4.0;desc="2 queries", pool;dur=0.2'
+
+
+def test_slow_request_record_lists_statements(caplog):
+    stats = RequestStats(db_time=0.3, statements=1, pool_wait=0.05, queries=[("SELECT 1", 0.3)])
+    scope = {"method": "GET", "path": "/db/music-halls", "query_string": b"city=Haifa"}
+    with caplog.at_level(logging.WARNING, logger="app.slow_requests"):
+        log_slow_request(scope, 200, 0.5, stats)
+    record = orjson.loads(caplog.records[-1].getMessage())
+    assert record["route"] == "unmatched"
+    assert record["query_string"] == "city=Haifa"
+    assert record["duration_ms"] == 500.0
+    assert record["pool_wait_ms"] == 50.0
+    assert record["statements"] == [{"sql": "SELECT 1", "duration_ms": 300.0}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeExecutionContext:
+    cache_hit = None
+
+
+def test_failed_statement_leaves_no_start_time_behind():
+    clock = FakeClock()
+    before, after = statement_timing_hooks("test-timing", clock=clock)
+    conn = SimpleNamespace(info={})
+    failed = FakeExecutionContext()
+    before(conn, None, "SELECT broken", {}, failed, False)  # raises: after_cursor_execute never runs
+    stats = RequestStats(queries=[])
+    token = current_request_stats.set(stats)
+    try:
+        succeeded = FakeExecutionContext()
+        before(conn, None, "SELECT 1", {}, succeeded, False)
+        clock.now += 0.5
+        after(conn, None, "SELECT 1", {}, succeeded, False)
+    finally:
+        current_request_stats.reset(token)
+    assert conn.info == {} and not hasattr(succeeded, "_query_start")
+    assert stats.statements == 1
+    assert stats.db_time == 0.5
+
+
+@pytest.mark.asyncio
+async def test_mapped_db_errors_are_recorded_with_their_status_and_code(caplog, monkeypatch):
+    async def duplicate():
+        raise IntegrityError("INSERT INTO music_halls ...", {}, asyncpg.UniqueViolationError("duplicate key"))
+
+    monkeypatch.setattr(settings, "SLOW_REQUEST_THRESHOLD_MS", 0.0)
+    app.add_api_route("/test/duplicate", duplicate, methods=["POST"])
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            with caplog.at_level(logging.WARNING, logger="app.slow_requests"):
+                response = await client.post("/test/duplicate")
+    finally:
+        app.router.routes.pop()
+    assert response.status_code == 409
+    record = orjson.loads(caplog.records[-1].getMessage())
+    assert (record["status"], record["error_code"]) == (409, "DUPLICATE_ENTRY")
+    assert 'http_request_duration_seconds_count{method="POST",route="/test/duplicate",status="409"} 1' in (
+        registry.render()
+    )
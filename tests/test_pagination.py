@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import InvalidCursorError, InvalidListFieldsError
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db import statements
+from app.schemas.neon import MusicHallListQuery
+from app.services.neon import clear_caches, get_music_hall_list, get_music_hall_list_rendered
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Records executed statements (and their parameters) and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.params = []
+        self.info = {}
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        self.params.append(params)
+        return FakeResult(self.rows)
+
+
+def _rows(*ids):
+    return [{"id": i, "city": "Tel Aviv", "hall_name": f"Hall {i}"} for i in ids]
+
+
+@pytest.fixture(autouse=True)
+def empty_list_cache():
+    clear_caches()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_page_returns_next_cursor():
+    session = FakeSession(_rows(1, 2, 3))
+    items, next_cursor = await get_music_hall_list(session, MusicHallListQuery(limit=2, city="Tel Aviv"))
+    assert items == [
+        {"id": 1, "city_and_hall_name": "Tel Aviv, Hall 1"},
+        {"id": 2, "city_and_hall_name": "Tel Aviv, Hall 2"},
+    ]
+    assert decode_cursor(next_cursor) == 2
+    sql = session.statements[0]
+    assert "music_halls.city = " in sql
+    assert "ORDER BY music_halls.id" in sql
+    assert "LIMIT" in sql
+    assert session.params[0] == {"city": "Tel Aviv", "limit": 3}
+
+
+@pytest.mark.asyncio
+async def test_list_queries_of_the_same_shape_share_a_statement():
+    session = FakeSession(_rows(1))
+    await get_music_hall_list(session, MusicHallListQuery(limit=5, city="Haifa"))
+    await get_music_hall_list(session, MusicHallListQuery(limit=10, city="Eilat"))
+    assert session.statements[0] == session.statements[1]
+    assert session.params == [{"city": "Haifa", "limit": 6}, {"city": "Eilat", "limit": 11}]
+    assert statements.hall_list.cache_info().hits >= 1
+
+
+@pytest.mark.asyncio
+async def test_list_without_pagination_returns_everything():
+    session = FakeSession(_rows(1, 2, 3))
+    items, next_cursor = await get_music_hall_list(session)
+    assert len(items) == 3
+    assert next_cursor is None
+    assert "LIMIT" not in session.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_list_rejects_unknown_fields():
+    with pytest.raises(InvalidListFieldsError):
+        await get_music_hall_list(FakeSession([]), MusicHallListQuery(fields="id,password"))
+
+
+@pytest.mark.asyncio
+async def test_rendered_list_is_reused_until_the_page_changes():
+    session = FakeSession(_rows(1, 2))
+    first, _ = await get_music_hall_list_rendered(session)
+    second, _ = await get_music_hall_list_rendered(session)
+    assert second is first
+    assert len(session.statements) == 1
+    assert first.body == b'[{"id":1,"city_and_hall_name":"Tel Aviv, Hall 1"},{"id":2,"city_and_hall_name":"Tel Aviv, Hall 2"}]'
+
+    clear_caches()
+    third, _ = await get_music_hall_list_rendered(session)
+    assert third is not first
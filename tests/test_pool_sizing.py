@@ -0,0 +1,23 @@
+from app.db.neondb import pool_limits_per_worker
+
+
+def test_single_worker_keeps_configured_pool():
+    assert pool_limits_per_worker(5, 10, 1) == (5, 10)
+
+
+def test_pool_is_split_across_workers():
+    assert pool_limits_per_worker(8, 12, 4) == (2, 3)
+
+
+def test_each_worker_keeps_one_connection_within_budget():
+    assert pool_limits_per_worker(5, 10, 8) == (1, 0)
+
+
+def test_total_never_exceeds_budget_while_workers_fit_in_it():
+    for pool_size in range(1, 21):
+        for max_overflow in range(0, 21):
+            budget = pool_size + max_overflow
+            for workers in range(1, budget + 1):
+                pool, overflow = pool_limits_per_worker(pool_size, max_overflow, workers)
+                assert pool >= 1 and overflow >= 0
+                assert (pool + overflow) * workers <= budget
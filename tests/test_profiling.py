@@ -0,0 +1,17 @@
+from app.core.config import settings
+from app.core.profiling import _wants_profile
+
+
+def _scope(api_key: bytes, query: bytes = b"profile=1") -> dict:
+    return {"type": "http", "headers": [(b"x-api-key", api_key)], "query_string": query}
+
+
+def test_profiling_needs_the_api_key():
+    assert _wants_profile(_scope(settings.SECRET_KEY.encode()))
+    assert not _wants_profile(_scope(settings.SECRET_KEY.encode(), query=b""))
+    assert not _wants_profile(_scope(b"wrong"))
+
+
+def test_non_ascii_api_key_is_rejected_not_an_error():
+    assert not _wants_profile(_scope("clé-אבג".encode()))
+    assert not _wants_profile(_scope("clé".encode("latin-1")))
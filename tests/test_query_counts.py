@@ -0,0 +1,62 @@
+"""
+Statement-count budgets per endpoint, so implicit relationship loads or extra round trips fail loudly.
+Write transactions start with the catalogue writers' advisory lock: one statement on top of the write.
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+
+AUTH = {"X-API-Key": settings.SECRET_KEY}
+NEW_HALL = {
+    "city": "Query Count",
+    "hall_name": "Budget Hall",
+    "email": "budget@example.com",
+    "stage": True,
+    "pipe_height": 10,
+    "stage_type": "open",
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path",
+    ["/db/music-halls", "/db/music-halls/1", "/db/music-halls/1/recommendations"],
+)
+async def test_read_endpoints_issue_one_statement(client: AsyncClient, query_counter, path: str):
+    response = await client.get(path)
+    assert response.status_code == 200
+    assert query_counter.count == 1, query_counter.statements
+
+
+@pytest.mark.asyncio
+async def test_write_endpoints_statement_budget(test_db, client: AsyncClient, query_counter):
+    response = await client.post("/db/music-halls", json=NEW_HALL, headers=AUTH)
+    assert response.status_code == 201
+    assert query_counter.count == 2, query_counter.statements
+    hall_id = response.json()["id"]
+
+    query_counter.reset()
+    response = await client.put(f"/db/music-halls/{hall_id}", json={"pipe_height": 11}, headers=AUTH)
+    assert response.status_code == 200
+    assert query_counter.count == 2, query_counter.statements
+
+    query_counter.reset()
+    response = await client.delete(f"/db/music-halls/{hall_id}", headers=AUTH)
+    assert response.status_code == 204
+    assert query_counter.count == 2, query_counter.statements
+
+
+@pytest.mark.asyncio
+async def test_bulk_endpoints_statement_budget(test_db, client: AsyncClient, query_counter):
+    response = await client.post("/db/music-halls/bulk", json=[NEW_HALL] * 3, headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 3
+    assert query_counter.count == 2, query_counter.statements
+    hall_ids = [item["hall_id"] for item in response.json()["results"]]
+
+    query_counter.reset()
+    response = await client.post("/db/music-halls/bulk-delete", json=hall_ids, headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 3
+    assert query_counter.count == 2, query_counter.statements
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.db.routing import (
+    LAST_WRITE_COOKIE,
+    LAST_WRITE_HEADER,
+    REPLICA_SESSION_INFO,
+    ReadAfterWriteMiddleware,
+    ReadRouter,
+    client_last_write,
+)
+from app.services.neon import HALL_CACHE, cache, clear_caches, get_music_hall
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _replica(name: str, checked_out: int = 0):
+    pool = SimpleNamespace(checkedout=lambda: checked_out)
+    return SimpleNamespace(sync_engine=SimpleNamespace(pool=pool)), name
+
+
+def test_reads_use_primary_without_replicas():
+    router = ReadRouter("primary", [], read_after_write_seconds=2)
+    assert router.session_factory() == "primary"
+
+
+def test_reads_round_robin_over_idle_replicas():
+    router = ReadRouter("primary", [_replica("r1"), _replica("r2")], read_after_write_seconds=2)
+    assert [router.session_factory() for _ in range(4)] == ["r1", "r2", "r1", "r2"]
+
+
+def test_reads_prefer_least_busy_replica():
+    router = ReadRouter("primary", [_replica("r1", 5), _replica("r2", 1)], read_after_write_seconds=2)
+    assert {router.session_factory() for _ in range(4)} == {"r2"}
+
+
+def test_reads_after_write_go_to_primary_within_window():
+    clock = FakeClock()
+    router = ReadRouter("primary", [_replica("r1")], read_after_write_seconds=2, clock=clock)
+    router.mark_write()
+    assert router.session_factory() == "primary"
+    clock.now += 2
+    assert router.session_factory() == "r1"
+
+
+def test_reads_after_the_clients_own_write_go_to_primary_on_any_worker():
+    wall_clock = FakeClock()
+    router = ReadRouter("primary", [_replica("r1")], read_after_write_seconds=2, wall_clock=wall_clock)
+    assert router.session_factory(client_last_write=wall_clock.now - 1) == "primary"
+    assert router.session_factory(client_last_write=wall_clock.now - 3) == "r1"
+    assert router.session_factory() == "r1"
+
+
+@pytest.mark.asyncio
+async def test_successful_writes_are_stamped_for_later_reads():
+    async def endpoint(scope, receive, send):
+        status = 201 if scope["path"] == "/ok" else 409
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    app = ReadAfterWriteMiddleware(endpoint, read_after_write_seconds=2, wall_clock=lambda: 1700000000.5)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        written = await client.post("/ok")
+        assert written.headers[LAST_WRITE_HEADER] == "1700000000500"
+        assert written.cookies[LAST_WRITE_COOKIE] == "1700000000500"
+        assert LAST_WRITE_HEADER not in (await client.post("/conflict")).headers
+        assert LAST_WRITE_HEADER not in (await client.get("/ok")).headers
+        request = Request({"type": "http", "headers": [(b"cookie", b"last_write=1700000000500")]})
+        assert client_last_write(request) == 1700000000.5
+
+
+class FakeHallSession:
+    def __init__(self, replica: bool):
+        self.info = {REPLICA_SESSION_INFO: replica}
+
+    async def execute(self, _stmt, _params=None):
+        row = {"id": 1, "city": "Haifa"}
+        return SimpleNamespace(mappings=lambda: SimpleNamespace(one_or_none=lambda: row))
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_are_not_cached_right_after_an_invalidation(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "READ_COALESCING_ENABLED", False)
+    clear_caches()
+    try:
+        cache.invalidate(HALL_CACHE, ["1"])  # a write just committed
+        assert (await get_music_hall(1, FakeHallSession(replica=True)))["city"] == "Haifa"
+        assert await cache.get(HALL_CACHE, "1") is None  # may predate the write
+        await get_music_hall(1, FakeHallSession(replica=False))
+        assert await cache.get(HALL_CACHE, "1") is not None
+
+        cache.invalidate(HALL_CACHE, ["1"])
+        monkeypatch.setattr(settings, "DB_READ_AFTER_WRITE_SECONDS", 0.0)  # the window has passed
+        await get_music_hall(1, FakeHallSession(replica=True))
+        assert await cache.get(HALL_CACHE, "1") is not None
+    finally:
+        clear_caches()
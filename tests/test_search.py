@@ -0,0 +1,97 @@
+import re
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.db.dependencies import get_read_session
+from app.main import app
+from app.routes import neon as neon_routes
+from app.services.search import prefix_tsquery, search_music_halls
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self._rows
+
+
+class FakeSession:
+    """Records executed statements, compiled for Postgres, and returns canned rows."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.compiled = []
+
+    async def execute(self, stmt, params=None):
+        self.compiled.append(stmt.compile(dialect=postgresql.dialect()))
+        return FakeResult(self.rows)
+
+
+def test_prefix_tsquery_matches_each_word_as_prefix():
+    assert prefix_tsquery("Barby Tel") == "barby:* & tel:*"
+    assert prefix_tsquery("תל אביב") == "תל:* & אביב:*"
+
+
+def test_prefix_tsquery_drops_operators():
+    assert prefix_tsquery("bar | !x & (y)") == "bar:* & x:* & y:*"
+    assert prefix_tsquery("&|!") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_prefix_and_fuzzy_matches_best_first():
+    session = FakeSession([{"id": 3, "hall_name": "Barby", "rank": 0.9}])
+    assert await search_music_halls(session, "Barbi Tel", limit=5, offset=10) == [
+        {"id": 3, "hall_name": "Barby", "rank": 0.9},
+    ]
+    compiled = session.compiled[0]
+    # Without the bind casts (e.g. ::VARCHAR), which vary between SQLAlchemy versions
+    sql = re.sub(r"::\w+", "", " ".join(str(compiled).split()))
+    # Candidates: prefix full-text on halls and recommendations, trigram similarity (typos) on name and city
+    assert sql.count("search_vector @@ to_tsquery(") == 2
+    assert "%(param_1)s <%% music_halls.hall_name" in sql and "%(param_1)s <%% music_halls.city" in sql
+    assert "UNION" in sql
+    # Rank: full-text rank plus the better of the two word similarities
+    assert (
+        "ts_rank(music_halls.search_vector, to_tsquery(%(to_tsquery_1)s, %(to_tsquery_2)s)) + "
+        "greatest(word_similarity(%(param_1)s, music_halls.hall_name), "
+        "word_similarity(%(param_1)s, music_halls.city)) AS rank"
+    ) in sql
+    assert sql.endswith("ORDER BY rank DESC, music_halls.id LIMIT %(param_2)s OFFSET %(param_3)s")
+    params = compiled.params
+    assert params["to_tsquery_1"] == "simple" and params["to_tsquery_2"] == "barbi:* & tel:*"
+    assert params["param_1"] == "Barbi Tel"
+    assert (params["param_2"], params["param_3"]) == (5, 10)
+
+
+@pytest.mark.asyncio
+async def test_search_without_words_runs_no_query():
+    session = FakeSession()
+    assert await search_music_halls(session, "&|!", limit=5) == []
+    assert session.compiled == []
+
+
+@pytest.mark.asyncio
+async def test_search_route_is_not_captured_by_the_hall_id_route(client: AsyncClient, monkeypatch):
+    async def fake_search(_session, text, limit, offset):
+        return [{
+            "id": 3, "city": "Tel Aviv", "hall_name": text, "email": "barby@example.com",
+            "stage": True, "pipe_height": 8, "stage_type": "raised", "rank": 0.5,
+        }]
+
+    monkeypatch.setattr(neon_routes, "search_music_halls", fake_search)
+    app.dependency_overrides[get_read_session] = lambda: None
+    try:
+        response = await client.get("/db/music-halls/search", params={"q": "Barby"})
+        assert response.status_code == 200
+        assert response.json()[0]["hall_name"] == "Barby"
+
+        for params, field in (({}, "q"), ({"q": ""}, "q"), ({"q": "x", "limit": 0}, "limit"),
+                              ({"q": "x", "offset": -1}, "offset"), ({"q": "x" * 101}, "q")):
+            response = await client.get("/db/music-halls/search", params=params)
+            assert response.status_code == 422
+            assert [error["loc"] for error in response.json()["detail"]] == [["query", field]]
+    finally:
+        app.dependency_overrides.pop(get_read_session, None)
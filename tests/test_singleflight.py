@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": 1}
+
+    tasks = [asyncio.create_task(flight.do("hall:1", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        raise LookupError("missing")
+
+    tasks = [asyncio.create_task(flight.do("hall:1", load)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiter_takes_over_when_leader_is_cancelled():
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return "fresh"
+
+    leader = asyncio.create_task(flight.do("hall:1", load))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flight.do("hall:1", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await waiter == "fresh"
+    assert calls == 2
+
+
+class BlockingSession:
+    """Fake session whose queries wait for `release`; counts executed statements."""
+
+    def __init__(self, row):
+        self.row = row
+        self.executed = 0
+        self.release = asyncio.Event()
+
+    async def execute(self, _stmt, _params=None):
+        self.executed += 1
+        await self.release.wait()
+        return self
+
+    def mappings(self):
+        return self
+
+    def one_or_none(self):
+        return self.row
+
+
+@pytest.mark.asyncio
+async def test_identical_hall_reads_share_one_query(monkeypatch):
+    from app.core.config import settings
+    from app.core.metrics import read_coalesced_waiters
+    from app.services.neon import HALL_CACHE, get_music_hall
+
+    monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+    hall = {"id": 7, "city": "Haifa", "hall_name": "Hall", "email": "a@b.co", "stage": True,
+            "pipe_height": 5, "stage_type": "open"}
+    leader_session = BlockingSession(hall)
+    waiter_sessions = [BlockingSession(hall) for _ in range(4)]
+    joined_before = read_coalesced_waiters.value(HALL_CACHE)
+
+    tasks = [asyncio.create_task(get_music_hall(7, s)) for s in (leader_session, *waiter_sessions)]
+    await asyncio.sleep(0)
+    leader_session.release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert [r["id"] for r in results] == [7] * 5
+    assert leader_session.executed == 1
+    assert all(s.executed == 0 for s in waiter_sessions)
+    assert read_coalesced_waiters.value(HALL_CACHE) - joined_before == 4
@@ -0,0 +1,197 @@
+import asyncio
+from contextlib import nullcontext
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.core.exceptions import MusicHallNotFoundError
+from app.core.pagination import decode_cursor
+from app.db.dependencies import get_catalogue_read_session
+from app.db.neondb import listen_dsn
+from app.db.routing import ReadRouter
+from app.db import snapshot as snapshot_module
+from app.db.snapshot import CatalogueSnapshot, HallRecord, catalogue_snapshot
+from app.schemas.neon import MusicHallListQuery
+from app.services.neon import (
+    clear_caches,
+    get_music_hall,
+    get_music_hall_list,
+    get_music_hall_recommendations,
+)
+
+
+def _hall(hall_id: int, city: str = "Tel Aviv", recommendations=()) -> HallRecord:
+    row = {
+        "id": hall_id,
+        "city": city,
+        "hall_name": f"Hall {hall_id}",
+        "email": f"hall{hall_id}@example.com",
+        "stage": True,
+        "pipe_height": hall_id,
+        "stage_type": "raised",
+    }
+    return HallRecord(row, tuple(recommendations))
+
+
+@pytest.fixture
+def serving_snapshot():
+    """The app's snapshot, loaded with four halls and serving reads."""
+    clear_caches()
+    catalogue_snapshot.replace([
+        _hall(1, recommendations=[("great crew", date(2024, 5, 1)), ("loud", date(2023, 1, 1))]),
+        _hall(2, "Haifa"),
+        _hall(3),
+        _hall(4, "Haifa"),
+    ])
+    catalogue_snapshot.ready = True
+    try:
+        yield catalogue_snapshot
+    finally:
+        catalogue_snapshot.ready = False
+        catalogue_snapshot.replace([])
+        clear_caches()
+
+
+def test_snapshot_indexes_follow_incremental_changes():
+    snapshot = CatalogueSnapshot()
+    snapshot.replace([_hall(1), _hall(2, "Haifa"), _hall(3)])
+    snapshot.apply({2, 3, 5}, [_hall(2, "Eilat"), _hall(5, "Haifa")])  # 2 moved, 3 deleted, 5 added
+    assert [hall.id for hall in snapshot.iter_halls()] == [1, 2, 5]
+    assert [hall.id for hall in snapshot.iter_halls("Haifa")] == [5]
+    assert [hall.id for hall in snapshot.iter_halls("Eilat")] == [2]
+    assert [hall.id for hall in snapshot.iter_halls(after_id=1)] == [2, 5]
+    assert snapshot.get(3) is None
+
+
+def test_notifications_queue_hall_ids_or_a_reload():
+    snapshot = CatalogueSnapshot()
+    snapshot._on_notify(None, 1, "catalogue_changes", '{"hall_ids": [3, 7]}')
+    assert snapshot._pending == {3, 7} and not snapshot._reload_requested
+    snapshot._on_notify(None, 1, "catalogue_changes", '{"reload": true}')
+    assert snapshot._reload_requested
+
+
+class FakeListenConnection:
+    def __init__(self):
+        self.closed = False
+        self.on_terminate = None
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, _channel, _callback):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_listener_outage_sends_reads_to_the_database_until_reloaded(monkeypatch):
+    connections = []
+    database_up = True
+
+    async def connect(_dsn):
+        if not database_up:
+            raise OSError("connection refused")
+        connections.append(FakeListenConnection())
+        return connections[-1]
+
+    async def load_records(_engine, hall_ids=None):
+        return [_hall(1)]
+
+    async def wait_until(condition):
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.005)
+        raise AssertionError("timed out")
+
+    monkeypatch.setattr(snapshot_module.asyncpg, "connect", connect)
+    monkeypatch.setattr(snapshot_module, "load_records", load_records)
+    monkeypatch.setattr(snapshot_module, "_RECONNECT_DELAY_SECONDS", 0.01)
+    snapshot = CatalogueSnapshot()
+    await snapshot.start(None, "postgresql://u:p@db/x")
+    try:
+        await wait_until(lambda: snapshot.ready)
+        database_up = False
+        connections[0].closed = True
+        connections[0].on_terminate(connections[0])
+        assert not snapshot.ready and snapshot.loaded
+        await asyncio.sleep(0.05)  # reconnects keep failing
+        assert not snapshot.ready
+        database_up = True
+        await wait_until(lambda: snapshot.ready)
+        assert len(connections) == 2
+    finally:
+        await snapshot.close()
+
+
+def test_listen_uses_the_direct_neon_host():
+    dsn = listen_dsn("postgresql://u:p@ep-cool-1-pooler.eu-central-1.aws.neon.tech/db?sslmode=require")
+    assert dsn == "postgresql://u:p@ep-cool-1.eu-central-1.aws.neon.tech/db?sslmode=require"
+
+
+@pytest.mark.asyncio
+async def test_reads_are_answered_from_the_snapshot(serving_snapshot):
+    assert (await get_music_hall(2, None))["city"] == "Haifa"
+    with pytest.raises(MusicHallNotFoundError):
+        await get_music_hall(9, None)
+    assert await get_music_hall_recommendations(1, None) == [
+        {"recommendation": "great crew", "update_date": date(2024, 5, 1)},
+        {"recommendation": "loud", "update_date": date(2023, 1, 1)},
+    ]
+    assert await get_music_hall_recommendations(9, None) == []
+
+    items, next_cursor = await get_music_hall_list(None, MusicHallListQuery(limit=1, city="Haifa"))
+    assert items == [{"id": 2, "city_and_hall_name": "Haifa, Hall 2"}]
+    assert decode_cursor(next_cursor) == 2
+    items, next_cursor = await get_music_hall_list(
+        None, MusicHallListQuery(after=next_cursor, city="Haifa", fields="id,pipe_height"),
+    )
+    assert items == [{"id": 4, "pipe_height": 4}]
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_pages_are_rebuilt_after_a_change(serving_snapshot):
+    items, _ = await get_music_hall_list(None)
+    assert len(items) == 4
+    serving_snapshot.apply({4}, [])
+    items, _ = await get_music_hall_list(None)
+    assert [item["id"] for item in items] == [1, 2, 3]
+
+
+async def _catalogue_session(router: ReadRouter, cookie: bytes = b""):
+    app = SimpleNamespace(state=SimpleNamespace(read_router=router))
+    request = Request({"type": "http", "headers": [(b"cookie", cookie)], "app": app})
+    dependency = get_catalogue_read_session(request)
+    session = await anext(dependency)
+    await dependency.aclose()
+    return session
+
+
+@pytest.mark.asyncio
+async def test_reads_skip_the_snapshot_within_the_write_window(serving_snapshot):
+    router = ReadRouter(
+        lambda admission: nullcontext("primary session"), [], read_after_write_seconds=2,
+        clock=lambda: 100.0, wall_clock=lambda: 1700000010.0,
+    )
+    assert await _catalogue_session(router) is None
+    # The client wrote 1s ago (on any worker): its reads must see the write
+    assert await _catalogue_session(router, b"last_write=1700000009000") == "primary session"
+    assert await _catalogue_session(router, b"last_write=1700000005000") is None
+    router.mark_write()  # a write committed in this process
+    assert await _catalogue_session(router) == "primary session"
+
+
+def test_memory_report_counts_halls_and_recommendations(serving_snapshot):
+    report = serving_snapshot.memory_report()
+    assert report["halls"] == 4
+    assert report["recommendations"] == 2
+    assert report["bytes_per_10k_halls"] == round(report["bytes"] * 2_500)
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.metrics import db_statements_prepared
+from app.db import statements
+from app.db.instrumentation import statement_name_func
+from app.db.neondb import uses_transaction_pooler
+from app.schemas.neon import MusicHall
+from app.services.neon import delete_music_halls, insert_music_halls
+
+
+def test_hall_list_builds_each_shape_once():
+    first = statements.hall_list(("city", "hall_name", "id"), ("city",), True, True)
+    again = statements.hall_list(("city", "hall_name", "id"), ("city",), True, True)
+    assert again is first
+    sql = str(first.compile(dialect=postgresql.dialect()))
+    assert "music_halls.id > %(after_id)s" in sql
+    assert "music_halls.city = %(city)s" in sql
+    assert "LIMIT %(limit)s" in sql
+
+
+def test_statement_names_are_counted_and_unique_behind_a_pooler():
+    pooled = statement_name_func("test-pooled", unique=True)
+    names = {pooled(), pooled()}
+    assert len(names) == 2 and all(name.startswith("__asyncpg_") for name in names)
+    assert statement_name_func("test-direct", unique=False)() is None
+    assert db_statements_prepared.value("test-pooled") == 2
+    assert db_statements_prepared.value("test-direct") == 1
+
+
+def test_neon_pooled_endpoints_are_detected():
+    assert uses_transaction_pooler("postgresql://u:p@ep-cool-1-pooler.eu-central-1.aws.neon.tech/db")
+    assert not uses_transaction_pooler("postgresql://u:p@ep-cool-1.eu-central-1.aws.neon.tech/db")
+
+
+class WriteSession:
+    """Records executed statements; a transaction begins with the first one."""
+
+    def __init__(self):
+        self.info = {}
+        self.executed = []
+        self.transaction = None
+        self.sync_session = SimpleNamespace(get_transaction=lambda: self.transaction)
+
+    async def execute(self, stmt, params=None):
+        self.transaction = self.transaction or object()
+        self.executed.append(stmt)
+        rows = [{"id": 7}] if params is None else [{"id": index} for index, _ in enumerate(params)]
+        return SimpleNamespace(mappings=lambda: rows, scalars=lambda: [row["id"] for row in rows])
+
+
+@pytest.mark.asyncio
+async def test_writers_take_the_catalogue_lock_first_and_once_per_transaction():
+    hall = MusicHall(
+        city="Haifa", hall_name="Lock", email="lock@example.com", stage=True, pipe_height=1, stage_type="open",
+    )
+    session = WriteSession()
+    await insert_music_halls(session, [hall, hall])
+    await delete_music_halls(session, [7])
+    assert session.executed[0] is statements.LOCK_CATALOGUE_WRITES
+    assert session.executed.count(statements.LOCK_CATALOGUE_WRITES) == 1
+    sql = str(statements.LOCK_CATALOGUE_WRITES.compile(dialect=postgresql.dialect()))
+    assert "pg_advisory_xact_lock(hashtext(" in sql
+
+    session.transaction = None  # committed: the next transaction takes the lock again
+    await delete_music_halls(session, [7])
+    assert session.executed.count(statements.LOCK_CATALOGUE_WRITES) == 2
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.exceptions import InvalidSyncTokenError
+from app.core.pagination import decode_sync_token, encode_cursor, encode_sync_token
+from app.db.statements import HALL_CHANGES, HALLS_BY_VERSION
+from app.services.sync import sync_music_halls
+
+UPDATED = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Records executed statements with their parameters and returns canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    async def execute(self, stmt, params=None):
+        self.executed.append((stmt, params))
+        return FakeResult(self.rows)
+
+
+def _hall_row(version: int, hall_id: int) -> dict:
+    return {
+        "version": version, "deleted": False, "id": hall_id, "city": "Haifa", "hall_name": f"Hall {hall_id}",
+        "email": f"hall{hall_id}@example.com", "stage": True, "pipe_height": 10, "stage_type": "raised",
+        "updated_at": UPDATED,
+    }
+
+
+def _tombstone_row(version: int, hall_id: int) -> dict:
+    return {
+        "version": version, "deleted": True, "id": hall_id, "city": None, "hall_name": None, "email": None,
+        "stage": None, "pipe_height": None, "stage_type": None, "updated_at": UPDATED,
+    }
+
+
+def test_sync_tokens_round_trip_and_reject_list_cursors():
+    assert decode_sync_token(encode_sync_token(1234)) == 1234
+    for token in ("not-a-token", encode_cursor(5)):
+        with pytest.raises(InvalidSyncTokenError):
+            decode_sync_token(token)
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_changes_and_deletes_after_the_token():
+    session = FakeSession([_hall_row(41, 3), _tombstone_row(42, 7), _hall_row(45, 1)])
+    page = await sync_music_halls(session, encode_sync_token(40), limit=2)
+    assert session.executed == [(HALL_CHANGES, {"since": 40, "limit": 3})]
+    assert [hall["id"] for hall in page["changed"]] == [3]
+    assert page["changed"][0]["updated_at"] == UPDATED and "version" not in page["changed"][0]
+    assert page["deleted"] == [7]
+    assert decode_sync_token(page["next_token"]) == 42
+    assert page["has_more"]
+
+
+@pytest.mark.asyncio
+async def test_first_sync_pages_halls_only_and_an_empty_page_keeps_the_token():
+    session = FakeSession([])
+    page = await sync_music_halls(session, None)
+    assert session.executed[0][0] is HALLS_BY_VERSION
+    assert page == {"changed": [], "deleted": [], "next_token": encode_sync_token(0), "has_more": False}